@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import List, Annotated, Optional
 
@@ -7,11 +8,16 @@ from click import Context
 from rich import print
 from typer.core import TyperGroup
 
+from codelimit.commands.cache import cache_stats_command, cache_prune_command
 from codelimit.commands.check import check_command
+from codelimit.commands.convert import convert_command
+from codelimit.commands.export import export_command
 from codelimit.commands.findings import findings_command
 from codelimit.commands.report import ReportFormat, report_command
 from codelimit.commands.scan import scan_command
+from codelimit.common.AnalysisCache import AnalysisCache, DEFAULT_MAX_SIZE
 from codelimit.common.Configuration import Configuration, setup_logging
+from codelimit.common.report.CacheBackend import CacheBackend
 from codelimit.common.utils import configure_github_repository
 from codelimit.utils import success, fail
 from codelimit.version import version
@@ -39,12 +45,34 @@ def scan(
         verbose: Annotated[
             Optional[bool], typer.Option("--verbose", "-v", help="Verbose output")
         ] = False,
+        jobs: Annotated[
+            Optional[int],
+            typer.Option("--jobs", "-j", min=1, show_default=False,
+                         help="Number of parallel scan processes [default: CPU count]")
+        ] = None,
+        verify_checksums: Annotated[
+            bool, typer.Option("--verify-checksums", help="Verify checksums of unchanged files")
+        ] = False,
+        global_cache: Annotated[
+            bool, typer.Option("--global-cache/--no-global-cache", help="Reuse analysis results across checkouts")
+        ] = True,
+        cache_backend: Annotated[
+            Optional[CacheBackend], typer.Option("--cache-backend", show_default=False,
+                                                 help="Storage for the scan cache [default: json]")
+        ] = None,
 ):
     if exclude:
         Configuration.exclude.extend(exclude)
     if verbose:
         Configuration.verbose = True
+    Configuration.jobs = jobs if jobs else (os.cpu_count() or 1)
+    if verify_checksums:
+        Configuration.verify_checksums = True
+    if global_cache:
+        Configuration.cache_dir = AnalysisCache.default_root()
     Configuration.load(path)
+    if cache_backend:
+        Configuration.cache_backend = cache_backend
     setup_logging()
     configure_github_repository(path)
     scan_command(path)
@@ -80,6 +108,31 @@ def findings(
     findings_command(path, full, fmt)
 
 
+@cli.command(help="Export report for codebase as JSON")
+def export(
+        path: Annotated[
+            Path, typer.Argument(exists=True, file_okay=False, help="Codebase root")
+        ] = Path("."),
+        output: Annotated[
+            Optional[Path], typer.Option("--output", "-o", dir_okay=False, help="Output file [default: stdout]")
+        ] = None,
+):
+    Configuration.load(path)
+    export_command(path, output)
+
+
+@cli.command(help="Convert a report between JSON and binary format")
+def convert(
+        input_path: Annotated[
+            Path, typer.Argument(exists=True, dir_okay=False, metavar="INPUT", help="JSON or binary report")
+        ],
+        output_path: Annotated[
+            Path, typer.Argument(dir_okay=False, metavar="OUTPUT", help="Converted report")
+        ],
+):
+    convert_command(input_path, output_path)
+
+
 @cli.command(help="Check file(s)")
 def check(
         paths: Annotated[List[Path], typer.Argument(exists=True)],
@@ -123,6 +176,24 @@ def badge(
     success("Badge Markdown copied to clipboard!")
 
 
+cache_cli = typer.Typer(no_args_is_help=True, add_completion=False)
+cli.add_typer(cache_cli, name="cache", help="Manage the global analysis cache")
+
+
+@cache_cli.command(help="Show global analysis cache statistics")
+def stats():
+    cache_stats_command(AnalysisCache.default_root())
+
+
+@cache_cli.command(help="Evict least recently used entries from the global analysis cache")
+def prune(
+        max_size: Annotated[
+            int, typer.Option("--max-size", min=0, help="Maximum cache size in MB")
+        ] = DEFAULT_MAX_SIZE // (1024 * 1024),
+):
+    cache_prune_command(AnalysisCache.default_root(), max_size * 1024 * 1024)
+
+
 def _version_callback(show: bool):
     if show:
         print(f"Code Limit version: {version}")
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from codelimit.common.AnalysisCache import AnalysisCache
+from codelimit.utils import info, success
+
+
+def cache_stats_command(cache_dir: Path):
+    stats = AnalysisCache(cache_dir).stats()
+    info(f"Cache directory: {cache_dir}")
+    info(f"Entries: {stats.entries}")
+    info(f"Size: {format_size(stats.size)}")
+
+
+def cache_prune_command(cache_dir: Path, max_size: int):
+    removed = AnalysisCache(cache_dir).prune(max_size)
+    success(f"Removed {removed.entries} entries, freed {format_size(removed.size)}")
+
+
+def format_size(size: int) -> str:
+    value = float(size)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from codelimit.common.report.BinaryReportReader import BinaryReportReader
+from codelimit.common.report.BinaryReportWriter import BinaryReportWriter
+from codelimit.common.report.ReportWriter import ReportWriter
+from codelimit.utils import read_report_data
+
+
+def convert_command(input_path: Path, output_path: Path):
+    report_data = input_path.read_bytes()
+    report = read_report_data(report_data)
+    if BinaryReportReader.is_binary_report(report_data):
+        with output_path.open("w") as output_file:
+            ReportWriter(report).write(output_file)
+    else:
+        with output_path.open("wb") as output_file:
+            BinaryReportWriter(report).write(output_file)
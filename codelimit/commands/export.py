@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+from rich.console import Console
+
+from codelimit.common.report.ReportWriter import ReportWriter
+from codelimit.utils import read_report, make_report_path
+
+
+def export_command(path: Path, output: Path | None = None):
+    stdout = Console(soft_wrap=True)
+    report = read_report(make_report_path(path), stdout)
+    if output:
+        with output.open("w") as output_file:
+            ReportWriter(report).write(output_file)
+    else:
+        ReportWriter(report).write(sys.stdout)
@@ -1,12 +1,18 @@
+from contextlib import closing
 from pathlib import Path
 from typing import Optional
 
 from rich.console import Console
 
+from codelimit.common.Codebase import Codebase
 from codelimit.common.Configuration import Configuration
 from codelimit.common.Scanner import scan_codebase
 from codelimit.common.report import format_text
+from codelimit.common.report.BinaryReportReader import BinaryReportReader
+from codelimit.common.report.BinaryReportWriter import BinaryReportWriter
+from codelimit.common.report.CacheBackend import CacheBackend
 from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportDatabase import ReportDatabase
 from codelimit.common.report.ReportReader import ReportReader
 from codelimit.common.report.ReportWriter import ReportWriter
 
@@ -15,19 +21,41 @@ def scan_command(path: Path):
     stdout = Console(soft_wrap=True)
     cache_dir = path.joinpath(".codelimit_cache").resolve()
     report_path = cache_dir.joinpath("codelimit.json").resolve()
-    cached_report = _read_cached_report(report_path)
+    _create_cache_dir(cache_dir)
     format_text.print_totals_header(stdout)
-    codebase = scan_codebase(path, cached_report)
-    codebase.aggregate()
-    report = Report(codebase, Configuration.repository)
+    if Configuration.cache_backend == CacheBackend.sqlite:
+        with closing(ReportDatabase(cache_dir.joinpath("codelimit.db"))) as database:
+            report = _make_report(scan_codebase(path, cached_files=database.files()))
+            database.update(report)
+        report_path.unlink(missing_ok=True)
+        cache_dir.joinpath("codelimit.bin").unlink(missing_ok=True)
+    elif Configuration.cache_backend == CacheBackend.binary:
+        binary_path = cache_dir.joinpath("codelimit.bin")
+        cached_report = _read_cached_binary_report(binary_path)
+        report = _make_report(scan_codebase(path, cached_report))
+        with binary_path.open("wb") as report_file:
+            BinaryReportWriter(report).write(report_file)
+        report_path.unlink(missing_ok=True)
+        cache_dir.joinpath("codelimit.db").unlink(missing_ok=True)
+    else:
+        cached_report = _read_cached_report(report_path)
+        report = _make_report(scan_codebase(path, cached_report))
+        with report_path.open("w") as report_file:
+            ReportWriter(report).write(report_file)
     format_text.print_summary(stdout, report)
+
+
+def _make_report(codebase: Codebase) -> Report:
+    return Report(codebase, Configuration.repository)
+
+
+def _create_cache_dir(cache_dir: Path):
     if not cache_dir.exists():
         cache_dir.mkdir()
         cache_dir_tag = cache_dir.joinpath("CACHEDIR.TAG").resolve()
         cache_dir_tag.write_text("Signature: 8a477f597d28d172789f06886806bc55")
         cache_dir_gitignore = cache_dir.joinpath(".gitignore").resolve()
         cache_dir_gitignore.write_text("# Created by codelimit automatically.\n*\n")
-    report_path.write_text(ReportWriter(report).to_json())
 
 
 def _read_cached_report(report_path: Path) -> Optional[Report]:
@@ -36,3 +64,14 @@ def _read_cached_report(report_path: Path) -> Optional[Report]:
         if cached_report and cached_report.version == Report.VERSION:
             return cached_report
     return None
+
+
+def _read_cached_binary_report(report_path: Path) -> Optional[Report]:
+    if report_path.exists():
+        data = report_path.read_bytes()
+        try:
+            if BinaryReportReader.get_report_version(data) == Report.VERSION:
+                return BinaryReportReader.from_bytes(data)
+        except ValueError:
+            pass
+    return None
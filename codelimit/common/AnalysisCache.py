@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.version import version
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+PRUNE_RATIO = 0.8
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    size: int
+
+
+class AnalysisCache:
+    def __init__(self, root: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.root = root
+        self.max_size = max_size
+        self.misses: list[tuple[str, str]] = []
+
+    @staticmethod
+    def default_root() -> Path:
+        cache_home = os.environ.get("XDG_CACHE_HOME")
+        base = Path(cache_home) if cache_home else Path.home().joinpath(".cache")
+        return base.joinpath("codelimit")
+
+    def get(self, checksum: str, language: str) -> list[Measurement] | None:
+        path = self._entry_path(checksum, language)
+        try:
+            data = path.read_text()
+            os.utime(path)
+        except OSError:
+            return None
+        try:
+            return [_measurement_from_json(m) for m in json.loads(data)]
+        except (ValueError, TypeError):
+            return None
+
+    def put(self, checksum: str, language: str, measurements: list[Measurement]):
+        path = self._entry_path(checksum, language)
+        data = json.dumps([_measurement_to_json(m) for m in measurements], separators=(",", ":"))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        result = CacheStats(len(entries), sum(size for _, size, _ in entries))
+        self._write_size(result.size)
+        return result
+
+    def update_size(self) -> CacheStats | None:
+        if not self.misses:
+            return None
+        size = self._read_size()
+        if size is None:
+            size = self.stats().size
+        else:
+            size += sum(self._entry_size(checksum, language) for checksum, language in self.misses)
+        self.misses = []
+        if size > self.max_size:
+            return self.prune(int(self.max_size * PRUNE_RATIO))
+        self._write_size(size)
+        return None
+
+    def prune(self, max_size: int | None = None) -> CacheStats:
+        limit = self.max_size if max_size is None else max_size
+        entries = self._entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        removed = 0
+        freed = 0
+        for path, entry_size, _ in sorted(entries, key=lambda e: e[2]):
+            if size - freed <= limit:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += entry_size
+        self._write_size(size - freed)
+        return CacheStats(removed, freed)
+
+    def _entry_path(self, checksum: str, language: str) -> Path:
+        key = hashlib.md5(f"{version}:{language}:{checksum}".encode()).hexdigest()
+        return self.root.joinpath("entries", key[:2], f"{key}.json")
+
+    def _entry_size(self, checksum: str, language: str) -> int:
+        try:
+            return self._entry_path(checksum, language).stat().st_size
+        except OSError:
+            return 0
+
+    def _read_size(self) -> int | None:
+        try:
+            return int(self.root.joinpath("size").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, size: int):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(str(size))
+            os.replace(tmp_path, self.root.joinpath("size"))
+        except OSError:
+            pass
+
+    def _entries(self) -> list[tuple[Path, int, int]]:
+        result: list[tuple[Path, int, int]] = []
+        entries_dir = self.root.joinpath("entries")
+        if not entries_dir.is_dir():
+            return result
+        for folder in os.scandir(entries_dir):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    result.append((Path(entry.path), stat.st_size, stat.st_mtime_ns))
+        return result
+
+
+def _measurement_to_json(measurement: Measurement) -> list:
+    return [
+        measurement.unit_name,
+        measurement.start.line,
+        measurement.start.column,
+        measurement.end.line,
+        measurement.end.column,
+        measurement.value,
+    ]
+
+
+def _measurement_from_json(data: list) -> Measurement:
+    unit_name, start_line, start_column, end_line, end_column, value = data
+    return Measurement(unit_name, Location(start_line, start_column), Location(end_line, end_column), value)
@@ -1,4 +1,5 @@
 from codelimit.common.LanguageTotals import LanguageTotals
+from codelimit.common.MeasurementStats import MeasurementStats
 from codelimit.common.SourceFileEntry import SourceFileEntry
 from codelimit.common.SourceFolder import SourceFolder
 from codelimit.common.Measurement import Measurement
@@ -11,9 +12,20 @@ class Codebase:
         self.tree = {"./": SourceFolder()}
         self.files: dict[str, SourceFileEntry] = {}
         self.totals: dict[str, LanguageTotals] = {}
+        self.stats = MeasurementStats(self.files, self.totals)
+
+    def load(self, files: dict[str, SourceFileEntry], totals: dict[str, LanguageTotals],
+             tree: dict[str, SourceFolder]):
+        self.files = files
+        self.totals = totals
+        self.tree = tree
+        self.stats = MeasurementStats(files, totals)
 
     def add_file(self, entry: SourceFileEntry):
+        if entry.path in self.files:
+            self.remove_file(entry.path)
         self.files[entry.path] = entry
+        self.stats.add(entry)
         if entry.language not in self.totals:
             self.totals[entry.language] = LanguageTotals(entry.language)
         self.totals[entry.language].add(entry)
@@ -22,6 +34,20 @@ class Codebase:
             self.add_folder(parent_folder)
         folder = self.tree[f"{parent_folder}/"]
         folder.add_file(entry)
+        self._update_profiles(parent_folder, entry.profile())
+
+    def remove_file(self, path: str) -> SourceFileEntry:
+        entry = self.files.pop(path)
+        self.stats.remove(entry)
+        totals = self.totals[entry.language]
+        totals.remove(entry)
+        if totals.files == 0:
+            del self.totals[entry.language]
+        parent_folder = get_parent_folder(path)
+        self.tree[f"{parent_folder}/"].remove_entry(entry.name)
+        self._update_profiles(parent_folder, [-v for v in entry.profile()])
+        self._remove_empty_folder(parent_folder)
+        return entry
 
     def add_folder(self, path: str):
         if path == ".":
@@ -33,23 +59,27 @@ class Codebase:
             parent_folder.add_folder(get_basename(path))
 
     def aggregate(self):
-        def aggregate_folder(path):
-            folder = self.tree[path]
-            for entry in folder.entries:
-                if entry.is_folder():
-                    if path == "./":
-                        sub_folder = entry.name
-                    else:
-                        sub_folder = f"{path}{entry.name}"
-                    folder.profile = merge_profiles(
-                        folder.profile, aggregate_folder(sub_folder)
-                    )
+        for folder in self.tree.values():
+            folder.profile = [0, 0, 0, 0]
+        for entry in self.files.values():
+            self._update_profiles(get_parent_folder(entry.path), entry.profile())
 
-                else:
-                    folder.profile = merge_profiles(folder.profile, entry.profile())
-            return folder.profile
+    def _update_profiles(self, path: str, profile: list[int]):
+        while True:
+            folder = self.tree[f"{path}/"]
+            folder.profile = merge_profiles(folder.profile, profile)
+            folder.digest = None
+            if path == ".":
+                return
+            path = get_parent_folder(path)
 
-        aggregate_folder("./")
+    def _remove_empty_folder(self, path: str):
+        if path == "." or self.tree[f"{path}/"].entries:
+            return
+        del self.tree[f"{path}/"]
+        parent_folder = get_parent_folder(path)
+        self.tree[f"{parent_folder}/"].remove_entry(f"{get_basename(path)}/")
+        self._remove_empty_folder(parent_folder)
 
     def all_files(self) -> list[str]:
         return list(self.files.keys())
@@ -64,7 +94,4 @@ class Codebase:
         return sorted(self.all_measurements(), key=lambda m: m.value, reverse=True)
 
     def total_loc(self) -> int:
-        result = 0
-        for m in self.all_measurements():
-            result += m.value
-        return result
+        return self.stats.total()
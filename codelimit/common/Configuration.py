@@ -5,11 +5,16 @@ from pathlib import Path
 from yaml import load, FullLoader
 
 from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.report.CacheBackend import CacheBackend
 
 
 class Configuration:
     exclude: list[str] = []
     verbose = False
+    jobs = 1
+    verify_checksums = False
+    cache_dir: Path | None = None
+    cache_backend = CacheBackend.json
     repository: GithubRepository | None = None
 
     @classmethod
@@ -23,6 +28,8 @@ class Configuration:
             cls.exclude.extend(d["exclude"])
         if "verbose" in d:
             cls.verbose = d["verbose"]
+        if "cache_backend" in d:
+            cls.cache_backend = CacheBackend(d["cache_backend"])
 
 
 def setup_logging():
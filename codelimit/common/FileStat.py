@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FileStat:
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @staticmethod
+    def from_path(path: str) -> FileStat:
+        stat = os.stat(path)
+        return FileStat(stat.st_size, stat.st_mtime_ns, stat.st_ino)
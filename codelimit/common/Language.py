@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from abc import ABC, abstractmethod
 
 from codelimit.common.Token import Token
@@ -14,11 +16,11 @@ class Language(ABC):
         self.allow_nested_functions = allow_nested_functions
 
     @abstractmethod
-    def extract_headers(self, tokens: list[Token]) -> list[Header]:
+    def extract_headers(self, tokens: Sequence[Token]) -> list[Header]:
         pass
 
     @abstractmethod
     def extract_blocks(
-            self, tokens: list[Token], headers: list[Header]
+            self, tokens: Sequence[Token], headers: list[Header]
     ) -> list[TokenRange]:
         pass
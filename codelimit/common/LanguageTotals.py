@@ -14,13 +14,23 @@ class LanguageTotals:
         self.unmaintainable = 0
 
     def add(self, entry: SourceFileEntry):
-        profile = make_count_profile(entry.measurements())
+        measurements = entry.measurements()
+        profile = make_count_profile(measurements)
         self.files += 1
         self.loc += entry.loc
-        self.functions += len(entry.measurements())
+        self.functions += len(measurements)
         self.hard_to_maintain += profile[2]
         self.unmaintainable += profile[3]
 
+    def remove(self, entry: SourceFileEntry):
+        measurements = entry.measurements()
+        profile = make_count_profile(measurements)
+        self.files -= 1
+        self.loc -= entry.loc
+        self.functions -= len(measurements)
+        self.hard_to_maintain -= profile[2]
+        self.unmaintainable -= profile[3]
+
     def is_equal(self, other: LanguageTotals) -> bool:
         return (
                 self.language == other.language and
@@ -0,0 +1,61 @@
+import os
+import re
+from fnmatch import translate
+from typing import Iterable
+
+from pygments.lexer import Lexer
+from pygments.lexers import find_lexer_class, get_lexer_for_filename
+from pygments.util import ClassNotFound
+
+
+class LexerIndex:
+    def __init__(self, language_names: Iterable[str]):
+        self.language_names = list(language_names)
+        self._lexers: dict[str, Lexer] = {}
+        self._filenames: dict[str, str] = {}
+        self._extensions: dict[str, str] = {}
+        self._patterns: list[re.Pattern] = []
+        self._built = False
+
+    def get_lexer(self, path: str | os.PathLike) -> Lexer | None:
+        if not self._built:
+            self._build()
+        filename = os.path.basename(path)
+        language_name = self._filenames.get(filename)
+        if language_name is None:
+            dot_index = filename.rfind(".")
+            if dot_index >= 0:
+                language_name = self._extensions.get(filename[dot_index:])
+        if language_name is None and any(p.match(filename) for p in self._patterns):
+            language_name = self._resolve(filename)
+        return self._lexers[language_name] if language_name else None
+
+    def _build(self):
+        for language_name in self.language_names:
+            lexer_class = find_lexer_class(language_name)
+            if lexer_class:
+                self._lexers[language_name] = lexer_class()
+        for lexer in self._lexers.values():
+            for glob in lexer.filenames:
+                self._add_glob(glob)
+        self._built = True
+
+    def _add_glob(self, glob: str):
+        if not any(c in glob for c in "*?["):
+            self._add_key(self._filenames, glob, glob)
+        elif glob.startswith("*.") and not any(c in glob[1:] for c in "*?[") and glob.count(".") == 1:
+            self._add_key(self._extensions, glob[1:], f"codelimit{glob[1:]}")
+        else:
+            self._patterns.append(re.compile(translate(glob)))
+
+    def _add_key(self, index: dict[str, str], key: str, sample_filename: str):
+        language_name = self._resolve(sample_filename)
+        if language_name:
+            index[key] = language_name
+
+    def _resolve(self, filename: str) -> str | None:
+        try:
+            language_name = get_lexer_for_filename(filename).__class__.name
+        except ClassNotFound:
+            return None
+        return language_name if language_name in self._lexers else None
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+
+from codelimit.common.Location import Location
+
+
+class LineIndex:
+    def __init__(self, code: str):
+        self.line_starts = array("i", [0])
+        index = code.find("\n")
+        while index != -1:
+            self.line_starts.append(index + 1)
+            index = code.find("\n", index + 1)
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+    def newline_indices(self) -> list[int]:
+        return [start - 1 for start in self.line_starts[1:]]
+
+    def line_column(self, offset: int) -> tuple[int, int]:
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def location(self, offset: int) -> Location:
+        return Location(*self.line_column(offset))
+
+    def offset(self, location: Location) -> int:
+        return self.line_starts[location.line - 1] + max(0, location.column - 1)
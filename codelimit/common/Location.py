@@ -2,6 +2,8 @@ from __future__ import annotations
 
 
 class Location:
+    __slots__ = ("line", "column")
+
     def __init__(self, line: int, column: int):
         self.line = line
         self.column = column
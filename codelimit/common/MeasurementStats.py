@@ -0,0 +1,53 @@
+from collections import Counter
+from collections.abc import Mapping
+
+from codelimit.common.LanguageTotals import LanguageTotals
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.utils import merge_profiles
+
+
+class MeasurementStats:
+    def __init__(self, files: Mapping[str, SourceFileEntry], totals: Mapping[str, LanguageTotals] | None = None):
+        self.files = files
+        self.totals = totals
+        self._profile: list[int] | None = None if files else [0, 0, 0, 0]
+        self._histogram: Counter[int] | None = None if files else Counter()
+
+    def add(self, entry: SourceFileEntry):
+        if self._profile is not None:
+            self._profile = merge_profiles(self._profile, entry.profile())
+        if self._histogram is not None:
+            self._histogram.update(m.value for m in entry.measurements())
+
+    def remove(self, entry: SourceFileEntry):
+        if self._profile is not None:
+            self._profile = [a - b for a, b in zip(self._profile, entry.profile())]
+        if self._histogram is not None:
+            self._histogram.subtract(m.value for m in entry.measurements())
+            self._histogram = +self._histogram
+
+    def profile(self) -> list[int]:
+        if self._profile is None:
+            result = [0, 0, 0, 0]
+            for entry in self.files.values():
+                result = merge_profiles(result, entry.profile())
+            self._profile = result
+        return self._profile
+
+    def histogram(self) -> Counter[int]:
+        if self._histogram is None:
+            result: Counter[int] = Counter()
+            for entry in self.files.values():
+                result.update(m.value for m in entry.measurements())
+            self._histogram = result
+        return self._histogram
+
+    def total(self) -> int:
+        return sum(self.profile())
+
+    def count(self) -> int:
+        if self.totals is not None:
+            return sum(totals.functions for totals in self.totals.values())
+        if self._histogram is not None:
+            return self._histogram.total()
+        return sum(len(entry.measurements()) for entry in self.files.values())
@@ -1,45 +1,56 @@
+import hashlib
 import locale
 import logging
 import os
+import re
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from os.path import relpath
 from pathlib import Path
-from typing import Union, Callable
+from typing import Union, Callable, Iterator, Mapping, Sequence
 
 from pathspec import PathSpec
 from pygments.lexer import Lexer
-from pygments.lexers import get_lexer_for_filename
-from pygments.util import ClassNotFound
 from rich import print
 from rich.live import Live
 
+from codelimit.common.AnalysisCache import AnalysisCache
 from codelimit.common.Codebase import Codebase
 from codelimit.common.Configuration import Configuration
+from codelimit.common.FileStat import FileStat
 from codelimit.common.Language import Language
 from codelimit.common.Location import Location
 from codelimit.common.Measurement import Measurement
 from codelimit.common.ScanResultTable import ScanResultTable
 from codelimit.common.ScanTotals import ScanTotals
+from codelimit.common.SourceBlob import SourceBlob
 from codelimit.common.SourceFileEntry import SourceFileEntry
 from codelimit.common.Token import Token
 from codelimit.common.lexer_utils import lex
 from codelimit.common.report.Report import Report
-from codelimit.common.scope.scope_utils import build_scopes, unfold_scopes, count_lines
+from codelimit.common.scope.scope_utils import build_scopes, unfold_scopes, count_scopes_lines
 from codelimit.common.source_utils import filter_tokens
-from codelimit.common.utils import (
-    calculate_checksum,
-)
 from codelimit.languages import Languages
 
 locale.setlocale(locale.LC_ALL, "")
 
+FileAnalysis = tuple[str, Union[SourceFileEntry, None], bool]
+PendingFile = tuple[Future[FileAnalysis], Union[SourceFileEntry, None], FileStat]
 
-def scan_codebase(path: Path, cached_report: Union[Report, None] = None) -> Codebase:
+PENDING_PER_JOB = 2
+
+
+def scan_codebase(
+        path: Path,
+        cached_report: Union[Report, None] = None,
+        cached_files: Union[Mapping[str, SourceFileEntry], None] = None,
+) -> Codebase:
     scan_totals = ScanTotals()
     if Configuration.verbose:
         def add_file_entry(entry: SourceFileEntry):
             scan_totals.add(entry)
 
-        codebase = scan_path(path, cached_report, add_file_entry)
+        codebase = scan_path(path, cached_report, add_file_entry, Configuration.jobs, cached_files)
         print(ScanResultTable(scan_totals))
     else:
         with Live(refresh_per_second=2) as live:
@@ -48,7 +59,7 @@ def scan_codebase(path: Path, cached_report: Union[Report, None] = None) -> Code
                 table = ScanResultTable(scan_totals)
                 live.update(table)
 
-            codebase = scan_path(path, cached_report, add_file_entry)
+            codebase = scan_path(path, cached_report, add_file_entry, Configuration.jobs, cached_files)
             live.stop()
             live.refresh()
     return codebase
@@ -56,96 +67,247 @@ def scan_codebase(path: Path, cached_report: Union[Report, None] = None) -> Code
 
 def scan_path(path: Path, cached_report: Union[Report, None] = None,
               add_file_entry_callback: Union[Callable[[SourceFileEntry], None], None] = None,
+              jobs: int = 1,
+              cached_files: Union[Mapping[str, SourceFileEntry], None] = None,
               ) -> Codebase:
     result = Codebase(str(path.resolve().absolute()))
-    excludes_spec = generate_exclude_spec(path)
-    for root, dirs, files in os.walk(path.absolute()):
-        files = [f for f in files if not f[0] == "."]
-        dirs[:] = [d for d in dirs if not d[0] == "."]
-        for file in files:
-            rel_path = Path(os.path.join(root, file)).relative_to(path.absolute())
-            if is_excluded(rel_path, excludes_spec):
-                continue
-            try:
-                lexer = get_lexer_for_filename(rel_path)
-                lexer_name = lexer.__class__.name
-                file_path = os.path.join(root, file)
-                languages = Languages.by_name.keys()
-                if lexer_name in languages:
-                    file_entry = _scan_file(
-                        result, lexer, path, file_path, cached_report
-                    )
-                    if add_file_entry_callback:
-                        add_file_entry_callback(file_entry)
-            except ClassNotFound:
-                pass
+    if cached_files is None and cached_report:
+        cached_files = cached_report.codebase.files
+    cache = AnalysisCache(Configuration.cache_dir) if Configuration.cache_dir else None
+    cached_codebase = cached_report.codebase if cached_report and not Configuration.verify_checksums else None
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            _scan_files(result, path, cached_files, add_file_entry_callback, executor, cache, cached_codebase,
+                        jobs * PENDING_PER_JOB)
+    else:
+        _scan_files(result, path, cached_files, add_file_entry_callback, None, cache, cached_codebase)
+    if cache:
+        cache.update_size()
     return result
 
 
-def _scan_file(
+def _scan_files(
         codebase: Codebase,
-        lexer: Lexer,
         root: Path,
+        cached_files: Union[Mapping[str, SourceFileEntry], None] = None,
+        add_file_entry_callback: Union[Callable[[SourceFileEntry], None], None] = None,
+        executor: Union[Executor, None] = None,
+        cache: Union[AnalysisCache, None] = None,
+        cached_codebase: Union[Codebase, None] = None,
+        max_pending: int = 1,
+):
+    excludes = _get_excludes(root)
+    excludes_spec = PathSpec.from_lines("gitignore", excludes)
+    salt = hashlib.md5("\n".join(excludes).encode()).hexdigest()
+    digests: dict[str, str] = {}
+    pending: deque[Union[SourceFileEntry, PendingFile]] = deque()
+    for item in _walk_source_files(str(root.absolute()), "./", excludes_spec, _get_negated_prefixes(excludes_spec),
+                                   salt, digests, cached_codebase):
+        while pending and (len(pending) >= max_pending or _is_done(pending[0])):
+            _add_file_entry(codebase, pending.popleft(), add_file_entry_callback, cache)
+        if isinstance(item, SourceFileEntry):
+            pending.append(_reuse_cached_entry(item, item.checksum(), item.stat()))
+        else:
+            file_path, lexer, stat = item
+            pending.append(_scan_file(lexer, root, file_path, cached_files, executor, cache, stat))
+    while pending:
+        _add_file_entry(codebase, pending.popleft(), add_file_entry_callback, cache)
+    _store_digests(codebase, digests)
+
+
+def _walk_source_files(
         path: str,
-        cached_report: Union[Report, None] = None,
-) -> SourceFileEntry:
-    checksum = calculate_checksum(path)
-    rel_path = relpath(path, root)
-    cached_entry = None
-    if cached_report:
-        rel_path = relpath(path, root)
-        try:
-            cached_entry = cached_report.codebase.files[rel_path]
-        except KeyError:
-            pass
-    if cached_entry and cached_entry.checksum() == checksum:
-        entry = SourceFileEntry(
-            rel_path,
-            checksum,
-            cached_entry.language,
-            cached_entry.loc,
-            cached_entry.measurements(),
+        key: str,
+        excludes_spec: PathSpec,
+        negated_prefixes: list[str | None],
+        salt: str,
+        digests: dict[str, str],
+        cached_codebase: Union[Codebase, None] = None,
+) -> Iterator[Union[SourceFileEntry, tuple[str, Lexer, FileStat]]]:
+    rel_folder = Path(key)
+    files, sub_folders = _read_folder(path, rel_folder, excludes_spec, negated_prefixes)
+    children = [f"f\0{name}\0{stat.size}\0{stat.mtime_ns}\0{stat.inode}\0" for name, stat in files]
+    for entry in sub_folders:
+        sub_key = f"{rel_folder.joinpath(entry.name)}/"
+        yield from _walk_source_files(
+            entry.path, sub_key, excludes_spec, negated_prefixes, salt, digests, cached_codebase
         )
+        children.append(f"d\0{entry.name}\0{digests[sub_key]}\0")
+    digests[key] = hashlib.md5("".join([salt, *sorted(children)]).encode()).hexdigest()
+    cached_folder = cached_codebase.tree.get(key) if cached_codebase else None
+    if cached_codebase and cached_folder and cached_folder.digest == digests[key]:
+        for folder_entry in cached_folder.entries:
+            if folder_entry.is_file():
+                yield cached_codebase.files[folder_entry.path]
+        return
+    for name, stat in files:
+        lexer = Languages.lexer_index.get_lexer(name)
+        if lexer and not is_excluded(rel_folder.joinpath(name), excludes_spec):
+            yield os.path.join(path, name), lexer, stat
+
+
+def _read_folder(
+        path: str, rel_folder: Path, excludes_spec: PathSpec, negated_prefixes: list[str | None]
+) -> tuple[list[tuple[str, FileStat]], list[os.DirEntry]]:
+    files = []
+    sub_folders = []
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        entries = []
+    for entry in entries:
+        if entry.name[0] == ".":
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((entry.name, FileStat(stat.st_size, stat.st_mtime_ns, stat.st_ino)))
+        elif not entry.is_symlink() and not is_excluded_folder(rel_folder.joinpath(entry.name), excludes_spec,
+                                                                negated_prefixes):
+            sub_folders.append(entry)
+    return files, sub_folders
+
+
+def _store_digests(codebase: Codebase, digests: Mapping[str, str]):
+    for key, digest in digests.items():
+        folder = codebase.tree.get(key)
+        if folder:
+            folder.digest = digest
+
+
+def walk_files(root: Path, excludes_spec: PathSpec, spec_root: Path) -> Iterator[Path]:
+    negated_prefixes = _get_negated_prefixes(excludes_spec)
+    for folder, dirs, files in os.walk(root.absolute()):
+        rel_folder = Path(folder).relative_to(spec_root)
+        dirs[:] = [
+            d for d in dirs
+            if not d[0] == "." and not is_excluded_folder(rel_folder.joinpath(d), excludes_spec, negated_prefixes)
+        ]
+        for file in files:
+            if file[0] == ".":
+                continue
+            if is_excluded(rel_folder.joinpath(file), excludes_spec):
+                continue
+            yield Path(folder, file)
+
+
+def _is_done(item: Union[SourceFileEntry, PendingFile]) -> bool:
+    return isinstance(item, SourceFileEntry) or item[0].done()
+
+
+def _add_file_entry(
+        codebase: Codebase,
+        item: Union[SourceFileEntry, PendingFile],
+        add_file_entry_callback: Union[Callable[[SourceFileEntry], None], None] = None,
+        cache: Union[AnalysisCache, None] = None,
+):
+    if isinstance(item, SourceFileEntry):
+        entry = item
     else:
-        entry = _analyze_file(path, rel_path, checksum, lexer)
+        future, cached_entry, stat = item
+        entry = _resolve_analysis(future.result(), cached_entry, stat, cache)
     codebase.add_file(entry)
+    if add_file_entry_callback:
+        add_file_entry_callback(entry)
+
+
+def _scan_file(
+        lexer: Lexer,
+        root: Path,
+        path: str,
+        cached_files: Union[Mapping[str, SourceFileEntry], None] = None,
+        executor: Union[Executor, None] = None,
+        cache: Union[AnalysisCache, None] = None,
+        stat: Union[FileStat, None] = None,
+) -> Union[SourceFileEntry, PendingFile]:
+    rel_path = relpath(path, root)
+    if stat is None:
+        stat = FileStat.from_path(path)
+    cached_entry = cached_files.get(rel_path) if cached_files is not None else None
+    if cached_entry and not Configuration.verify_checksums and cached_entry.stat() == stat:
+        return _reuse_cached_entry(cached_entry, cached_entry.checksum(), stat)
+    cached_checksum = cached_entry.checksum() if cached_entry else None
+    if executor:
+        future = executor.submit(_analyze_file, path, rel_path, lexer, stat, cache, cached_checksum)
+        return future, cached_entry, stat
+    return _resolve_analysis(_analyze_file(path, rel_path, lexer, stat, cache, cached_checksum), cached_entry, stat,
+                             cache)
+
+
+def _resolve_analysis(
+        analysis: FileAnalysis, cached_entry: SourceFileEntry | None, stat: FileStat, cache: AnalysisCache | None
+) -> SourceFileEntry:
+    checksum, entry, cache_miss = analysis
+    if cache and cache_miss and entry:
+        cache.misses.append((checksum, entry.language))
+    if entry is None and cached_entry:
+        return _reuse_cached_entry(cached_entry, checksum, stat)
+    assert entry is not None
     return entry
 
 
-def _read_file(path: Path):
-    try:
-        with open(path) as f:
-            return f.read()
-    except UnicodeDecodeError:
-        with open(path, encoding="latin-1") as f:
-            return f.read()
+def _reuse_cached_entry(cached_entry: SourceFileEntry, checksum: str, stat: FileStat | None) -> SourceFileEntry:
+    return SourceFileEntry(
+        cached_entry.path,
+        checksum,
+        cached_entry.language,
+        cached_entry.loc,
+        cached_entry.measurements(),
+        stat,
+    )
 
 
-def _analyze_file(path, rel_path, checksum, lexer):
-    logging.info(f"Analyzing {rel_path}")
-    code = _read_file(path)
-    all_tokens = lex(lexer, code, False)
+def _analyze_file(
+        path: str,
+        rel_path: str,
+        lexer: Lexer,
+        stat: FileStat | None = None,
+        cache: AnalysisCache | None = None,
+        cached_checksum: str | None = None,
+) -> FileAnalysis:
+    blob = SourceBlob.from_path(path)
+    if blob.checksum == cached_checksum:
+        return blob.checksum, None, False
     language_name = lexer.__class__.name
+    if cache:
+        cached_measurements = cache.get(blob.checksum, language_name)
+        if cached_measurements is not None:
+            return blob.checksum, _make_file_entry(rel_path, blob.checksum, language_name, cached_measurements,
+                                                   stat), False
+    logging.info(f"Analyzing {rel_path}")
+    all_tokens = lex(lexer, blob.text(), False)
     language = Languages.by_name[language_name]
     if language:
         measurements = scan_file(all_tokens, language)
     else:
         measurements = []
+    if cache:
+        cache.put(blob.checksum, language_name, measurements)
+    return blob.checksum, _make_file_entry(rel_path, blob.checksum, language_name, measurements, stat), True
+
+
+def _make_file_entry(
+        rel_path: str, checksum: str, language_name: str, measurements: list[Measurement], stat: FileStat | None
+) -> SourceFileEntry:
     file_loc = sum([m.value for m in measurements])
-    entry = SourceFileEntry(
-        rel_path, checksum, lexer.__class__.name, file_loc, measurements
-    )
-    return entry
+    return SourceFileEntry(rel_path, checksum, language_name, file_loc, measurements, stat)
 
 
-def scan_file(tokens: list[Token], language: Language) -> list[Measurement]:
+def scan_file(tokens: Sequence[Token], language: Language) -> list[Measurement]:
     scopes = build_scopes(tokens, language)
     scopes = unfold_scopes(scopes)
     measurements: list[Measurement] = []
     code_tokens = filter_tokens(tokens)
     if scopes:
-        for scope in scopes:
-            length = count_lines(scope, code_tokens)
+        lengths = count_scopes_lines(scopes, code_tokens)
+        for scope, length in zip(scopes, lengths):
             start_location = code_tokens[scope.header.token_range.start].location
             last_token = code_tokens[scope.block.end - 1]
             end_location = Location(
@@ -159,12 +321,16 @@ def scan_file(tokens: list[Token], language: Language) -> list[Measurement]:
 
 
 def generate_exclude_spec(root: Path) -> PathSpec:
+    return PathSpec.from_lines("gitignore", _get_excludes(root))
+
+
+def _get_excludes(root: Path) -> list[str]:
     excludes = DEFAULT_EXCLUDES.copy()
     excludes.extend(Configuration.exclude)
     gitignore_excludes = _read_gitignore(root)
     if gitignore_excludes:
         excludes.extend(gitignore_excludes)
-    return PathSpec.from_lines("gitignore", excludes)
+    return excludes
 
 
 def _read_gitignore(path: Path) -> list[str] | None:
@@ -178,6 +344,36 @@ def is_excluded(path: Path, spec: PathSpec):
     return spec.match_file(path)
 
 
+def is_excluded_folder(path: Path, spec: PathSpec, negated_prefixes: list[str | None] | None = None) -> bool:
+    folder = f"{path.as_posix()}/"
+    if not spec.match_file(folder):
+        return False
+    if negated_prefixes is None:
+        negated_prefixes = _get_negated_prefixes(spec)
+    for prefix in negated_prefixes:
+        if prefix is None or prefix.startswith(folder) or folder.startswith(prefix):
+            return False
+    return True
+
+
+def _get_negated_prefixes(spec: PathSpec) -> list[str | None]:
+    result: list[str | None] = []
+    for pattern in spec.patterns:
+        if pattern.include is not False:
+            continue
+        text = getattr(pattern, "pattern", None)
+        if not isinstance(text, str):
+            result.append(None)
+            continue
+        text = text.lstrip("!").rstrip("/")
+        if "/" not in text or text.startswith("**/"):
+            result.append(None)
+            continue
+        text = text.lstrip("/")
+        result.append(re.split(r"[*?\[\\]", text, maxsplit=1)[0])
+    return result
+
+
 DEFAULT_EXCLUDES = [
     ".bzr",
     ".direnv",
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+from dataclasses import dataclass
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+
+@dataclass(frozen=True)
+class SourceBlob:
+    data: bytes
+    checksum: str
+
+    @staticmethod
+    def from_bytes(data: bytes) -> SourceBlob:
+        return SourceBlob(data, hashlib.md5(data).hexdigest())
+
+    @staticmethod
+    def from_path(path: str) -> SourceBlob:
+        with open(path, "rb") as file:
+            return SourceBlob.from_bytes(file.read())
+
+    def text(self) -> str:
+        text = _decode(self.data)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+
+def _decode(data: bytes) -> str:
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data[len(bom):].decode(encoding, errors="replace")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
@@ -1,4 +1,5 @@
 from codelimit.common.CodebseEntry import CodebaseEntry
+from codelimit.common.FileStat import FileStat
 from codelimit.common.Measurement import Measurement
 from codelimit.common.utils import make_profile
 
@@ -11,6 +12,7 @@ class SourceFileEntry(CodebaseEntry):
         language: str,
         loc: int,
         measurements: list[Measurement],
+        stat: FileStat | None = None,
     ):
         super().__init__(path)
         profile = make_profile(measurements)
@@ -19,6 +21,7 @@ class SourceFileEntry(CodebaseEntry):
         self.loc = loc
         self._profile: list[int] = profile
         self._measurements = measurements
+        self._stat = stat
 
     def is_folder(self):
         return False
@@ -34,3 +37,6 @@ class SourceFileEntry(CodebaseEntry):
 
     def measurements(self):
         return self._measurements
+
+    def stat(self):
+        return self._stat
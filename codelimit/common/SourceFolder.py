@@ -9,9 +9,13 @@ class SourceFolder:
     def __init__(self) -> None:
         self.entries: list[CodebaseEntry] = []
         self.profile = [0, 0, 0, 0]
+        self.digest: str | None = None
 
     def add_file(self, entry: SourceFileEntry):
         self.entries.append(entry)
 
     def add_folder(self, name: str):
         self.entries.append(SourceFolderEntry(f"{name}"))
+
+    def remove_entry(self, name: str):
+        self.entries = [e for e in self.entries if e.name != name]
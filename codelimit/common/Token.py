@@ -14,6 +14,8 @@ from codelimit.common.Location import Location
 
 
 class Token:
+    __slots__ = ("location", "token_type", "value")
+
     def __init__(self, location: Location, token_type: Any, value: str):
         self.location = location
         self.token_type = token_type
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterable, Iterator, Sequence
+
+from pygments.token import Comment, Text, Whitespace
+
+from codelimit.common.Location import Location
+from codelimit.common.Token import Token
+from codelimit.common.TokenView import TokenView
+
+CODE = 0
+COMMENT = 1
+WHITESPACE = 2
+
+_type_ids: dict[Any, int] = {}
+_types: list[Any] = []
+
+
+def intern_token_type(token_type: Any) -> int:
+    type_id = _type_ids.get(token_type)
+    if type_id is None:
+        type_id = len(_types)
+        _type_ids[token_type] = type_id
+        _types.append(token_type)
+    return type_id
+
+
+class TokenBuffer:
+    def __init__(self, code: str):
+        self.code = code
+        self.offsets = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.type_ids = array("H")
+        self.kinds = bytearray()
+        self.lengths = array("i")
+        self.detached_values: dict[int, str] = {}
+
+    def append(self, offset: int, line: int, column: int, token_type: Any, value: str):
+        if not self.code.startswith(value, offset):
+            self.detached_values[len(self.offsets)] = value
+        self.offsets.append(offset)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.type_ids.append(intern_token_type(token_type))
+        self.kinds.append(_kind(token_type, value))
+        self.lengths.append(len(value))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def token_type(self, index: int) -> Any:
+        return _types[self.type_ids[index]]
+
+    def value(self, index: int) -> str:
+        if self.detached_values and index in self.detached_values:
+            return self.detached_values[index]
+        offset = self.offsets[index]
+        return self.code[offset:offset + self.lengths[index]]
+
+    def types_and_values(self, indices: Sequence[int], start: int = 0) -> Iterator[tuple[Any, str]]:
+        code, offsets, lengths, type_ids = self.code, self.offsets, self.lengths, self.type_ids
+        detached_values = self.detached_values
+        for i in range(start, len(indices)):
+            index = indices[i]
+            if detached_values and index in detached_values:
+                value = detached_values[index]
+            else:
+                offset = offsets[index]
+                value = code[offset:offset + lengths[index]]
+            yield _types[type_ids[index]], value
+
+    def token(self, index: int) -> Token:
+        return Token(Location(self.lines[index], self.columns[index]), _types[self.type_ids[index]], self.value(index))
+
+    def view(self, indices: Iterable[int] | None = None) -> TokenView:
+        if indices is None:
+            return TokenView(self, range(len(self)))
+        return TokenView(self, array("i", indices))
+
+    def code_view(self) -> TokenView:
+        return self.view().select(CODE)
+
+    def comment_view(self) -> TokenView:
+        return self.view().select(COMMENT)
+
+
+def _kind(token_type: Any, value: str) -> int:
+    if (token_type == Text or token_type == Whitespace) and value.isspace():
+        return WHITESPACE
+    elif token_type in Comment:
+        return COMMENT
+    else:
+        return CODE
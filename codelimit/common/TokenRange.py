@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from codelimit.common.Token import Token
 
 
@@ -14,7 +16,7 @@ class TokenRange:
     def __repr__(self):
         return self.__str__()
 
-    def token_string(self, tokens: list[Token]):
+    def token_string(self, tokens: Sequence[Token]):
         return " ".join([t.value for t in tokens[self.start:self.end]])
 
     def lt(self, other: TokenRange):
@@ -32,7 +34,7 @@ class TokenRange:
         return start_overlap or end_overlap
 
 
-def sort_token_ranges(token_ranges: list[TokenRange], tokens: list[Token], reverse=False) -> list[TokenRange]:
+def sort_token_ranges(token_ranges: list[TokenRange], tokens: Sequence[Token], reverse=False) -> list[TokenRange]:
     return sorted(
         token_ranges,
         reverse=reverse,
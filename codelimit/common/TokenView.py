@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, overload
+
+from codelimit.common.Token import Token
+
+if TYPE_CHECKING:
+    from codelimit.common.TokenBuffer import TokenBuffer
+
+
+class TokenView(Sequence[Token]):
+    def __init__(self, buffer: TokenBuffer, indices: Sequence[int]):
+        self.buffer = buffer
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, index: int) -> Token:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> TokenView:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Token | TokenView:
+        if isinstance(index, slice):
+            return TokenView(self.buffer, self.indices[index])
+        return self.buffer.token(self.indices[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        return map(self.buffer.token, self.indices)
+
+    def __eq__(self, other):
+        if isinstance(other, TokenView):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def lines(self) -> Sequence[int]:
+        lines = self.buffer.lines
+        if isinstance(self.indices, range) and self.indices.step == 1:
+            return lines[self.indices.start:self.indices.stop]
+        return array("i", map(lines.__getitem__, self.indices))
+
+    def values(self) -> Sequence[str]:
+        return list(map(self.buffer.value, self.indices))
+
+    def types_and_values(self, start: int = 0) -> Iterator[tuple[Any, str]]:
+        return self.buffer.types_and_values(self.indices, start)
+
+    def select(self, *kinds: int) -> TokenView:
+        buffer_kinds = self.buffer.kinds
+        return TokenView(self.buffer, array("i", (i for i in self.indices if buffer_kinds[i] in kinds)))
+
+    def __str__(self):
+        return str(list(self))
+
+    def __repr__(self):
+        return str(self)
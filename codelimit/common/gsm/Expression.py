@@ -30,6 +30,10 @@ def expression_to_nfa(expression: Expression[T]) -> NFA:
     return nfa_stack.pop()
 
 
+def expression_to_dfa(expression: Expression[T]) -> DFA:
+    return minimize_dfa(nfa_to_dfa(expression_to_nfa(expression)))
+
+
 def epsilon_closure(states: State | Iterable[State]) -> set[State]:
     result = set()
     if isinstance(states, State):
@@ -58,14 +62,14 @@ def state_set_transitions(states: set[State]) -> set[Predicate]:
     return result
 
 
-def state_set_id(states: set[State]) -> str:
-    return ", ".join([str(id) for id in sorted([state.id for state in states])])
+def state_set_id(states: set[State]) -> frozenset[int]:
+    return frozenset(state.id for state in states)
 
 
 def nfa_to_dfa(nfa: NFA) -> DFA:
     start = State()
     stack = [(start, epsilon_closure(nfa.start))]
-    states: dict[str, State] = {}
+    states: dict[frozenset[int], State] = {}
     accepting_states = []
     marked_states = set()
     while stack:
@@ -80,11 +84,88 @@ def nfa_to_dfa(nfa: NFA) -> DFA:
         transitions = state_set_transitions(T)
         for predicate in transitions:
             new_states = epsilon_closure(move(T, predicate))
-            if state_set_id(new_states) in states:
-                new_state = states[state_set_id(new_states)]
-            else:
+            new_states_id = state_set_id(new_states)
+            new_state = states.get(new_states_id)
+            if new_state is None:
                 new_state = State()
-                states[state_set_id(new_states)] = new_state
+                states[new_states_id] = new_state
             state.transition.append((predicate, new_state))
             stack.append((new_state, new_states))
     return DFA(start, accepting_states)
+
+
+def reachable_states(dfa: DFA) -> list[State]:
+    result = [dfa.start]
+    visited = {dfa.start}
+    for state in result:
+        for _, target in state.transition:
+            if target not in visited:
+                visited.add(target)
+                result.append(target)
+    return result
+
+
+def minimize_dfa(dfa: DFA) -> DFA:
+    states = reachable_states(dfa)
+    state_index = {state: i for i, state in enumerate(states)}
+    sink = len(states)
+    symbols: dict[Predicate, int] = {}
+    for state in states:
+        for predicate, _ in state.transition:
+            symbols.setdefault(predicate, len(symbols))
+    inverse: list[list[set[int]]] = [
+        [set() for _ in range(sink + 1)] for _ in range(len(symbols))
+    ]
+    for i, state in enumerate(states):
+        targets = {symbols[predicate]: state_index[target] for predicate, target in state.transition}
+        for symbol in range(len(symbols)):
+            inverse[symbol][targets.get(symbol, sink)].add(i)
+    for symbol in range(len(symbols)):
+        inverse[symbol][sink].add(sink)
+
+    accepting = {state_index[state] for state in dfa.accepting if state in state_index}
+    blocks = [block for block in (accepting, set(range(sink + 1)) - accepting) if block]
+    block_of = [0] * (sink + 1)
+    for b, block in enumerate(blocks):
+        for i in block:
+            block_of[i] = b
+    worklist = {(b, symbol) for b in range(len(blocks)) for symbol in range(len(symbols))}
+    while worklist:
+        b, symbol = worklist.pop()
+        predecessors = set()
+        for i in blocks[b]:
+            predecessors.update(inverse[symbol][i])
+        for y in {block_of[i] for i in predecessors}:
+            inside = blocks[y] & predecessors
+            outside = blocks[y] - predecessors
+            if not inside or not outside:
+                continue
+            blocks[y] = inside
+            blocks.append(outside)
+            new_block = len(blocks) - 1
+            for i in outside:
+                block_of[i] = new_block
+            for s in range(len(symbols)):
+                if (y, s) in worklist:
+                    worklist.add((new_block, s))
+                else:
+                    worklist.add((y, s) if len(inside) <= len(outside) else (new_block, s))
+
+    sink_block = block_of[sink]
+    new_states = {b: State() for b in range(len(blocks)) if b != sink_block}
+
+    def live_transitions(state: State) -> list[tuple[Predicate, int]]:
+        result = [(predicate, block_of[state_index[target]]) for predicate, target in state.transition]
+        return sorted([t for t in result if t[1] != sink_block], key=lambda t: symbols[t[0]])
+
+    for b, new_state in new_states.items():
+        # Transitions are ordered by symbol, so every state of a block yields the same list.
+        transitions = live_transitions(states[min(blocks[b])])
+        assert all(live_transitions(states[i]) == transitions for i in blocks[b])
+        for predicate, target_block in transitions:
+            new_state.transition.append((predicate, new_states[target_block]))
+    start_block = block_of[state_index[dfa.start]]
+    if start_block == sink_block:
+        return DFA(State(), [])
+    accepting_blocks = sorted({block_of[i] for i in accepting})
+    return DFA(new_states[start_block], [new_states[b] for b in accepting_blocks])
@@ -1,8 +1,9 @@
-from copy import deepcopy
+from typing import Any, Sequence
 
 from codelimit.common.gsm.automata.DFA import DFA
 from codelimit.common.gsm.automata.State import State
-from codelimit.common.gsm.predicate.Predicate import Predicate
+
+_UNKNOWN: Any = object()
 
 
 class Pattern:
@@ -11,23 +12,64 @@ class Pattern:
         self.end = start
         self.automata = automata
         self.state = automata.start
-        self.tokens: list = []
-        self.predicate_map: dict[int, Predicate] = {}
-
-    def consume(self, item) -> State | None:
-        found_transition = False
-        for transition in self.state.transition:
-            predicate_id = id(transition[0])
-            if predicate_id not in self.predicate_map:
-                self.predicate_map[predicate_id] = deepcopy(transition[0])
-            predicate = self.predicate_map[predicate_id]
-            if predicate.accept(item):
-                if found_transition:
-                    raise ValueError("Multiple transitions found!")
-                found_transition = True
-                self.tokens.append(item)
-                self.state = transition[1]
-        return self.state if found_transition else None
+        self.tokens: Sequence = []
+        self.predicate_states: dict[int, int] = {}
+
+    def reset(self, start: int):
+        self.start = start
+        self.end = start
+        self.state = self.automata.start
+        self.predicate_states.clear()
+
+    def consume(self, item, item_class: int | None = None) -> State | None:
+        return self.consume_at((item,), 0, item_class)
+
+    def consume_at(self, sequence: Sequence, index: int, item_class: int | None = None) -> State | None:
+        table = self.automata.tables.get(self.state)
+        if item_class is not None and table is not None:
+            next_state = table.get(item_class, _UNKNOWN)
+            if next_state is _UNKNOWN:
+                next_state = self._next_state(sequence[index])
+                table[item_class] = next_state
+        elif item_class is not None and self.state in self.automata.stateful_tables:
+            next_state = self._next_stateful_state(sequence, index, item_class)
+        else:
+            next_state = self._next_state(sequence[index])
+        if next_state is None:
+            return None
+        self.state = next_state
+        self.end += 1
+        return next_state
+
+    def _next_stateful_state(self, sequence: Sequence, index: int, item_class: int) -> State | None:
+        table = self.automata.stateful_tables[self.state]
+        predicate_ids = self.automata.stateful_predicates[self.state]
+        predicate_states = self.predicate_states
+        key = (item_class, *[predicate_states.get(p, 0) for p in predicate_ids])
+        cached = table.get(key)
+        if cached is None:
+            next_state = self._next_state(sequence[index])
+            table[key] = next_state, [predicate_states.get(p, 0) for p in predicate_ids]
+            return next_state
+        for predicate_id, predicate_state in zip(predicate_ids, cached[1]):
+            predicate_states[predicate_id] = predicate_state
+        return cached[0]
+
+    def _next_state(self, item) -> State | None:
+        next_state = None
+        for predicate, target in self.state.transition:
+            if predicate.stateful:
+                predicate_id = id(predicate)
+                predicate_state = predicate.step(item, self.predicate_states.get(predicate_id, 0))
+                if predicate_state is None:
+                    continue
+                self.predicate_states[predicate_id] = predicate_state
+            elif not predicate.accept(item):
+                continue
+            if next_state is not None:
+                raise ValueError("Multiple transitions found!")
+            next_state = target
+        return next_state
 
     def is_accepting(self):
         return self.automata.is_accepting(self.state)
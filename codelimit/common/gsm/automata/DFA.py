@@ -1,3 +1,6 @@
+from itertools import repeat
+from typing import Any, Callable, Hashable, Iterator, Sequence
+
 from codelimit.common.gsm.automata.Automata import Automata
 from codelimit.common.gsm.automata.State import State
 
@@ -6,9 +9,69 @@ class DFA(Automata):
     def __init__(self, start: State, accepting: list[State]):
         super().__init__(start)
         self.accepting = accepting
+        self.tables: dict[State, dict[int, State | None] | None] = {}
+        self.stateful_tables: dict[State, dict[tuple, tuple[State | None, list[int]]]] = {}
+        self.stateful_predicates: dict[State, list[int]] = {}
+        self._classifier: Callable[[Any, frozenset], Hashable] | None = None
+        self._sequence_classifier: Callable[[Sequence, frozenset, int], Iterator[Hashable]] | None = None
+        self._values: frozenset = frozenset()
+        self._classes: dict[Hashable, int] = {}
+        self._compiled = False
 
     def is_accepting(self, state: State) -> bool:
         return state in self.accepting
 
+    def classify(self, item: Any) -> int | None:
+        if not self._compiled:
+            self._compile()
+        if self._classifier is None:
+            return None
+        return self._class_id(self._classifier(item, self._values))
+
+    def classify_from(self, sequence: Sequence, start: int = 0) -> Iterator[int | None]:
+        if not self._compiled:
+            self._compile()
+        if self._sequence_classifier is None:
+            return repeat(None, max(len(sequence) - start, 0))
+        return map(self._class_id, self._sequence_classifier(sequence, self._values, start))
+
+    def _class_id(self, key: Hashable) -> int:
+        item_class = self._classes.get(key)
+        if item_class is None:
+            item_class = len(self._classes)
+            self._classes[key] = item_class
+        return item_class
+
+    def rejects(self, state: State, item_class: int | None) -> bool:
+        table = self.tables.get(state)
+        return table is not None and item_class in table and table[item_class] is None
+
+    def _compile(self):
+        classifiers = set()
+        values: set = set()
+        states = [self.start]
+        visited = {self.start}
+        for state in states:
+            predicates = [predicate for predicate, _ in state.transition]
+            self.tables[state] = None
+            if all(p.values() is not None for p in predicates):
+                for predicate in predicates:
+                    classifiers.add((type(predicate).class_key, type(predicate).class_keys))
+                    values.update(predicate.values())
+                stateful_predicates = [id(p) for p in predicates if p.stateful]
+                if stateful_predicates:
+                    self.stateful_tables[state] = {}
+                    self.stateful_predicates[state] = stateful_predicates
+                else:
+                    self.tables[state] = {}
+            for _, target in state.transition:
+                if target not in visited:
+                    visited.add(target)
+                    states.append(target)
+        if len(classifiers) == 1:
+            self._classifier, self._sequence_classifier = classifiers.pop()
+            self._values = frozenset(values)
+        self._compiled = True
+
     def __str__(self):
         return f"DFA(start={self.start}, accepting={self.accepting})"
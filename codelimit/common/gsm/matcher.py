@@ -1,44 +1,48 @@
 from dataclasses import dataclass
-from typing import TypeVar
+from typing import Sequence, TypeVar
 
 from codelimit.common.gsm.Expression import (
     expression_to_nfa,
+    expression_to_dfa,
     epsilon_closure,
     nfa_to_dfa,
     Expression,
 )
 from codelimit.common.gsm.Pattern import Pattern
+from codelimit.common.gsm.automata.DFA import DFA
 from codelimit.common.gsm.operator.Operator import Operator
 from codelimit.common.gsm.utils import render_automata
 
 T = TypeVar("T")
 
 
-def match(expression: Expression, sequence: list) -> Pattern | None:
-    nfa = expression_to_nfa(expression)
-    dfa = nfa_to_dfa(nfa)
+def compile_expression(expression: Expression | DFA) -> DFA:
+    return expression if isinstance(expression, DFA) else expression_to_dfa(expression)
+
+
+def match(expression: Expression | DFA, sequence: Sequence) -> Pattern | None:
+    dfa = compile_expression(expression)
     pattern = Pattern(0, dfa)
-    for item in sequence:
-        next_state = pattern.consume(item)
+    for idx, item_class in enumerate(dfa.classify_from(sequence)):
+        next_state = pattern.consume_at(sequence, idx, item_class)
         if not next_state:
             return None
     if pattern.is_accepting():
-        pattern.end = len(pattern.tokens)
+        pattern.tokens = sequence[:pattern.end]
         return pattern
     else:
         return None
 
 
-def starts_with(expression: Expression, sequence: list) -> Pattern | None:
-    nfa = expression_to_nfa(expression)
-    dfa = nfa_to_dfa(nfa)
-    pattern = Pattern(0, dfa)
-    for item in sequence:
-        next_state = pattern.consume(item)
+def starts_with(expression: Expression | DFA, sequence: Sequence, start: int = 0) -> Pattern | None:
+    dfa = compile_expression(expression)
+    pattern = Pattern(start, dfa)
+    for idx, item_class in enumerate(dfa.classify_from(sequence, start), start):
+        next_state = pattern.consume_at(sequence, idx, item_class)
         if not next_state:
             return None
         if pattern.is_accepting():
-            pattern.end = len(pattern.tokens)
+            pattern.tokens = sequence[start:pattern.end]
             return pattern
     return None
 
@@ -50,11 +54,12 @@ class FindState:
     next_state_patterns: list[Pattern]
 
 
-def find_all(expression: Expression, sequence: list) -> list[Pattern]:
-    dfa = nfa_to_dfa(expression_to_nfa(expression))
+def find_all(expression: Expression | DFA, sequence: Sequence) -> list[Pattern]:
+    dfa = compile_expression(expression)
     fs = FindState([], [], [])
-    for idx, item in enumerate(sequence):
-        fs.active_patterns.append(Pattern(idx, dfa))
+    candidate = Pattern(0, dfa)
+    start_accepting = dfa.is_accepting(dfa.start)
+    for idx, item_class in enumerate(dfa.classify_from(sequence)):
         fs.next_state_patterns = []
         for pattern in fs.active_patterns:
             if fs.matches and pattern.start < fs.matches[-1].end:
@@ -63,21 +68,41 @@ def find_all(expression: Expression, sequence: list) -> list[Pattern]:
                 pattern.end = idx
                 fs.matches.append(pattern)
                 continue
-            if pattern.consume(item):
+            if pattern.consume_at(sequence, idx, item_class):
                 fs.next_state_patterns.append(pattern)
             else:
                 if pattern.is_accepting():
                     pattern.end = idx
                     fs.matches.append(pattern)
         fs.active_patterns = fs.next_state_patterns
+        if not start_accepting and dfa.rejects(dfa.start, item_class):
+            continue
+        candidate.reset(idx)
+        if _start_candidate(fs, candidate, sequence, idx, item_class):
+            candidate = Pattern(idx + 1, dfa)
     for pattern in fs.active_patterns:
         if pattern.is_accepting():
             pattern.end = len(sequence)
             fs.matches.append(pattern)
+    for pattern in fs.matches:
+        pattern.tokens = sequence[pattern.start:pattern.end]
     return fs.matches
 
 
-def nfa_match(expression: Expression, sequence: list):
+def _start_candidate(fs: FindState, candidate: Pattern, sequence: Sequence, idx: int, item_class: int | None) -> bool:
+    if len(candidate.state.transition) == 0 and candidate.is_accepting():
+        fs.matches.append(candidate)
+        return True
+    if candidate.consume_at(sequence, idx, item_class):
+        fs.active_patterns.append(candidate)
+        return True
+    if candidate.is_accepting():
+        fs.matches.append(candidate)
+        return True
+    return False
+
+
+def nfa_match(expression: Expression, sequence: Sequence):
     nfa = expression_to_nfa(expression)
     active_states = epsilon_closure(nfa.start)
     next_states = set()
@@ -14,6 +14,9 @@ class Identity(Predicate[Any]):
     def __str__(self):
         return f"{self.item}"
 
+    def values(self) -> frozenset:
+        return frozenset([self.item])
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Identity):
             return False
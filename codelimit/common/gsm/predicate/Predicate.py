@@ -1,15 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Any, Generic, Hashable, Iterator, Sequence, TypeVar
 
 T = TypeVar("T")
 
 
 class Predicate(ABC, Generic[T]):
+    stateful = False
 
     @abstractmethod
     def accept(self, item: T) -> bool:
         pass
 
+    def step(self, item: T, state: int) -> int | None:
+        return state if self.accept(item) else None
+
+    def values(self) -> frozenset | None:
+        return None
+
+    @staticmethod
+    def class_key(item: Any, values: frozenset) -> Hashable:
+        return item if item in values else None
+
+    @staticmethod
+    def class_keys(sequence: Sequence, values: frozenset, start: int = 0) -> Iterator[Hashable]:
+        return (Predicate.class_key(sequence[i], values) for i in range(start, len(sequence)))
+
     @abstractmethod
     def __eq__(self, other: object) -> bool:
         pass
@@ -0,0 +1,166 @@
+import json
+import sys
+from array import array
+from collections.abc import Sequence
+from functools import partial
+from itertools import accumulate
+from typing import Optional, overload
+
+from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
+from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.LanguageTotals import LanguageTotals
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.SourceFolder import SourceFolder
+from codelimit.common.report.BinaryReportWriter import MAGIC, FORMAT_VERSION, HEADER, LENGTH, FILE_COLUMNS, \
+    MEASUREMENT_COLUMNS, NO_STAT
+from codelimit.common.report.LazySourceFileEntry import LazySourceFileEntry
+from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportUnit import ReportUnit
+
+
+class BinaryReportReader:
+    @staticmethod
+    def is_binary_report(data: bytes) -> bool:
+        return data.startswith(MAGIC)
+
+    @staticmethod
+    def get_report_version(data: bytes) -> Optional[str]:
+        meta, _ = _read_meta(data)
+        return meta.get("version")
+
+    @staticmethod
+    def from_bytes(data: bytes) -> Report:
+        meta, pos = _read_meta(data)
+        lengths, pos = _read_block(data, pos)
+        text, pos = _read_block(data, pos)
+        file_data, pos = _read_block(data, pos)
+        measurement_data, pos = _read_block(data, pos)
+        findings_data, pos = _read_block(data, pos)
+        strings = _unpack_strings(bytes(text).decode(), _unpack("i", lengths))
+        file_table = _unpack("q", file_data)
+        measurement_table = _unpack("i", measurement_data)
+        files: list[SourceFileEntry] = [
+            _file_entry(strings, file_table, measurement_table, i)
+            for i in range(0, len(file_table), FILE_COLUMNS)
+        ]
+        codebase = Codebase(meta["root"])
+        repository = GithubRepository(**meta["repository"]) if meta["repository"] else None
+        report = Report(codebase, repository)
+        report.version = meta["version"]
+        report.uuid = meta["uuid"]
+        report.timestamp = meta["timestamp"]
+        report.findings_index = BinaryFindings(strings, file_table, measurement_table, _unpack("i", findings_data))
+        tree = {"./": SourceFolder()}
+        for name, (profile, entries, *digest) in meta["tree"].items():
+            folder = SourceFolder()
+            for entry in entries:
+                if isinstance(entry, int):
+                    folder.add_file(files[entry])
+                else:
+                    folder.add_folder(entry[:-1])
+            folder.profile = profile
+            folder.digest = digest[0] if digest else None
+            tree[name] = folder
+        codebase.load(
+            {entry.path: entry for entry in files},
+            {k: _language_totals(k, v) for k, v in meta["totals"].items()},
+            tree,
+        )
+        return report
+
+
+class BinaryFindings(Sequence[ReportUnit]):
+    def __init__(self, strings: list[str], file_table: array, measurement_table: array, rows: array):
+        self.strings = strings
+        self.file_table = file_table
+        self.measurement_table = measurement_table
+        self.rows = rows
+
+    @overload
+    def __getitem__(self, index: int) -> ReportUnit:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ReportUnit]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> ReportUnit | list[ReportUnit]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        file_id, row = self.rows[index * 2:index * 2 + 2]
+        path = self.strings[self.file_table[file_id * FILE_COLUMNS]]
+        return ReportUnit(path, _measurement(self.strings, self.measurement_table, row * MEASUREMENT_COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.rows) // 2
+
+
+def _read_block(data: bytes, pos: int) -> tuple[memoryview, int]:
+    if pos + LENGTH.size > len(data):
+        raise ValueError("Truncated binary report")
+    (length,) = LENGTH.unpack_from(data, pos)
+    start = pos + LENGTH.size
+    if start + length > len(data):
+        raise ValueError("Truncated binary report")
+    return memoryview(data)[start:start + length], start + length
+
+
+def _read_meta(data: bytes) -> tuple[dict, int]:
+    if len(data) < HEADER.size:
+        raise ValueError("Not a binary report")
+    magic, format_version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a binary report")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary report format: {format_version}")
+    meta, pos = _read_block(data, HEADER.size)
+    return json.loads(bytes(meta)), pos
+
+
+def _unpack(typecode: str, data: memoryview) -> array:
+    result = array(typecode)
+    result.frombytes(data)
+    if sys.byteorder == "big":
+        result.byteswap()
+    return result
+
+
+def _unpack_strings(text: str, lengths: array) -> list[str]:
+    ends = list(accumulate(lengths))
+    return [text[start:end] for start, end in zip([0] + ends, ends)]
+
+
+def _file_entry(strings: list[str], file_table: array, measurement_table: array, i: int) -> SourceFileEntry:
+    path, checksum, language, loc, p0, p1, p2, p3, size, mtime_ns, inode, offset, count = file_table[
+        i:i + FILE_COLUMNS
+    ]
+    stat = FileStat(size, mtime_ns, inode) if size != NO_STAT else None
+    load_measurements = partial(_measurements, strings, measurement_table, offset, count)
+    return LazySourceFileEntry(
+        strings[path], strings[checksum], strings[language], loc, [p0, p1, p2, p3], load_measurements, stat
+    )
+
+
+def _measurements(strings: list[str], measurement_table: array, offset: int, count: int) -> list[Measurement]:
+    return [
+        _measurement(strings, measurement_table, i)
+        for i in range(offset * MEASUREMENT_COLUMNS, (offset + count) * MEASUREMENT_COLUMNS, MEASUREMENT_COLUMNS)
+    ]
+
+
+def _measurement(strings: list[str], measurement_table: array, i: int) -> Measurement:
+    unit_name, start_line, start_column, end_line, end_column, value = measurement_table[i:i + MEASUREMENT_COLUMNS]
+    return Measurement(strings[unit_name], Location(start_line, start_column), Location(end_line, end_column), value)
+
+
+def _language_totals(language: str, values: list[int]) -> LanguageTotals:
+    result = LanguageTotals(language)
+    result.files, result.loc, result.functions, result.hard_to_maintain, result.unmaintainable = values
+    return result
@@ -0,0 +1,120 @@
+import json
+import struct
+import sys
+from array import array
+from io import BytesIO
+from typing import BinaryIO
+
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.Report import Report, FINDINGS_THRESHOLD
+
+MAGIC = b"CLRB"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sI")
+LENGTH = struct.Struct("<I")
+FILE_COLUMNS = 13
+MEASUREMENT_COLUMNS = 6
+NO_STAT = -1
+
+
+class BinaryReportWriter:
+    def __init__(self, report: Report):
+        self.report = report
+        self.strings: dict[str, int] = {}
+        self.file_table = array("q")
+        self.measurement_table = array("i")
+        self.findings: list[tuple[int, int, int]] = []
+
+    def to_bytes(self) -> bytes:
+        output = BytesIO()
+        self.write(output)
+        return output.getvalue()
+
+    def write(self, output: BinaryIO):
+        self.strings = {}
+        self.file_table = array("q")
+        self.measurement_table = array("i")
+        self.findings = []
+        file_ids: dict[str, int] = {}
+        for path, entry in self.report.codebase.files.items():
+            self._add_file(len(file_ids), entry)
+            file_ids[path] = len(file_ids)
+        meta = json.dumps(self._meta(file_ids), separators=(",", ":")).encode()
+        output.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+        _write_block(output, meta)
+        _write_block(output, _pack(array("i", [len(s) for s in self.strings])))
+        _write_block(output, "".join(self.strings).encode())
+        _write_block(output, _pack(self.file_table))
+        _write_block(output, _pack(self.measurement_table))
+        _write_block(output, _pack(self._findings_index()))
+
+    def _intern(self, text: str) -> int:
+        result = self.strings.get(text)
+        if result is None:
+            result = len(self.strings)
+            self.strings[text] = result
+        return result
+
+    def _add_file(self, file_id: int, entry: SourceFileEntry):
+        measurements = entry.measurements()
+        stat = entry.stat()
+        self.file_table.extend(
+            [
+                self._intern(entry.path),
+                self._intern(entry.checksum()),
+                self._intern(entry.language),
+                entry.loc,
+                *entry.profile(),
+                stat.size if stat else NO_STAT,
+                stat.mtime_ns if stat else NO_STAT,
+                stat.inode if stat else NO_STAT,
+                len(self.measurement_table) // MEASUREMENT_COLUMNS,
+                len(measurements),
+            ]
+        )
+        for m in measurements:
+            if m.value > FINDINGS_THRESHOLD:
+                self.findings.append((-m.value, len(self.measurement_table) // MEASUREMENT_COLUMNS, file_id))
+            self.measurement_table.extend(
+                [self._intern(m.unit_name), m.start.line, m.start.column, m.end.line, m.end.column, m.value]
+            )
+
+    def _findings_index(self) -> array:
+        result = array("i")
+        for _, row, file_id in sorted(self.findings):
+            result.extend([file_id, row])
+        return result
+
+    def _meta(self, file_ids: dict[str, int]) -> dict:
+        codebase = self.report.codebase
+        return {
+            "version": self.report.version,
+            "uuid": self.report.uuid,
+            "timestamp": self.report.timestamp,
+            "root": codebase.root,
+            "repository": self.report.repository.__dict__ if self.report.repository else None,
+            "totals": {
+                k: [v.files, v.loc, v.functions, v.hard_to_maintain, v.unmaintainable]
+                for k, v in codebase.totals.items()
+            },
+            "tree": {
+                k: [
+                    v.profile,
+                    [file_ids[e.path] if e.is_file() else e.name for e in v.entries],
+                    *([v.digest] if v.digest else []),
+                ]
+                for k, v in codebase.tree.items()
+            },
+        }
+
+
+def _pack(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _write_block(output: BinaryIO, data: bytes):
+    output.write(LENGTH.pack(len(data)))
+    output.write(data)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CacheBackend(str, Enum):
+    json = "json"
+    sqlite = "sqlite"
+    binary = "binary"
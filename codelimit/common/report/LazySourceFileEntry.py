@@ -0,0 +1,27 @@
+from typing import Callable
+
+from codelimit.common.FileStat import FileStat
+from codelimit.common.Measurement import Measurement
+from codelimit.common.SourceFileEntry import SourceFileEntry
+
+
+class LazySourceFileEntry(SourceFileEntry):
+    def __init__(
+        self,
+        path: str,
+        checksum: str,
+        language: str,
+        loc: int,
+        profile: list[int],
+        load_measurements: Callable[[], list[Measurement]],
+        stat: FileStat | None = None,
+    ):
+        super().__init__(path, checksum, language, loc, [], stat)
+        self._profile = profile
+        self._load_measurements: Callable[[], list[Measurement]] | None = load_measurements
+
+    def measurements(self):
+        if self._load_measurements is not None:
+            self._measurements = self._load_measurements()
+            self._load_measurements = None
+        return self._measurements
@@ -1,13 +1,17 @@
+import heapq
 from datetime import datetime, timezone
 from math import floor, ceil
+from typing import Iterator, Sequence
 from uuid import uuid4
 
 from codelimit.common.Codebase import Codebase
 from codelimit.common.GithubRepository import GithubRepository
 from codelimit.common.report.ReportUnit import ReportUnit
-from codelimit.common.utils import make_profile
 from codelimit.version import version
 
+_PROFILE_LIMITS = [15, 30, 60, None]
+FINDINGS_THRESHOLD = 30
+
 
 class Report:
     VERSION = version
@@ -18,33 +22,49 @@ class Report:
         self.timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
         self.repository = repository
         self.codebase = codebase
+        self.findings_index: Sequence[ReportUnit] | None = None
 
     def get_average(self):
-        if len(self.codebase.all_measurements()) == 0:
+        count = self.codebase.stats.count()
+        if count == 0:
             return 0
-        return ceil(self.codebase.total_loc() / len(self.codebase.all_measurements()))
+        return ceil(self.codebase.total_loc() / count)
 
     def ninetieth_percentile(self):
-        sorted_measurements = self.codebase.all_measurements_sorted_by_length_asc()
+        histogram = self.codebase.stats.histogram()
         lines_of_code_90_percent = floor(self.codebase.total_loc() * 0.9)
         smallest_units_loc = 0
-        for index, m in enumerate(sorted_measurements):
-            smallest_units_loc += m.value
+        for value in sorted(histogram, reverse=True):
+            smallest_units_loc += value * histogram[value]
             if smallest_units_loc > lines_of_code_90_percent:
-                return sorted_measurements[index].value
+                return value
         return 0
 
     def all_report_units_sorted_by_length_asc(self, threshold=0) -> list[ReportUnit]:
-        result = []
+        return sorted(self._report_units(threshold), key=_unit_length, reverse=True)
+
+    def top_report_units(self, limit: int | None = None) -> list[ReportUnit]:
+        if self.findings_index is not None:
+            return list(self.findings_index[:limit])
+        if limit is None:
+            return self.all_report_units_sorted_by_length_asc(FINDINGS_THRESHOLD)
+        return heapq.nlargest(limit, self._report_units(FINDINGS_THRESHOLD), key=_unit_length)
+
+    def count_report_units(self) -> int:
+        if self.findings_index is not None:
+            return len(self.findings_index)
+        return sum(t.hard_to_maintain + t.unmaintainable for t in self.codebase.totals.values())
+
+    def _report_units(self, threshold: int) -> Iterator[ReportUnit]:
         for file, entry in self.codebase.files.items():
+            if not _may_exceed(entry.profile(), threshold):
+                continue
             for m in entry.measurements():
                 if m.value > threshold:
-                    result.append(ReportUnit(file, m))
-        result = sorted(result, key=lambda unit: unit.measurement.value, reverse=True)
-        return result
+                    yield ReportUnit(file, m)
 
     def quality_profile(self) -> list[int]:
-        return make_profile(self.codebase.all_measurements())
+        return list(self.codebase.stats.profile())
 
     def quality_profile_percentage(self):
         profile = self.quality_profile()
@@ -54,3 +74,13 @@ class Report:
         verbose = ceil((profile[1] / total) * 100 - 0.001) if total > 0 else 0
         easy = 100 - unmaintainable - hard_to_maintain - verbose
         return easy, verbose, hard_to_maintain, unmaintainable
+
+
+def _unit_length(unit: ReportUnit) -> int:
+    return unit.measurement.value
+
+
+def _may_exceed(profile: list[int], threshold: int) -> bool:
+    if threshold < 0:
+        return True
+    return any(profile[i] > 0 for i, limit in enumerate(_PROFILE_LIMITS) if limit is None or limit > threshold)
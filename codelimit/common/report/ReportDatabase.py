@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator
+
+from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
+from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.Report import Report
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    language TEXT NOT NULL,
+    loc INTEGER NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    unit_name TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    start_column INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    end_column INTEGER NOT NULL,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_path ON measurements(path);
+"""
+
+
+class ReportDatabase:
+    def __init__(self, path: Path, read_only: bool = False):
+        if read_only:
+            self.connection = sqlite3.connect(f"{path.absolute().as_uri()}?mode=ro", uri=True)
+            return
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        if self._get_meta("version") != Report.VERSION:
+            with self.connection:
+                self.connection.execute("DELETE FROM files")
+                self.connection.execute("DELETE FROM meta")
+                self._set_meta("version", Report.VERSION)
+
+    def close(self):
+        self.connection.close()
+
+    def get(self, path: str) -> SourceFileEntry | None:
+        row = self.connection.execute(
+            "SELECT path, checksum, language, loc, size, mtime_ns, inode FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        measurements = [
+            _measurement_from_row(m)
+            for m in self.connection.execute(
+                "SELECT unit_name, start_line, start_column, end_line, end_column, value "
+                "FROM measurements WHERE path = ? ORDER BY rowid",
+                (path,),
+            )
+        ]
+        return _entry_from_row(row, measurements)
+
+    def files(self) -> DatabaseFiles:
+        return DatabaseFiles(self)
+
+    def paths(self) -> list[str]:
+        return [row[0] for row in self.connection.execute("SELECT path FROM files")]
+
+    def update(self, report: Report) -> int:
+        files = report.codebase.files
+        existing = {
+            row[0]: tuple(row[1:])
+            for row in self.connection.execute("SELECT path, checksum, language, loc, size, mtime_ns, inode FROM files")
+        }
+        changed = [entry for path, entry in files.items() if existing.get(path) != _entry_key(entry)]
+        removed = [path for path in existing if path not in files]
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM files WHERE path = ?", [(path,) for path in removed + [e.path for e in changed]]
+            )
+            self.connection.executemany(
+                "INSERT INTO files (path, checksum, language, loc, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(entry.path, *_entry_key(entry)) for entry in changed],
+            )
+            self.connection.executemany(
+                "INSERT INTO measurements (path, unit_name, start_line, start_column, end_line, end_column, value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(entry.path, *_measurement_to_row(m)) for entry in changed for m in entry.measurements()],
+            )
+            self._set_meta("root", report.codebase.root)
+            self._set_meta("uuid", report.uuid)
+            self._set_meta("timestamp", report.timestamp)
+            repository = report.repository.__dict__ if report.repository else None
+            self._set_meta("repository", json.dumps(repository))
+        return len(changed) + len(removed)
+
+    def to_report(self) -> Report | None:
+        root = self._get_meta("root")
+        if root is None or self._get_meta("version") != Report.VERSION:
+            return None
+        codebase = Codebase(root)
+        repository_data = json.loads(self._get_meta("repository") or "null")
+        report = Report(codebase, GithubRepository(**repository_data) if repository_data else None)
+        report.uuid = self._get_meta("uuid") or report.uuid
+        report.timestamp = self._get_meta("timestamp") or report.timestamp
+        measurements: dict[str, list[Measurement]] = {}
+        for row in self.connection.execute(
+                "SELECT path, unit_name, start_line, start_column, end_line, end_column, value "
+                "FROM measurements ORDER BY rowid"
+        ):
+            measurements.setdefault(row[0], []).append(_measurement_from_row(row[1:]))
+        for row in self.connection.execute(
+                "SELECT path, checksum, language, loc, size, mtime_ns, inode FROM files ORDER BY path"
+        ):
+            codebase.add_file(_entry_from_row(row, measurements.get(row[0], [])))
+        return report
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+class DatabaseFiles(Mapping[str, SourceFileEntry]):
+    def __init__(self, database: ReportDatabase):
+        self.database = database
+
+    def __getitem__(self, path: str) -> SourceFileEntry:
+        entry = self.database.get(path)
+        if entry is None:
+            raise KeyError(path)
+        return entry
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.database.paths())
+
+    def __len__(self) -> int:
+        return self.database.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+def _entry_key(entry: SourceFileEntry) -> tuple:
+    stat = entry.stat()
+    if stat:
+        return entry.checksum(), entry.language, entry.loc, stat.size, stat.mtime_ns, stat.inode
+    return entry.checksum(), entry.language, entry.loc, None, None, None
+
+
+def _entry_from_row(row: tuple, measurements: list[Measurement]) -> SourceFileEntry:
+    path, checksum, language, loc, size, mtime_ns, inode = row
+    stat = FileStat(size, mtime_ns, inode) if size is not None else None
+    return SourceFileEntry(path, checksum, language, loc, measurements, stat)
+
+
+def _measurement_to_row(measurement: Measurement) -> tuple:
+    return (
+        measurement.unit_name,
+        measurement.start.line,
+        measurement.start.column,
+        measurement.end.line,
+        measurement.end.column,
+        measurement.value,
+    )
+
+
+def _measurement_from_row(row: tuple) -> Measurement:
+    unit_name, start_line, start_column, end_line, end_column, value = row
+    return Measurement(unit_name, Location(start_line, start_column), Location(end_line, end_column), value)
@@ -1,42 +1,185 @@
-from json import loads
-from typing import Optional
+import re
+from functools import partial
+from json import JSONDecodeError, JSONDecoder, loads
+from typing import Any, Callable, Optional
 
 from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
 from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.LanguageTotals import LanguageTotals
 from codelimit.common.Location import Location
 from codelimit.common.Measurement import Measurement
 from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.SourceFolder import SourceFolder
+from codelimit.common.report.LazySourceFileEntry import LazySourceFileEntry
 from codelimit.common.report.Report import Report
+from codelimit.common.utils import make_profile
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_FLAT_ARRAY = re.compile(r'\[[^\[\]"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^\[\]"]*)*\]')
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"')
+_decoder = JSONDecoder()
 
 
 class ReportReader:
     @staticmethod
     def get_report_version(json: str) -> Optional[str]:
+        pos = _expect(json, 0, "{")
+        if json.startswith('"', pos):
+            key, pos = _decoder.raw_decode(json, pos)
+            if key == "version":
+                return _decoder.raw_decode(json, _expect(json, pos, ":"))[0]
         d = loads(json)
         return d["version"] if "version" in d else None
 
     @staticmethod
     def from_json(json: str) -> Report:
-        d = loads(json)
-        codebase = Codebase(d["root"])
-        if 'repository' in d:
-            repository = GithubRepository(**d["repository"])
+        document: dict[str, Any] = {}
+        sections: dict[str, Any] = {}
+        files: dict[str, SourceFileEntry] = {}
+
+        def read_document_member(key: str, pos: int) -> int:
+            if key == "codebase":
+                return _read_object(json, pos, read_codebase_member)
+            document[key], end = _decoder.raw_decode(json, pos)
+            return end
+
+        def read_codebase_member(key: str, pos: int) -> int:
+            if key == "files":
+                return _read_object(json, pos, read_file)
+            sections[key], end = _decoder.raw_decode(json, pos)
+            return end
+
+        def read_file(path: str, pos: int) -> int:
+            fields: dict[str, Any] = {}
+            end = _read_object(json, pos, partial(_read_file_member, json, fields))
+            files[path] = _file_entry_from_json(json, path, fields)
+            return end
+
+        _read_object(json, 0, read_document_member)
+        codebase = Codebase(document["root"])
+        if 'repository' in document:
+            repository = GithubRepository(**document["repository"])
             report = Report(codebase, repository)
         else:
             report = Report(codebase)
-        report.uuid = d["uuid"]
-        for k, v in d["codebase"]["files"].items():
-            measurements: list[Measurement] = []
-            for m in v["measurements"]:
-                start_location = Location(m["start"]["line"], m["start"]["column"])
-                end_location = Location(m["end"]["line"], m["end"]["column"])
-                measurements.append(
-                    Measurement(
-                        m["unit_name"], start_location, end_location, m["value"]
-                    )
-                )
-            codebase.add_file(
-                SourceFileEntry(k, v["checksum"], v["language"], v["loc"], measurements)
+        report.uuid = document["uuid"]
+        if "timestamp" in document:
+            report.timestamp = document["timestamp"]
+        if "totals" in sections and "tree" in sections:
+            codebase.load(
+                files,
+                {k: _language_totals_from_json(k, v) for k, v in sections["totals"].items()},
+                _tree_from_json(sections["tree"], files),
             )
-        codebase.aggregate()
+        else:
+            for entry in files.values():
+                codebase.add_file(entry)
         return report
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    match = _WHITESPACE.match(text, pos)
+    assert match is not None
+    return match.end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    pos = _skip_whitespace(text, pos)
+    if not text.startswith(char, pos):
+        raise JSONDecodeError(f"Expecting '{char}'", text, pos)
+    return _skip_whitespace(text, pos + 1)
+
+
+def _read_object(text: str, pos: int, read_member: Callable[[str, int], int]) -> int:
+    pos = _expect(text, pos, "{")
+    if text.startswith("}", pos):
+        return pos + 1
+    while True:
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _skip_whitespace(text, read_member(key, _expect(text, pos, ":")))
+        if text.startswith("}", pos):
+            return pos + 1
+        pos = _expect(text, pos, ",")
+
+
+def _skip_value(text: str, pos: int) -> int:
+    match = _FLAT_ARRAY.match(text, pos)
+    if match:
+        return match.end()
+    if not text.startswith(("[", "{"), pos):
+        return _decoder.raw_decode(text, pos)[1]
+    depth = 0
+    while True:
+        match = _STRUCTURE.search(text, pos)
+        if match is None:
+            raise JSONDecodeError("Unterminated value", text, pos)
+        char = match.group()
+        pos = match.end()
+        if char == '"':
+            match = _STRING_TAIL.match(text, pos)
+            if match is None:
+                raise JSONDecodeError("Unterminated string", text, pos)
+            pos = match.end()
+        elif char in "[{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _read_file_member(text: str, fields: dict[str, Any], key: str, pos: int) -> int:
+    if key == "measurements":
+        fields[key] = pos
+        return _skip_value(text, pos)
+    fields[key], end = _decoder.raw_decode(text, pos)
+    return end
+
+
+def _file_entry_from_json(text: str, path: str, fields: dict[str, Any]) -> SourceFileEntry:
+    load_measurements = partial(_measurements_from_json, text, fields["measurements"])
+    profile = fields["profile"] if "profile" in fields else make_profile(load_measurements())
+    stat = FileStat(**fields["stat"]) if "stat" in fields else None
+    return LazySourceFileEntry(
+        path, fields["checksum"], fields["language"], fields["loc"], profile, load_measurements, stat
+    )
+
+
+def _measurements_from_json(text: str, pos: int) -> list[Measurement]:
+    measurements: list[Measurement] = []
+    for m in _decoder.raw_decode(text, pos)[0]:
+        start_location = Location(m["start"]["line"], m["start"]["column"])
+        end_location = Location(m["end"]["line"], m["end"]["column"])
+        measurements.append(
+            Measurement(
+                m["unit_name"], start_location, end_location, m["value"]
+            )
+        )
+    return measurements
+
+
+def _language_totals_from_json(language: str, d: dict) -> LanguageTotals:
+    result = LanguageTotals(language)
+    result.files = d["files"]
+    result.loc = d["lines_of_code"]
+    result.functions = d["functions"]
+    result.hard_to_maintain = d["hard_to_maintain"]
+    result.unmaintainable = d["unmaintainable"]
+    return result
+
+
+def _tree_from_json(tree: dict, files: dict[str, SourceFileEntry]) -> dict[str, SourceFolder]:
+    result = {"./": SourceFolder()}
+    for name, d in tree.items():
+        folder = SourceFolder()
+        for entry_name in d["entries"]:
+            if entry_name.endswith("/"):
+                folder.add_folder(entry_name[:-1])
+            else:
+                folder.add_file(files[entry_name if name == "./" else f"{name}{entry_name}"])
+        folder.profile = d["profile"]
+        folder.digest = d.get("digest")
+        result[name] = folder
+    return result
@@ -1,3 +1,7 @@
+from functools import partial
+from io import StringIO
+from typing import Callable, Iterable, TextIO
+
 from codelimit.common.CodebseEntry import CodebaseEntry
 from codelimit.common.LanguageTotals import LanguageTotals
 from codelimit.common.Measurement import Measurement
@@ -14,180 +18,187 @@ class ReportWriter:
         self.files = report.codebase.files
         self.pretty_print = pretty_print
         self.level = 0
+        self.output: TextIO = StringIO()
 
     def to_json(self) -> str:
+        output = StringIO()
+        self.write(output)
+        return output.getvalue()
+
+    def write(self, output: TextIO):
+        self.output = output
         self.level = 0
-        json = ""
-        json += self._open("{")
-        content: list[str] = [
-            self._line(f'"version": "{self.report.version}"'),
-            self._line(f'"uuid": "{self.report.uuid}"'),
-            self._line(f'"timestamp": "{self.report.timestamp}"'),
-            self._line(f'"root": "{self.report.codebase.root}"')
+        self._open("{")
+        content: list[Callable[[], None]] = [
+            partial(self._line, f'"version": "{self.report.version}"'),
+            partial(self._line, f'"uuid": "{self.report.uuid}"'),
+            partial(self._line, f'"timestamp": "{self.report.timestamp}"'),
+            partial(self._line, f'"root": "{self.report.codebase.root}"'),
         ]
         if self.report.repository:
-            content.append(self._repository_to_json())
-        content.append(self._codebase_to_json())
-        json += self._collection(content)
-        json += self._close("}")
-        return json
-
-    def _open(self, text: str) -> str:
-        json = self._line(text)
+            content.append(self._repository_to_json)
+        content.append(self._codebase_to_json)
+        self._collection(content)
+        self._close("}")
+        if self.pretty_print:
+            self.output.write("\n")
+
+    def _open(self, text: str):
+        self._line(text)
+        if self.pretty_print:
+            self.output.write("\n")
         self.level += 2
-        return json
 
-    def _close(self, text: str) -> str:
+    def _close(self, text: str):
         self.level -= 2
-        return self._line(text)
+        self._line(text)
 
-    def _line(self, text: str) -> str:
+    def _line(self, text: str):
         if self.pretty_print:
-            return (self.level * " ") + f"{text}\n"
-        else:
-            return text
+            self.output.write(self.level * " ")
+        self.output.write(text)
 
-    def _collection(self, items: list):
+    def _collection(self, items: Iterable[Callable[[], None]]):
         separator = ",\n" if self.pretty_print else ", "
-        json = separator.join([i.rstrip() for i in items])
-        return json + "\n" if self.pretty_print and len(items) > 0 else json
+        empty = True
+        for write_item in items:
+            if not empty:
+                self.output.write(separator)
+            write_item()
+            empty = False
+        if self.pretty_print and not empty:
+            self.output.write("\n")
 
     def _repository_to_json(self):
-        json = ""
-        json += self._open('"repository": {')
-        json += self._collection([self._line(f'"owner": "{self.report.repository.owner}"'),
-                                  self._line(f'"name": "{self.report.repository.name}"'),
-                                  self._line(f'"branch": "{self.report.repository.branch}"')])
-        json += self._close("}")
-        return json
-
-    def _codebase_to_json(self) -> str:
-        json = ""
-        json += self._open('"codebase": {')
-        json += self._collection(
-            [self._totals_to_json(), self._tree_to_json(), self._measurements_to_json()]
-        )
-        json += self._close("}")
-        return json
+        repository = self.report.repository
+        assert repository is not None
+        self._open('"repository": {')
+        self._collection([partial(self._line, f'"owner": "{repository.owner}"'),
+                          partial(self._line, f'"name": "{repository.name}"'),
+                          partial(self._line, f'"branch": "{repository.branch}"')])
+        self._close("}")
+
+    def _codebase_to_json(self):
+        self._open('"codebase": {')
+        self._collection([self._totals_to_json, self._tree_to_json, self._measurements_to_json])
+        self._close("}")
 
     def _totals_to_json(self):
-        json = ""
-        json += self._open('"totals": {')
-        json += self._collection(
-            [self._totals_item_to_json(k, v) for k, v in self.totals.items()]
+        self._open('"totals": {')
+        self._collection(
+            partial(self._totals_item_to_json, k, v) for k, v in self.totals.items()
         )
-        json += self._close("}")
-        return json
+        self._close("}")
 
-    def _totals_item_to_json(self, name: str, language_totals: LanguageTotals) -> str:
-        json = ""
-        json += self._open(f'"{name}": {{')
-        json += self._collection(
+    def _totals_item_to_json(self, name: str, language_totals: LanguageTotals):
+        self._open(f'"{name}": {{')
+        self._collection(
             [
-                self._totals_files_to_json(language_totals),
-                self._totals_lines_of_code_to_json(language_totals),
-                self._totals_functions_to_json(language_totals),
-                self._totals_hard_to_maintain_to_json(language_totals),
-                self._totals_unmaintainable_to_json(language_totals),
+                partial(self._totals_files_to_json, language_totals),
+                partial(self._totals_lines_of_code_to_json, language_totals),
+                partial(self._totals_functions_to_json, language_totals),
+                partial(self._totals_hard_to_maintain_to_json, language_totals),
+                partial(self._totals_unmaintainable_to_json, language_totals),
             ]
         )
-        json += self._close("}")
-        return json
+        self._close("}")
 
     def _totals_files_to_json(self, language_totals: LanguageTotals):
-        return self._line(f'"files": {language_totals.files}')
+        self._line(f'"files": {language_totals.files}')
 
     def _totals_lines_of_code_to_json(self, language_totals: LanguageTotals):
-        return self._line(f'"lines_of_code": {language_totals.loc}')
+        self._line(f'"lines_of_code": {language_totals.loc}')
 
     def _totals_functions_to_json(self, language_totals: LanguageTotals):
-        return self._line(f'"functions": {language_totals.functions}')
+        self._line(f'"functions": {language_totals.functions}')
 
     def _totals_hard_to_maintain_to_json(self, language_totals: LanguageTotals):
-        return self._line(f'"hard_to_maintain": {language_totals.hard_to_maintain}')
+        self._line(f'"hard_to_maintain": {language_totals.hard_to_maintain}')
 
     def _totals_unmaintainable_to_json(self, language_totals: LanguageTotals):
-        return self._line(f'"unmaintainable": {language_totals.unmaintainable}')
+        self._line(f'"unmaintainable": {language_totals.unmaintainable}')
 
     def _tree_to_json(self):
-        json = ""
-        json += self._open('"tree": {')
-        json += self._collection(
-            [self._tree_item_to_json(k, v) for k, v in self.tree.items()]
+        self._open('"tree": {')
+        self._collection(
+            partial(self._tree_item_to_json, k, v) for k, v in self.tree.items()
         )
-        json += self._close("}")
-        return json
+        self._close("}")
 
-    def _tree_item_to_json(self, name: str, folder: SourceFolder) -> str:
-        json = ""
-        json += self._open(f'"{name}": {{')
-        json += self._collection(
-            [
-                self._tree_item_entries_to_json(folder),
-                self._tree_item_profile_to_json(name),
-            ]
-        )
-        json += self._close("}")
-        return json
+    def _tree_item_to_json(self, name: str, folder: SourceFolder):
+        self._open(f'"{name}": {{')
+        content = [
+            partial(self._tree_item_entries_to_json, folder),
+            partial(self._tree_item_profile_to_json, name),
+        ]
+        if folder.digest:
+            content.append(partial(self._tree_item_digest_to_json, folder))
+        self._collection(content)
+        self._close("}")
 
     def _tree_item_entries_to_json(self, folder: SourceFolder):
-        json = ""
-        json += self._open('"entries": [')
-        json += self._collection(
-            [self._source_folder_entry_to_json(f) for f in folder.entries]
+        self._open('"entries": [')
+        self._collection(
+            partial(self._source_folder_entry_to_json, f) for f in folder.entries
         )
-        json += self._close("]")
-        return json
+        self._close("]")
 
     def _tree_item_profile_to_json(self, name: str):
-        return self._line(f'"profile": {self.tree[name].profile}')
+        self._line(f'"profile": {self.tree[name].profile}')
+
+    def _tree_item_digest_to_json(self, folder: SourceFolder):
+        self._line(f'"digest": "{folder.digest}"')
 
     def _measurements_to_json(self):
-        json = ""
-        json += self._open('"files": {')
-        json += self._collection(
-            [self._file_to_json(k, v) for k, v in self.files.items()]
+        self._open('"files": {')
+        self._collection(
+            partial(self._file_to_json, k, v) for k, v in self.files.items()
         )
-        json += self._close("}")
-        return json
+        self._close("}")
 
     def _file_to_json(self, name: str, entry: SourceFileEntry):
-        json = ""
-        json += self._open(f'"{name}": {{')
-        json += self._collection(
+        self._open(f'"{name}": {{')
+        content = [partial(self._file_checksum_to_json, entry)]
+        if entry.stat():
+            content.append(partial(self._file_stat_to_json, entry))
+        content.extend(
             [
-                self._file_checksum_to_json(entry),
-                self._file_language_to_json(entry),
-                self._file_loc_to_json(entry),
-                self._file_profile_to_json(entry),
-                self._file_measurements_to_json(entry),
+                partial(self._file_language_to_json, entry),
+                partial(self._file_loc_to_json, entry),
+                partial(self._file_profile_to_json, entry),
+                partial(self._file_measurements_to_json, entry),
             ]
         )
-        json += self._close("}")
-        return json
+        self._collection(content)
+        self._close("}")
 
     def _file_checksum_to_json(self, entry: SourceFileEntry):
-        return self._line(f'"checksum": "{entry.checksum()}"')
+        self._line(f'"checksum": "{entry.checksum()}"')
+
+    def _file_stat_to_json(self, entry: SourceFileEntry):
+        stat = entry.stat()
+        assert stat is not None
+        self._line(
+            f'"stat": {{"size": {stat.size}, "mtime_ns": {stat.mtime_ns}, "inode": {stat.inode}}}'
+        )
 
     def _file_language_to_json(self, entry: SourceFileEntry):
-        return self._line(f'"language": "{entry.language}"')
+        self._line(f'"language": "{entry.language}"')
 
     def _file_loc_to_json(self, entry: SourceFileEntry):
-        return self._line(f'"loc": {entry.loc}')
+        self._line(f'"loc": {entry.loc}')
 
     def _file_profile_to_json(self, entry: SourceFileEntry):
-        return self._line(f'"profile": {entry.profile()}')
+        self._line(f'"profile": {entry.profile()}')
 
     def _file_measurements_to_json(self, entry: SourceFileEntry):
-        json = ""
-        json += self._open('"measurements": [')
-        json += self._collection(
-            [self._measurement_to_json(m) for m in entry.measurements()]
+        self._open('"measurements": [')
+        self._collection(
+            partial(self._measurement_to_json, m) for m in entry.measurements()
         )
-        json += self._close("]")
-        return json
+        self._close("]")
 
-    def _measurement_to_json(self, measurement: Measurement) -> str:
+    def _measurement_to_json(self, measurement: Measurement):
         json = ""
         json += f'{{"unit_name": "{measurement.unit_name}", '
         json += (
@@ -199,7 +210,7 @@ class ReportWriter:
             f'column": {measurement.end.column}}}, '
         )
         json += f'"value": {measurement.value}}}'
-        return self._line(json)
+        self._line(json)
 
-    def _source_folder_entry_to_json(self, entry: CodebaseEntry) -> str:
-        return self._line(f'"{entry.name}"')
+    def _source_folder_entry_to_json(self, entry: CodebaseEntry):
+        self._line(f'"{entry.name}"')
@@ -89,10 +89,8 @@ def print_summary(console: Console, report: Report):
 
 
 def print_findings(report: Report, console: Console, full: bool = False):
-    functions = report.all_report_units_sorted_by_length_asc(30)
-    total_findings = len(functions)
-    if not full and total_findings > 10:
-        functions = functions[:10]
+    total_findings = report.count_report_units()
+    functions = report.top_report_units(None if full else 10)
     if report.repository:
         _print_findings_with_repository(functions, report.repository, console)
     else:
@@ -55,10 +55,8 @@ def print_summary(console: Console, report: Report):
 
 
 def print_findings(console: Console, report: Report, full: bool = False):
-    functions = report.all_report_units_sorted_by_length_asc(30)
-    total_findings = len(functions)
-    if not full and total_findings > 10:
-        functions = functions[:10]
+    total_findings = report.count_report_units()
+    functions = report.top_report_units(None if full else 10)
     for function in functions:
         console.print(format_measurement(function.file, function.measurement))
     if not full and total_findings > 10:
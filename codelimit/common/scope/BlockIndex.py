@@ -0,0 +1,79 @@
+from bisect import bisect_left, bisect_right
+
+from codelimit.common.TokenRange import TokenRange
+
+
+class BlockIndex:
+    def __init__(self, blocks: list[TokenRange]):
+        self.blocks = blocks
+        size = len(blocks)
+        self._by_start = sorted(range(size), key=lambda i: blocks[i].start)
+        self._starts = [blocks[i].start for i in self._by_start]
+        self._by_end = sorted(range(size), key=lambda i: blocks[i].end)
+        self._ends = [blocks[i].end for i in self._by_end]
+        self._start_positions = [0] * size
+        for position, i in enumerate(self._by_start):
+            self._start_positions[i] = position
+        self._end_positions = [0] * size
+        for position, i in enumerate(self._by_end):
+            self._end_positions[i] = position
+        self._next_start = list(range(size + 1))
+        self._previous_start = list(range(size + 1))
+        self._next_end = list(range(size + 1))
+
+    def nearest_block(self, header: TokenRange) -> int | None:
+        position = self._next_alive_start(bisect_right(self._starts, header.start))
+        if position < len(self.blocks):
+            return self._by_start[position]
+        position = self._previous_alive_start(bisect_left(self._starts, header.start) - 1)
+        if position >= 0 and self.blocks[self._by_start[position]].contains(header):
+            return self._by_start[position]
+        return None
+
+    def scope_blocks(self, header: TokenRange) -> list[int]:
+        body_index = self.nearest_block(header)
+        if body_index is None:
+            return []
+        body = self.blocks[body_index]
+        if body.contains(header):
+            return sorted(
+                i for i in self._alive_by_start(body.start + 1, body.end - 1) if body.contains(self.blocks[i])
+            )
+        result = set(self._alive_by_start(body.start, body.end))
+        result.update(self._alive_by_end(body.start, body.end))
+        return sorted(result)
+
+    def remove(self, indices: list[int]):
+        for i in indices:
+            start_position = self._start_positions[i]
+            self._next_start[start_position] = start_position + 1
+            self._previous_start[start_position + 1] = start_position
+            end_position = self._end_positions[i]
+            self._next_end[end_position] = end_position + 1
+
+    def _alive_by_start(self, low: int, high: int):
+        position = self._next_alive_start(bisect_left(self._starts, low))
+        while position < len(self._starts) and self._starts[position] <= high:
+            yield self._by_start[position]
+            position = self._next_alive_start(position + 1)
+
+    def _alive_by_end(self, low: int, high: int):
+        position = _find(self._next_end, bisect_left(self._ends, low))
+        while position < len(self._ends) and self._ends[position] <= high:
+            yield self._by_end[position]
+            position = _find(self._next_end, position + 1)
+
+    def _next_alive_start(self, position: int) -> int:
+        return _find(self._next_start, position)
+
+    def _previous_alive_start(self, position: int) -> int:
+        return _find(self._previous_start, position + 1) - 1
+
+
+def _find(parent: list[int], position: int) -> int:
+    root = position
+    while parent[root] != root:
+        root = parent[root]
+    while parent[position] != root:
+        parent[position], position = root, parent[position]
+    return root
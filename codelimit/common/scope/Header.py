@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Sequence
 
 from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange
@@ -13,7 +14,7 @@ class Header:
         return self.name_token.value
 
 
-def sort_headers(headers: list[Header], tokens: list[Token], reverse=False) -> list[Header]:
+def sort_headers(headers: list[Header], tokens: Sequence[Token], reverse=False) -> list[Header]:
     return sorted(
         headers,
         reverse=reverse,
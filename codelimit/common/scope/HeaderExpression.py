@@ -0,0 +1,10 @@
+from codelimit.common.gsm.Expression import Expression
+from codelimit.common.gsm.matcher import compile_expression
+
+
+class HeaderExpression:
+    def __init__(self, expression: Expression, followed_by: Expression = None):
+        self.expression = expression
+        self.followed_by = followed_by
+        self.automata = compile_expression(expression)
+        self.followed_by_automata = compile_expression(followed_by) if followed_by is not None else None
@@ -1,18 +1,18 @@
-from typing import Optional
+from typing import Sequence
 
 from codelimit.common.Language import Language
 from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange, sort_token_ranges
-from codelimit.common.gsm.Expression import Expression
 from codelimit.common.gsm.matcher import find_all, starts_with
+from codelimit.common.scope.BlockIndex import BlockIndex
 from codelimit.common.scope.Header import Header, sort_headers
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.Scope import Scope
 from codelimit.common.source_utils import filter_tokens, filter_nocl_comment_tokens
-from codelimit.common.token_utils import get_balanced_symbol_token_indices
-from codelimit.common.utils import delete_indices
+from codelimit.common.token_utils import get_balanced_symbol_token_indices, get_line_numbers
 
 
-def build_scopes(tokens: list[Token], language: Language) -> list[Scope]:
+def build_scopes(tokens: Sequence[Token], language: Language) -> list[Scope]:
     code_tokens = filter_tokens(tokens)
     nocl_comment_tokens = filter_nocl_comment_tokens(tokens)
     headers = language.extract_headers(code_tokens)
@@ -62,70 +62,41 @@ def filter_scopes_nested_functions(scopes: list[Scope]) -> list[Scope]:
 
 
 def _build_scopes_from_headers_and_blocks(
-        headers: list[Header], blocks: list[TokenRange], tokens: list[Token]
+        headers: list[Header], blocks: list[TokenRange], tokens: Sequence[Token]
 ) -> list[Scope]:
     result: list[Scope] = []
+    block_index = BlockIndex(blocks)
     reverse_headers = sort_headers(headers, tokens, reverse=True)
     for header in reverse_headers:
-        scope_blocks_indices = _find_scope_blocks_indices(header.token_range, blocks)
+        scope_blocks_indices = block_index.scope_blocks(header.token_range)
         if len(scope_blocks_indices) > 0:
             start = min(blocks[bi].start for bi in scope_blocks_indices)
             end = max(blocks[bi].end for bi in scope_blocks_indices)
             result.append(Scope(header, TokenRange(start, end)))
-            blocks = delete_indices(blocks, scope_blocks_indices)
+            block_index.remove(scope_blocks_indices)
     result.reverse()
     return result
 
 
-def _find_scope_blocks_indices(
-        header: TokenRange, blocks: list[TokenRange]
-) -> list[int]:
-    body_block = _get_nearest_block(header, blocks)
-    if body_block:
-        if body_block.contains(header):
-            return [i for i in range(len(blocks)) if body_block.contains(blocks[i])]
-        else:
-            return [i for i in range(len(blocks)) if body_block.overlaps(blocks[i])]
-    return []
-
-
-def _get_nearest_block(
-        header: TokenRange, blocks: list[TokenRange]
-) -> Optional[TokenRange]:
-    reverse_blocks = blocks[::-1]
-    result = None
-    for block in reverse_blocks:
-        if block.contains(header):
-            return block if not result else result
-        elif block.gt(header):
-            result = block
-        elif block.lt(header):
-            break
-    return result
-
-
 def _filter_nocl_scopes(
-        scopes: list[Scope], nocl_comment_tokens: list[Token]
+        scopes: list[Scope], nocl_comment_tokens: Sequence[Token]
 ) -> list[Scope]:
     nocl_comment_lines = [t.location.line for t in nocl_comment_tokens]
     return [s for s in scopes if s.header.name_token.location.line not in nocl_comment_lines]
 
 
-def has_name_prefix(tokens: list[Token], index: int) -> bool:
+def has_name_prefix(tokens: Sequence[Token], index: int) -> bool:
     return 0 < index < len(tokens) and tokens[index - 1].is_name()
 
 
-def has_curly_suffix(tokens: list[Token], index):
+def has_curly_suffix(tokens: Sequence[Token], index):
     return index < len(tokens) - 1 and tokens[index + 1].is_symbol("{")
 
 
-def get_headers(
-        tokens: list[Token], expression: Expression, followed_by: Expression = None
-) -> list[Header]:
-    # expression = replace_string_literal_with_predicate(expression)
-    patterns = find_all(expression, tokens)
-    if followed_by:
-        patterns = [p for p in patterns if starts_with(followed_by, tokens[p.end:])]
+def get_headers(tokens: Sequence[Token], header: HeaderExpression) -> list[Header]:
+    patterns = find_all(header.automata, tokens)
+    if header.followed_by_automata:
+        patterns = [p for p in patterns if starts_with(header.followed_by_automata, tokens, p.end)]
     result = []
     for pattern in patterns:
         name_token = next(t for t in pattern.tokens if t.is_name())
@@ -135,7 +106,7 @@ def get_headers(
 
 
 def get_blocks(
-        tokens: list[Token], open: str, close: str, extract_nested: bool = True
+        tokens: Sequence[Token], open: str, close: str, extract_nested: bool = True
 ) -> list[TokenRange]:
     balanced_tokens = get_balanced_symbol_token_indices(
         tokens, open, close, extract_nested
@@ -144,19 +115,37 @@ def get_blocks(
     return sort_token_ranges(token_ranges, tokens)
 
 
-def count_lines(scope: Scope, tokens: list[Token]):
-    return len(set([t.location.line for t in _scope_tokens(scope, tokens)]))
+def count_lines(scope: Scope, tokens: Sequence[Token]) -> int:
+    return count_scopes_lines([scope], tokens)[0]
 
 
-def _scope_tokens(scope: Scope, tokens: list[Token]) -> list[Token]:
-    result = []
-    children_token_ranges = []
-    for child in scope.children:
-        children_token_ranges.append(TokenRange(child.header.token_range.start, child.block.end))
-    children_token_ranges = sort_token_ranges(children_token_ranges, tokens)
-    for index in range(scope.header.token_range.start, scope.block.end):
-        while len(children_token_ranges) > 0 and index > children_token_ranges[0].end:
-            children_token_ranges.pop(0)
-        if len(children_token_ranges) == 0 or index < children_token_ranges[0].start:
-            result.append(tokens[index])
+def count_scopes_lines(scopes: list[Scope], tokens: Sequence[Token]) -> list[int]:
+    line_changes = _count_line_changes(tokens)
+    return [_count_scope_lines(scope, tokens, line_changes) for scope in scopes]
+
+
+def _count_line_changes(tokens: Sequence[Token]) -> list[int]:
+    line_numbers = get_line_numbers(tokens)
+    result = [0] * len(line_numbers)
+    changes = 0
+    for i in range(1, len(line_numbers)):
+        if line_numbers[i] != line_numbers[i - 1]:
+            changes += 1
+        result[i] = changes
+    return result
+
+
+def _count_scope_lines(scope: Scope, tokens: Sequence[Token], line_changes: list[int]) -> int:
+    result = 0
+    last_line = None
+    start = scope.header.token_range.start
+    children = sorted((child.header.token_range.start, child.block.end) for child in scope.children)
+    for child_start, child_end in children + [(scope.block.end, scope.block.end)]:
+        end = min(child_start, scope.block.end)
+        if start < end:
+            result += 1 + line_changes[end - 1] - line_changes[start]
+            if tokens[start].location.line == last_line:
+                result -= 1
+            last_line = tokens[end - 1].location.line
+        start = max(start, child_end + 1)
     return result
@@ -1,55 +1,51 @@
+from functools import lru_cache
+from typing import Sequence
+
+from codelimit.common.LineIndex import LineIndex
 from codelimit.common.Location import Location
 from codelimit.common.Token import Token
+from codelimit.common.TokenBuffer import CODE, COMMENT, WHITESPACE
+from codelimit.common.TokenView import TokenView
 
 
 def get_newline_indices(code: str) -> list[int]:
-    result = []
-    for index, c in enumerate(code):
-        if c == "\n":
-            result.append(index)
-    return result
+    return LineIndex(code).newline_indices()
 
 
 def index_to_location(code: str, index: int) -> Location:
-    line = 1 + len([c for c in code[: index + 1] if c == "\n"])
+    location = _line_index(code).location(index)
     if index > 0 and code[index] == "\n":
-        line -= 1
-    if index == 0:
-        column = 1
-    else:
-        column = 0
-        for i in range(index, -1, -1):
-            c = code[i]
-            if c == "\n":
-                break
-            column += 1
-    return Location(line, column)
+        location.column = 0
+    return location
 
 
 def location_to_index(code: str, position: Location) -> int:
-    result = 0
-    lines = code.split("\n")
-    for i in range(0, position.line - 1):
-        result += len(lines[i]) + 1
-    result += max(0, position.column - 1)
-    return result
+    return _line_index(code).offset(position)
 
 
 def get_token_range(code: str, start: Token, end: Token) -> str:
-    start_index = location_to_index(code, start.location)
-    end_index = location_to_index(code, end.location)
+    line_index = _line_index(code)
+    start_index = line_index.offset(start.location)
+    end_index = line_index.offset(end.location)
     return code[start_index : end_index + len(end.value)]
 
 
 def get_location_range(code: str, start: Location, end: Location) -> str:
-    start_index = location_to_index(code, start)
-    end_index = location_to_index(code, end)
+    line_index = _line_index(code)
+    start_index = line_index.offset(start)
+    end_index = line_index.offset(end)
     return code[start_index:end_index]
 
 
 def filter_tokens(
-    tokens: list[Token], keep_whitespace=False, keep_comments=False, keep_others=True
-) -> list[Token]:
+    tokens: Sequence[Token], keep_whitespace=False, keep_comments=False, keep_others=True
+) -> Sequence[Token]:
+    if isinstance(tokens, TokenView):
+        kinds = [WHITESPACE] if keep_whitespace else []
+        kinds += [COMMENT] if keep_comments else []
+        kinds += [CODE] if keep_others else []
+        return tokens.select(*kinds)
+
     def predicate(token: Token):
         if token.is_whitespace():
             return keep_whitespace
@@ -61,7 +57,10 @@ def filter_tokens(
     return [t for t in tokens if predicate(t)]
 
 
-def filter_nocl_comment_tokens(tokens: list[Token]):
+def filter_nocl_comment_tokens(tokens: Sequence[Token]):
+    if isinstance(tokens, TokenView):
+        tokens = tokens.select(COMMENT)
+
     def predicate(token: Token):
         if token.is_comment():
             value = token.value.lower()
@@ -74,3 +73,8 @@ def filter_nocl_comment_tokens(tokens: list[Token]):
             return False
 
     return [t for t in tokens if predicate(t)]
+
+
+@lru_cache(maxsize=1)
+def _line_index(code: str) -> LineIndex:
+    return LineIndex(code)
@@ -4,43 +4,34 @@ from codelimit.common.token_matching.predicate.TokenValue import TokenValue
 
 
 class Balanced(TokenPredicate):
+    stateful = True
+
     def __init__(self, left: str | TokenPredicate, right: str | TokenPredicate):
-        super().__init__()
         self.left = left if isinstance(left, TokenPredicate) else TokenValue(left)
         self.right = right if isinstance(right, TokenPredicate) else TokenValue(right)
-        self.depth = 0
-
-    def reset(self):
-        super().reset()
-        self.left.reset()
-        self.right.reset()
-        self.depth = 0
 
     def accept(self, token: Token) -> bool:
+        return self.step(token, 0) is not None
+
+    def step(self, token: Token, depth: int) -> int | None:
         if self.left.accept(token):
-            self.depth += 1
-            return True
+            return depth + 1
         elif self.right.accept(token):
-            self.depth -= 1
-            if self.depth < 0:
-                return False
-            if self.depth == 0:
-                self.satisfied = True
-            return True
+            return depth - 1 if depth > 0 else None
         else:
-            return self.depth > 0
+            return depth if depth > 0 else None
+
+    def values(self) -> frozenset | None:
+        left, right = self.left.values(), self.right.values()
+        return left | right if left is not None and right is not None else None
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Balanced):
             return False
-        return (
-            self.left == other.left
-            and self.right == other.right
-            and self.depth == other.depth
-        )
+        return self.left == other.left and self.right == other.right
 
     def __hash__(self):
-        return hash((self.left, self.right, self.depth))
+        return hash((self.left, self.right))
 
     def __str__(self):
         return f"<Balanced {self.left} {self.right} {id(self)}>"
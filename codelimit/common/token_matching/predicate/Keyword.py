@@ -4,14 +4,13 @@ from codelimit.common.token_matching.predicate.TokenPredicate import TokenPredic
 
 class Keyword(TokenPredicate):
     def __init__(self, keyword: str):
-        super().__init__()
         self.keyword = keyword
 
     def accept(self, token: Token) -> bool:
-        if token.is_keyword() and token.value == self.keyword:
-            self.satisfied = True
-            return True
-        return False
+        return token.is_keyword() and token.value == self.keyword
+
+    def values(self) -> frozenset:
+        return frozenset([self.keyword])
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Keyword):
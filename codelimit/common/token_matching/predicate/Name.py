@@ -4,10 +4,10 @@ from codelimit.common.token_matching.predicate.TokenPredicate import TokenPredic
 
 class Name(TokenPredicate):
     def accept(self, token: Token) -> bool:
-        if token.is_name():
-            self.satisfied = True
-            return True
-        return False
+        return token.is_name()
+
+    def values(self) -> frozenset:
+        return frozenset()
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, Name)
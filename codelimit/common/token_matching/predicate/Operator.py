@@ -4,14 +4,13 @@ from codelimit.common.token_matching.predicate.TokenPredicate import TokenPredic
 
 class Operator(TokenPredicate):
     def __init__(self, symbol: str):
-        super().__init__()
         self.symbol = symbol
 
     def accept(self, token: Token) -> bool:
-        if token.is_operator(self.symbol):
-            self.satisfied = True
-            return True
-        return False
+        return token.is_operator(self.symbol)
+
+    def values(self) -> frozenset:
+        return frozenset([self.symbol])
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Operator):
@@ -5,13 +5,16 @@ from codelimit.common.token_matching.predicate.TokenValue import TokenValue
 
 class Or(TokenPredicate):
     def __init__(self, left: str | TokenPredicate, right: str | TokenPredicate):
-        super().__init__()
         self.left = left if isinstance(left, TokenPredicate) else TokenValue(left)
         self.right = right if isinstance(right, TokenPredicate) else TokenValue(right)
 
     def accept(self, token: Token) -> bool:
         return self.left.accept(token) or self.right.accept(token)
 
+    def values(self) -> frozenset | None:
+        left, right = self.left.values(), self.right.values()
+        return left | right if left is not None and right is not None else None
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Or):
             return False
@@ -1,16 +1,25 @@
 from abc import abstractmethod
+from typing import Hashable, Iterator, Sequence
 
 from codelimit.common.Token import Token
+from codelimit.common.TokenView import TokenView
 from codelimit.common.gsm.predicate.Predicate import Predicate
 
 
 class TokenPredicate(Predicate[Token]):
-    def __init__(self):
-        self.satisfied = False
-
-    def reset(self):
-        self.satisfied = False
-
     @abstractmethod
     def accept(self, token: Token) -> bool:
         pass
+
+    @staticmethod
+    def class_key(token: Token, values: frozenset) -> Hashable:
+        return token.token_type, token.value if token.value in values else None
+
+    @staticmethod
+    def class_keys(tokens: Sequence[Token], values: frozenset, start: int = 0) -> Iterator[Hashable]:
+        if isinstance(tokens, TokenView):
+            return (
+                (token_type, value if value in values else None)
+                for token_type, value in tokens.types_and_values(start)
+            )
+        return (TokenPredicate.class_key(tokens[i], values) for i in range(start, len(tokens)))
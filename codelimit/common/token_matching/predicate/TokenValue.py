@@ -4,14 +4,13 @@ from codelimit.common.token_matching.predicate.TokenPredicate import TokenPredic
 
 class TokenValue(TokenPredicate):
     def __init__(self, value: str):
-        super().__init__()
         self.value = value
 
     def accept(self, token: Token) -> bool:
-        if token.value == self.value:
-            self.satisfied = True
-            return True
-        return False
+        return token.value == self.value
+
+    def values(self) -> frozenset:
+        return frozenset([self.value])
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, TokenValue):
@@ -1,18 +1,21 @@
-from typing import Tuple
+from typing import Any, Iterable, Tuple, Sequence
+
+from pygments.token import Punctuation
 
 from codelimit.common.Token import Token
+from codelimit.common.TokenView import TokenView
 from codelimit.common.TokenRange import TokenRange
 
 
 def get_balanced_symbol_token_indices(
-        tokens: list[Token], start: str, end: str, extract_nested=False
+        tokens: Sequence[Token], start: str, end: str, extract_nested=False
 ) -> list[Tuple[int, int]]:
     result = []
     block_starts = []
-    for index, t in enumerate(tokens):
-        if t.is_symbol(start):
+    for index, (token_type, value) in enumerate(get_types_and_values(tokens)):
+        if value == start and token_type in Punctuation:
             block_starts.append(index)
-        elif t.is_symbol(end):
+        elif value == end and token_type in Punctuation:
             if len(block_starts) > 0:
                 start_index = block_starts.pop()
                 if extract_nested or len(block_starts) == 0:
@@ -21,21 +24,39 @@ def get_balanced_symbol_token_indices(
 
 
 def get_balanced_symbol_token_ranges(
-        tokens: list[Token], start: str, end: str
+        tokens: Sequence[Token], start: str, end: str
 ) -> list[TokenRange]:
     result = []
     start_indices: list[int] = []
-    for index, t in enumerate(tokens):
-        if t.is_symbol(start):
+    for index, (token_type, value) in enumerate(get_types_and_values(tokens)):
+        if value == start and token_type in Punctuation:
             start_indices.append(index)
-        elif t.is_symbol(end):
+        elif value == end and token_type in Punctuation:
             if len(start_indices) > 0:
                 start_index = start_indices.pop()
                 result.append(TokenRange(start_index, index + 1))
     return result
 
 
-def sort_tokens(tokens: list[Token]) -> list[Token]:
+def sort_tokens(tokens: Sequence[Token]) -> list[Token]:
     result = sorted(tokens, key=lambda t: t.location.column)
     result = sorted(result, key=lambda t: t.location.line)
     return result
+
+
+def get_line_numbers(tokens: Sequence[Token]) -> Sequence[int]:
+    if isinstance(tokens, TokenView):
+        return tokens.lines()
+    return [t.location.line for t in tokens]
+
+
+def get_values(tokens: Sequence[Token]) -> Sequence[str]:
+    if isinstance(tokens, TokenView):
+        return tokens.values()
+    return [t.value for t in tokens]
+
+
+def get_types_and_values(tokens: Sequence[Token]) -> Iterable[tuple[Any, str]]:
+    if isinstance(tokens, TokenView):
+        return tokens.types_and_values()
+    return ((t.token_type, t.value) for t in tokens)
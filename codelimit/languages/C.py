@@ -1,8 +1,11 @@
+from typing import Sequence
+
 from codelimit.common.Language import Language
 from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.scope.Header import Header
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.scope_utils import (
     get_blocks,
     get_headers,
@@ -15,11 +18,12 @@ from codelimit.common.token_matching.predicate.Symbol import Symbol
 class C(Language):
     def __init__(self):
         super().__init__("C", False)
+        self.header = HeaderExpression([Name(), OneOrMore(Balanced("(", ")"))], Symbol("{"))
 
-    def extract_headers(self, tokens: list[Token]) -> list[Header]:
-        return get_headers(tokens, [Name(), OneOrMore(Balanced("(", ")"))], Symbol("{"))
+    def extract_headers(self, tokens: Sequence[Token]) -> list[Header]:
+        return get_headers(tokens, self.header)
 
     def extract_blocks(
-        self, tokens: list[Token], headers: list[Header]
+        self, tokens: Sequence[Token], headers: list[Header]
     ) -> list[TokenRange]:
         return get_blocks(tokens, "{", "}")
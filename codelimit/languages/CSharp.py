@@ -1,5 +1,8 @@
+from typing import Sequence
+
 from codelimit.common.Language import Language
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.scope_utils import (
     get_blocks,
     get_headers,
@@ -12,9 +15,10 @@ from codelimit.common.token_matching.predicate.Symbol import Symbol
 class CSharp(Language):
     def __init__(self):
         super().__init__('C#')
+        self.header = HeaderExpression([Name(), OneOrMore(Balanced('(', ')'))], Symbol('{'))
 
-    def extract_headers(self, tokens: list) -> list:
-        return get_headers(tokens, [Name(), OneOrMore(Balanced('(', ')'))], Symbol('{'))
+    def extract_headers(self, tokens: Sequence) -> list:
+        return get_headers(tokens, self.header)
 
-    def extract_blocks(self, tokens: list, headers: list) -> list:
+    def extract_blocks(self, tokens: Sequence, headers: list) -> list:
         return get_blocks(tokens, "{", "}")
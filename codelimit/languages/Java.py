@@ -1,9 +1,12 @@
+from typing import Sequence
+
 from codelimit.common.Language import Language
 from codelimit.common.Token import Token
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.gsm.operator.Union import Union
 from codelimit.common.gsm.operator.ZeroOrMore import ZeroOrMore
 from codelimit.common.scope.Header import Header
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.scope_utils import (
     get_blocks,
     get_headers,
@@ -20,10 +23,8 @@ from codelimit.common.token_matching.predicate.Symbol import Symbol
 class Java(Language):
     def __init__(self):
         super().__init__("Java")
-
-    def extract_headers(self, tokens: list) -> list:
-        headers = get_headers(
-            tokens, [Name(), OneOrMore(Balanced('(', ')'))],
+        self.header = HeaderExpression(
+            [Name(), OneOrMore(Balanced('(', ')'))],
             [
                 Union(
                     Symbol("{"),
@@ -31,13 +32,16 @@ class Java(Language):
                 )
             ]
         )
+
+    def extract_headers(self, tokens: Sequence) -> list:
+        headers = get_headers(tokens, self.header)
         return filter_headers(headers, tokens)
 
-    def extract_blocks(self, tokens: list, headers: list) -> list:
+    def extract_blocks(self, tokens: Sequence, headers: list) -> list:
         return get_blocks(tokens, "{", "}")
 
 
-def filter_headers(headers: list[Header], tokens: list[Token]) -> list[Header]:
+def filter_headers(headers: list[Header], tokens: Sequence[Token]) -> list[Header]:
     result = []
     keywords = Or(Keyword('record'), Keyword('new'))
     for header in headers:
@@ -1,9 +1,12 @@
+from typing import Sequence
+
 from codelimit.common.Language import Language
 from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.gsm.operator.Optional import Optional
 from codelimit.common.scope.Header import Header
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.scope_utils import (
     get_blocks,
     get_headers,
@@ -18,15 +21,11 @@ from codelimit.common.token_matching.predicate.Symbol import Symbol
 class JavaScript(Language):
     def __init__(self):
         super().__init__("JavaScript")
-
-    def extract_headers(self, tokens: list[Token]) -> list[Header]:
-        functions = get_headers(
-            tokens,
+        self.function_header = HeaderExpression(
             [Optional(Keyword("function")), Name(), OneOrMore(Balanced("(", ")"))],
             Symbol("{"),
         )
-        arrow_functions = get_headers(
-            tokens,
+        self.arrow_function_header = HeaderExpression(
             [
                 Optional(Keyword("const")),
                 Name(),
@@ -37,9 +36,13 @@ class JavaScript(Language):
             ],
             Symbol("{"),
         )
+
+    def extract_headers(self, tokens: Sequence[Token]) -> list[Header]:
+        functions = get_headers(tokens, self.function_header)
+        arrow_functions = get_headers(tokens, self.arrow_function_header)
         return functions + arrow_functions
 
     def extract_blocks(
-        self, tokens: list[Token], headers: list[Header]
+        self, tokens: Sequence[Token], headers: list[Header]
     ) -> list[TokenRange]:
         return get_blocks(tokens, "{", "}")
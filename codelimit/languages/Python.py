@@ -1,79 +1,78 @@
+from typing import Sequence
+
 from codelimit.common.Language import Language
 from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.scope.Header import Header
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.scope_utils import get_headers
 from codelimit.common.token_matching.predicate.Balanced import Balanced
 from codelimit.common.token_matching.predicate.Keyword import Keyword
 from codelimit.common.token_matching.predicate.Name import Name
-from codelimit.common.utils import delete_indices
+from codelimit.common.token_utils import get_line_numbers, get_values
 
 
 class Python(Language):
     def __init__(self):
         super().__init__("Python")
+        self.header = HeaderExpression([Keyword("def"), Name(), OneOrMore(Balanced("(", ")"))])
 
-    def extract_headers(self, tokens: list[Token]) -> list[Header]:
-        return get_headers(
-            tokens, [Keyword("def"), Name(), OneOrMore(Balanced("(", ")"))]
-        )
+    def extract_headers(self, tokens: Sequence[Token]) -> list[Header]:
+        return get_headers(tokens, self.header)
 
     def extract_blocks(
-        self, tokens: list[Token], headers: list[Header]
+        self, tokens: Sequence[Token], headers: list[Header]
     ) -> list[TokenRange]:
-        lines = _get_token_lines(tokens)
+        header_line_nrs = [tokens[h.token_range.end].location.line for h in headers]
+        header_indentations = [tokens[h.token_range.start].location.column for h in headers]
+        first_lines: list[TokenRange | None] = [None] * len(headers)
+        last_lines: list[TokenRange | None] = [None] * len(headers)
+        open_headers: list[int] = []
+        next_header = 0
+        for line in _get_token_line_ranges(tokens):
+            first_token = tokens[line.start]
+            line_nr = first_token.location.line
+            line_indentation = first_token.location.column
+            while next_header < len(headers) and header_line_nrs[next_header] < line_nr:
+                open_headers.append(next_header)
+                next_header += 1
+            while open_headers and line_indentation <= header_indentations[open_headers[-1]]:
+                open_headers.pop()
+            if open_headers:
+                owner = open_headers[-1]
+                if first_lines[owner] is None:
+                    first_lines[owner] = line
+                last_lines[owner] = line
         result = []
-        reverse_headers = headers[::-1]
-        for header in reverse_headers:
-            header_line_nr = tokens[header.token_range.end].location.line
-            header_indentation = tokens[header.token_range.start].location.column
-            block_line_indices = []
-            for idx, line in enumerate(lines[::-1]):
-                line_index = (len(lines) - 1) - idx
-                line_nr = line[0].location.line
-                line_indentation = line[0].location.column
-                if line_nr <= header_line_nr:
-                    break
-                elif line_indentation > header_indentation:
-                    block_line_indices.append(line_index)
-                else:
-                    block_line_indices = []
-            if len(block_line_indices) > 0:
-                scope_tokens = []
-                for index in block_line_indices[::-1]:
-                    scope_tokens.extend(lines[index])
-                start = tokens.index(scope_tokens[0])
-                end = tokens.index(scope_tokens[-1]) + 1
-                result.append(TokenRange(start, end))
-                lines = delete_indices(lines, block_line_indices)
-        return result[::-1]
+        for first_line, last_line in zip(first_lines, last_lines):
+            if first_line is not None and last_line is not None:
+                result.append(TokenRange(first_line.start, last_line.end))
+        return result
 
 
-def _get_token_lines(tokens: list[Token]) -> list[list[Token]]:
+def _get_token_line_ranges(tokens: Sequence[Token]) -> list[TokenRange]:
+    line_numbers = get_line_numbers(tokens)
+    values = get_values(tokens)
     result = []
-    line: list[Token] = []
+    line_start = 0
     line_continuation = False
     line_nr = 0
-    for t in tokens:
-        if len(line) == 0:
-            line.append(t)
-            line_nr = t.location.line
-        else:
-            if line_continuation:
-                line.append(t)
-                line_nr = t.location.line
-                line_continuation = False
-            if t.location.line == line_nr:
-                line.append(t)
-                if t.value.endswith("\\\n"):
-                    line_continuation = True
-            else:
-                result.append(line)
-                line = [t]
-                line_nr = t.location.line
-    if len(line) > 0:
-        result.append(line)
+    for index, token_line_nr in enumerate(line_numbers):
+        if index == line_start:
+            line_nr = token_line_nr
+            continue
+        if line_continuation:
+            line_nr = token_line_nr
+            line_continuation = False
+        if token_line_nr != line_nr:
+            result.append(TokenRange(line_start, index))
+            line_start = index
+            line_nr = token_line_nr
+        elif values[index].endswith("\\\n"):
+            line_continuation = True
+    if line_start < len(line_numbers):
+        result.append(TokenRange(line_start, len(line_numbers)))
     return result
 
 
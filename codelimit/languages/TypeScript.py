@@ -1,9 +1,12 @@
+from typing import Sequence
+
 from codelimit.common.Language import Language
 from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.gsm.operator.Optional import Optional
 from codelimit.common.scope.Header import Header
+from codelimit.common.scope.HeaderExpression import HeaderExpression
 from codelimit.common.scope.scope_utils import get_blocks, get_headers
 from codelimit.common.token_matching.predicate.Balanced import Balanced
 from codelimit.common.token_matching.predicate.Keyword import Keyword
@@ -16,15 +19,11 @@ from codelimit.common.token_matching.predicate.Symbol import Symbol
 class TypeScript(Language):
     def __init__(self):
         super().__init__("TypeScript")
-
-    def extract_headers(self, tokens: list[Token]) -> list[Header]:
-        functions = get_headers(
-            tokens,
+        self.function_header = HeaderExpression(
             [Optional("function"), Name(), OneOrMore(Balanced("(", ")"))],
             Or("{", Operator(":")),
         )
-        arrow_functions = get_headers(
-            tokens,
+        self.arrow_function_header = HeaderExpression(
             [
                 Optional(Keyword("const")),
                 Name(),
@@ -35,9 +34,13 @@ class TypeScript(Language):
             ],
             Symbol("{"),
         )
+
+    def extract_headers(self, tokens: Sequence[Token]) -> list[Header]:
+        functions = get_headers(tokens, self.function_header)
+        arrow_functions = get_headers(tokens, self.arrow_function_header)
         return functions + arrow_functions
 
     def extract_blocks(
-            self, tokens: list[Token], headers: list[Header]
+            self, tokens: Sequence[Token], headers: list[Header]
     ) -> list[TokenRange]:
         return get_blocks(tokens, "{", "}")
@@ -1,4 +1,5 @@
 from codelimit.common.Language import Language
+from codelimit.common.LexerIndex import LexerIndex
 from codelimit.languages.C import C
 from codelimit.languages.CSharp import CSharp
 from codelimit.languages.Cpp import Cpp
@@ -22,3 +23,5 @@ class Languages:
         language = subclass() # type: ignore
         by_name[language.name] = language
 
+    lexer_index = LexerIndex(by_name.keys())
+
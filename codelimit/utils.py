@@ -1,3 +1,6 @@
+import io
+import tempfile
+from contextlib import closing
 from pathlib import Path
 from typing import Optional
 
@@ -7,7 +10,9 @@ from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from codelimit.common.console import console
+from codelimit.common.report.BinaryReportReader import BinaryReportReader
 from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportDatabase import ReportDatabase
 from codelimit.common.report.ReportReader import ReportReader
 from codelimit.common.report.ReportWriter import ReportWriter
 
@@ -38,15 +43,36 @@ def read_cached_report(path: Path) -> Optional[Report]:
 
 
 def read_report(report_path: Path, console: Console) -> Report:
+    database_path = report_path.with_suffix(".db")
+    binary_path = report_path.with_suffix(".bin")
+    if not report_path.exists() and binary_path.exists():
+        report_path = binary_path
+    elif not report_path.exists() and database_path.exists():
+        with closing(ReportDatabase(database_path, read_only=True)) as database:
+            report = database.to_report()
+        if report:
+            return report
     if not report_path.exists():
         console.print("[red]No cached report found, run scan first[/red]")
         raise typer.Exit(code=1)
-    report_data = report_path.read_text()
-    report_version = ReportReader.get_report_version(report_data)
+    report_data = report_path.read_bytes()
+    if BinaryReportReader.is_binary_report(report_data):
+        try:
+            report_version = BinaryReportReader.get_report_version(report_data)
+        except ValueError:
+            report_version = None
+    else:
+        report_version = ReportReader.get_report_version(report_data.decode())
     if report_version != Report.VERSION:
         console.print("[red]Report version mismatch, run scan first[/red]")
         raise typer.Exit(code=1)
-    return ReportReader.from_json(report_data)
+    return read_report_data(report_data)
+
+
+def read_report_data(report_data: bytes) -> Report:
+    if BinaryReportReader.is_binary_report(report_data):
+        return BinaryReportReader.from_bytes(report_data)
+    return ReportReader.from_json(report_data.decode())
 
 
 def upload_report(
@@ -66,20 +92,21 @@ def upload_report(
 
 
 def api_post_report(report, branch, repository, url, token):
-    data_template = (
-        f'{{{{"repository": "{repository}", "branch": "{branch}", "report":{{}}}}}}'
-    )
     with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             transient=True,
-    ) as progress:
+    ) as progress, tempfile.TemporaryFile() as body:
         progress.add_task(description=f"Uploading report to {url}", total=None)
+        stream = io.TextIOWrapper(body, encoding="utf-8")
+        stream.write(f'{{"repository": "{repository}", "branch": "{branch}", "report":')
+        ReportWriter(report, pretty_print=False).write(stream)
+        stream.write("}")
+        stream.detach()
+        body.seek(0)
         result = requests.post(
             url,
-            data=data_template.format(
-                ReportWriter(report, pretty_print=False).to_json()
-            ),
+            data=body,
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {token}",
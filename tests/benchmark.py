@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import tracemalloc
+from math import ceil, floor
+from json import loads
+from pathlib import Path
+from typing import Annotated, Callable
+
+import typer
+from pygments.lexers import get_lexer_for_filename
+from pygments.util import ClassNotFound
+
+from codelimit.common.Codebase import Codebase
+from codelimit.common.LexerIndex import LexerIndex
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.Scanner import scan_file, scan_path
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.Token import Token
+from codelimit.common.gsm.Expression import expression_to_nfa, expression_to_dfa, epsilon_closure, move, \
+    state_set_transitions, nfa_to_dfa, reachable_states
+from codelimit.common.gsm.Pattern import Pattern
+from codelimit.common.gsm.automata.NFA import NFA
+from codelimit.common.gsm.automata.State import State
+from codelimit.common.gsm.automata.DFA import DFA
+from codelimit.common.gsm.matcher import find_all, starts_with
+from codelimit.common.lexer_utils import lex
+from codelimit.common.TokenRange import TokenRange
+from codelimit.common.scope.Header import Header, sort_headers
+from codelimit.common.scope.Scope import Scope
+from codelimit.common.TokenRange import sort_token_ranges
+from codelimit.common.scope.scope_utils import get_headers, _build_scopes_from_headers_and_blocks, build_scopes, \
+    unfold_scopes, count_scopes_lines
+from codelimit.common.utils import delete_indices, make_profile, merge_profiles
+from codelimit.common.source_utils import filter_tokens, get_newline_indices, get_location_range
+from codelimit.common.report.BinaryReportReader import BinaryReportReader
+from codelimit.common.report.BinaryReportWriter import BinaryReportWriter
+from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportReader import ReportReader
+from codelimit.common.report.ReportUnit import ReportUnit
+from codelimit.common.report.ReportWriter import ReportWriter
+from codelimit.languages import Languages
+from codelimit.utils import info, success
+
+
+def measure(name: str, function: Callable[[], object], repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    assert best is not None
+    info(f'{name}: {best * 1000:.1f} ms')
+    return best
+
+
+def report_speedup(baseline: float, optimized: float):
+    success(f'Speedup: {baseline / optimized:.1f}x')
+
+
+cli = typer.Typer(no_args_is_help=True, add_completion=False)
+
+
+@cli.callback()
+def main():
+    """
+    Performance benchmarks.
+    """
+
+
+@cli.command(help="File dispatch throughput on a tree dominated by non-source files")
+def dispatch(files: Annotated[int, typer.Option(help="Number of files")] = 2000):
+    extensions = ['json', 'md', 'png', 'txt', 'yml', 'lock', 'svg', 'html', 'css', 'xml', 'py', 'ts', 'java']
+    filenames = [f'src/module{i % 100}/file{i}.{extensions[i % len(extensions)]}' for i in range(files)]
+    filenames.extend(['Makefile', 'LICENSE', 'Dockerfile'] * (files // 100))
+    language_names = Languages.by_name.keys()
+
+    def pygments_dispatch():
+        result = 0
+        for filename in filenames:
+            try:
+                lexer = get_lexer_for_filename(filename)
+                if lexer.__class__.name in language_names:
+                    result += 1
+            except ClassNotFound:
+                pass
+        return result
+
+    def index_dispatch():
+        index = LexerIndex(language_names)
+        return len([f for f in filenames if index.get_lexer(f)])
+
+    assert pygments_dispatch() == index_dispatch()
+    info(f'Dispatching {len(filenames)} files')
+    baseline = measure('get_lexer_for_filename', pygments_dispatch)
+    optimized = measure('LexerIndex', index_dispatch)
+    report_speedup(baseline, optimized)
+
+
+def generate_java_code(methods: int) -> str:
+    code = "public class Foo {\n"
+    for i in range(methods):
+        code += f"    public int bar{i}(int a, String b) throws IOException {{\n"
+        code += f"        return baz(a, b) + {i};\n"
+        code += "    }\n"
+    code += "}\n"
+    return code
+
+
+@cli.command(help="Header extraction with per-file versus precompiled automata")
+def headers(files: Annotated[int, typer.Option(help="Number of files")] = 200,
+            methods: Annotated[int, typer.Option(help="Methods per file")] = 5):
+    language = Languages.Java
+    lexer = Languages.lexer_index.get_lexer('Foo.java')
+    code_tokens = filter_tokens(lex(lexer, generate_java_code(methods), False))
+
+    def compile_per_file():
+        for _ in range(files):
+            patterns = find_all(language.header.expression, code_tokens)
+            [p for p in patterns if starts_with(language.header.followed_by, code_tokens[p.end:])]
+
+    def precompiled():
+        for _ in range(files):
+            get_headers(code_tokens, language.header)
+
+    info(f'Extracting headers from {files} Java files with {methods} methods each')
+    baseline = measure('Compile per file', compile_per_file)
+    optimized = measure('Precompiled', precompiled)
+    info(f'Saved per file: {(baseline - optimized) / files * 1000:.2f} ms')
+    report_speedup(baseline, optimized)
+
+
+def generate_c_code(functions: int) -> str:
+    code = "#include <stdio.h>\n\n"
+    for i in range(functions):
+        code += f"static int foo{i}(int argc, char *argv[]) {{\n"
+        code += f"    int result = bar(argc, argv[{i % 10}]) + baz({i});\n"
+        code += "    if (result > 0) {\n"
+        code += "        printf(\"%d\\n\", result);\n"
+        code += "    }\n"
+        code += "    return result;\n"
+        code += "}\n\n"
+    return code
+
+
+@cli.command(help="Header extraction time as the number of C functions per file grows")
+def header_scaling(functions: Annotated[int, typer.Option(help="Number of functions in the small file")] = 1000):
+    lexer = Languages.lexer_index.get_lexer('foo.c')
+    small_tokens = filter_tokens(lex(lexer, generate_c_code(functions), False))
+    large_tokens = filter_tokens(lex(lexer, generate_c_code(functions * 10), False))
+
+    small = measure(f'{functions:,} functions', lambda: get_headers(small_tokens, Languages.C.header))
+    large = measure(f'{functions * 10:,} functions', lambda: get_headers(large_tokens, Languages.C.header))
+    info(f'Ratio for 10x the functions: {large / small:.1f}x')
+
+
+def find_all_baseline(dfa: DFA, sequence: list) -> list[Pattern]:
+    matches: list[Pattern] = []
+    active_patterns: list[Pattern] = []
+    for idx, item in enumerate(sequence):
+        active_patterns.append(Pattern(idx, dfa))
+        next_state_patterns = []
+        for pattern in active_patterns:
+            if matches and pattern.start < matches[-1].end:
+                continue
+            if len(pattern.state.transition) == 0 and pattern.is_accepting():
+                pattern.end = idx
+                matches.append(pattern)
+                continue
+            if pattern.consume(item):
+                next_state_patterns.append(pattern)
+            elif pattern.is_accepting():
+                pattern.end = idx
+                matches.append(pattern)
+        active_patterns = next_state_patterns
+    for pattern in active_patterns:
+        if pattern.is_accepting():
+            pattern.end = len(sequence)
+            matches.append(pattern)
+    return matches
+
+
+@cli.command(help="find_all against a Pattern-per-token baseline on a large C file")
+def matcher(tokens: Annotated[int, typer.Option(help="Approximate number of tokens")] = 50000):
+    lexer = Languages.lexer_index.get_lexer('foo.c')
+    code_tokens = filter_tokens(lex(lexer, generate_c_code(tokens // 60), False))
+    dfa = Languages.C.header.automata
+
+    baseline_matches = find_all_baseline(dfa, code_tokens)
+    matches = find_all(dfa, code_tokens)
+    assert [(p.start, p.end) for p in matches] == [(p.start, p.end) for p in baseline_matches]
+    info(f'Matching C headers in {len(code_tokens)} tokens, {len(matches)} matches')
+    baseline = measure('Pattern per token', lambda: find_all_baseline(dfa, code_tokens))
+    optimized = measure('Reused candidate + start state rejection', lambda: find_all(dfa, code_tokens))
+    info(f'Throughput: {len(code_tokens) / optimized:,.0f} tokens/s')
+    report_speedup(baseline, optimized)
+
+
+def nfa_to_dfa_baseline(nfa: NFA) -> DFA:
+    def state_set_id(states: set[State]) -> str:
+        return ", ".join([str(id) for id in sorted([state.id for state in states])])
+
+    start = State()
+    stack = [(start, epsilon_closure(nfa.start))]
+    states: dict[str, State] = {}
+    accepting_states = []
+    marked_states = set()
+    while stack:
+        state, T = stack.pop()
+        T_id = state_set_id(T)
+        if T_id in marked_states:
+            continue
+        marked_states.add(T_id)
+        if nfa.accepting in T:
+            accepting_states.append(state)
+        for predicate in state_set_transitions(T):
+            new_states = epsilon_closure(move(T, predicate))
+            if state_set_id(new_states) in states:
+                new_state = states[state_set_id(new_states)]
+            else:
+                new_state = State()
+                states[state_set_id(new_states)] = new_state
+            state.transition.append((predicate, new_state))
+            stack.append((new_state, new_states))
+    return DFA(start, accepting_states)
+
+
+def automata_size(dfa: DFA) -> tuple[int, int]:
+    states = reachable_states(dfa)
+    return len(states), sum(len(state.transition) for state in states)
+
+
+@cli.command(help="Automata construction and size with and without minimization")
+def automata(repeat: Annotated[int, typer.Option(help="Number of compilations per expression")] = 200,
+             methods: Annotated[int, typer.Option(help="Methods in the Java file")] = 2000):
+    expressions = []
+    for language in Languages.by_name.values():
+        for attr in ('header', 'function_header', 'arrow_function_header'):
+            header = getattr(language, attr, None)
+            if header is None:
+                continue
+            for expression in (header.expression, header.followed_by):
+                if expression is not None:
+                    expressions.append((f'{language.name} {attr}', expression))
+    for name, expression in expressions:
+        states, transitions = automata_size(nfa_to_dfa(expression_to_nfa(expression)))
+        min_states, min_transitions = automata_size(expression_to_dfa(expression))
+        info(f'{name}: {states} -> {min_states} states, {transitions} -> {min_transitions} transitions')
+
+    def compile_baseline():
+        for _ in range(repeat):
+            for _, expression in expressions:
+                nfa_to_dfa_baseline(expression_to_nfa(expression))
+
+    def compile_subsets():
+        for _ in range(repeat):
+            for _, expression in expressions:
+                nfa_to_dfa(expression_to_nfa(expression))
+
+    def compile_minimized():
+        for _ in range(repeat):
+            for _, expression in expressions:
+                expression_to_dfa(expression)
+
+    compile_time = measure('Compile, string state-set ids', compile_baseline)
+    measure('Compile, frozenset state-set ids', compile_subsets)
+    measure('Compile, frozenset state-set ids and minimization', compile_minimized)
+
+    lexer = Languages.lexer_index.get_lexer('Foo.java')
+    code_tokens = filter_tokens(lex(lexer, generate_java_code(methods), False))
+    followed_by = Languages.Java.header.followed_by
+    unminimized = nfa_to_dfa(expression_to_nfa(followed_by))
+    minimized = expression_to_dfa(followed_by)
+
+    def scan(dfa: DFA):
+        return [p.end for p in find_all(dfa, code_tokens)]
+
+    assert scan(unminimized) == scan(minimized)
+    info(f'Matching Java header suffixes in {len(code_tokens)} tokens')
+    baseline = measure('Unminimized', lambda: scan(unminimized))
+    optimized = measure('Minimized', lambda: scan(minimized))
+    info(f'Compile time for all expressions: {compile_time / repeat * 1000:.2f} ms')
+    report_speedup(baseline, optimized)
+
+
+def build_scopes_baseline(headers: list[Header], blocks: list[TokenRange], tokens: list) -> list[Scope]:
+    def nearest_block(header: TokenRange, blocks: list[TokenRange]) -> TokenRange | None:
+        result = None
+        for block in blocks[::-1]:
+            if block.contains(header):
+                return block if not result else result
+            elif block.gt(header):
+                result = block
+            elif block.lt(header):
+                break
+        return result
+
+    def scope_blocks_indices(header: TokenRange, blocks: list[TokenRange]) -> list[int]:
+        body_block = nearest_block(header, blocks)
+        if body_block:
+            if body_block.contains(header):
+                return [i for i in range(len(blocks)) if body_block.contains(blocks[i])]
+            else:
+                return [i for i in range(len(blocks)) if body_block.overlaps(blocks[i])]
+        return []
+
+    result: list[Scope] = []
+    for header in sort_headers(headers, tokens, reverse=True):
+        indices = scope_blocks_indices(header.token_range, blocks)
+        if len(indices) > 0:
+            start = min(blocks[bi].start for bi in indices)
+            end = max(blocks[bi].end for bi in indices)
+            result.append(Scope(header, TokenRange(start, end)))
+            blocks = delete_indices(blocks, indices)
+    result.reverse()
+    return result
+
+
+@cli.command(help="Scope assembly from headers and blocks on a large Java file")
+def scopes(methods: Annotated[int, typer.Option(help="Number of methods")] = 2000):
+    language = Languages.Java
+    lexer = Languages.lexer_index.get_lexer('Foo.java')
+    code_tokens = filter_tokens(lex(lexer, generate_java_code(methods), False))
+    headers = language.extract_headers(code_tokens)
+    blocks = language.extract_blocks(code_tokens, headers)
+
+    def scope_ranges(build) -> list[tuple[int, int]]:
+        return [(s.header.token_range.start, s.block.end) for s in build(headers, blocks, code_tokens)]
+
+    assert scope_ranges(build_scopes_baseline) == scope_ranges(_build_scopes_from_headers_and_blocks)
+    info(f'Assembling scopes from {len(headers)} headers and {len(blocks)} blocks')
+    baseline = measure('Linear scans', lambda: build_scopes_baseline(headers, blocks, code_tokens), repeat=1)
+    optimized = measure('BlockIndex', lambda: _build_scopes_from_headers_and_blocks(headers, blocks, code_tokens))
+    report_speedup(baseline, optimized)
+
+
+def generate_python_code(functions: int) -> str:
+    code = ""
+    for i in range(functions):
+        code += f"def foo{i}(a, b=({i}, 2)):\n"
+        code += "    result = bar(a)\n"
+        code += "    if result:\n"
+        code += "        def inner(c):\n"
+        code += "            return c + 1\n"
+        code += "        return inner(b)\n"
+        code += "    return result\n\n"
+    return code
+
+
+@cli.command(help="Python block extraction scaling with module size")
+def python_blocks(functions: Annotated[int, typer.Option(help="Number of functions in the smallest module")] = 250):
+    language = Languages.Python
+    lexer = Languages.lexer_index.get_lexer('foo.py')
+    previous = None
+    for factor in (1, 2, 4, 8):
+        code = generate_python_code(functions * factor)
+        code_tokens = filter_tokens(lex(lexer, code, False))
+        headers = language.extract_headers(code_tokens)
+        lines = code.count('\n')
+        elapsed = measure(f'{lines} lines, {len(headers)} functions',
+                          lambda: language.extract_blocks(code_tokens, headers))
+        info(f'Per line: {elapsed / lines * 1e6:.2f} us')
+        if previous:
+            info(f'Growth for 2x lines: {elapsed / previous:.1f}x')
+        previous = elapsed
+
+
+def generate_javascript_code(functions: int, depth: int) -> str:
+    code = ""
+    for i in range(functions):
+        for d in range(depth):
+            indent = "  " * d
+            code += f"{indent}function foo{i}_{d}(a) {{\n"
+            code += f"{indent}  const b = bar(a, {d});\n"
+        for d in reversed(range(depth)):
+            indent = "  " * d
+            code += f"{indent}  return b;\n"
+            code += f"{indent}}}\n"
+    return code
+
+
+def count_lines_baseline(scope: Scope, tokens: list) -> int:
+    result = []
+    children_token_ranges = []
+    for child in scope.children:
+        children_token_ranges.append(TokenRange(child.header.token_range.start, child.block.end))
+    children_token_ranges = sort_token_ranges(children_token_ranges, tokens)
+    for index in range(scope.header.token_range.start, scope.block.end):
+        while len(children_token_ranges) > 0 and index > children_token_ranges[0].end:
+            children_token_ranges.pop(0)
+        if len(children_token_ranges) == 0 or index < children_token_ranges[0].start:
+            result.append(tokens[index])
+    return len(set([t.location.line for t in result]))
+
+
+@cli.command(help="Line counting for deeply nested JavaScript functions")
+def lines(functions: Annotated[int, typer.Option(help="Number of top-level functions")] = 50,
+          depth: Annotated[int, typer.Option(help="Nesting depth")] = 40):
+    lexer = Languages.lexer_index.get_lexer('foo.js')
+    tokens = lex(lexer, generate_javascript_code(functions, depth), False)
+    code_tokens = filter_tokens(tokens)
+    scopes = unfold_scopes(build_scopes(tokens, Languages.JavaScript))
+
+    assert [count_lines_baseline(s, code_tokens) for s in scopes] == count_scopes_lines(scopes, code_tokens)
+    info(f'Counting lines of {len(scopes)} scopes in {len(code_tokens)} tokens')
+    baseline = measure('Token list per scope', lambda: [count_lines_baseline(s, code_tokens) for s in scopes])
+    optimized = measure('Single sweep', lambda: count_scopes_lines(scopes, code_tokens))
+    report_speedup(baseline, optimized)
+
+
+def generate_minified_javascript_code(functions: int) -> str:
+    return "".join(
+        f"function f{i}(a,b){{var c=a+b*{i};if(c>1){{return g(c,[1,2,3],{{x:a}})}}return c}}" for i in range(functions)
+    )
+
+
+def lex_baseline(lexer, code: str) -> list[Token]:
+    indices = get_newline_indices(code)
+    tokens = []
+    newline_index = 0
+    line_start = 0
+    for t in lexer.get_tokens_unprocessed(code):
+        while newline_index < len(indices) and t[0] > indices[newline_index]:
+            line_start = indices[newline_index] + 1
+            newline_index += 1
+        tokens.append(Token(Location(newline_index + 1, t[0] - line_start + 1), t[1], t[2]))
+    return filter_tokens(tokens, keep_comments=True)
+
+
+def measure_memory(name: str, function: Callable[[], object]) -> tuple[int, int]:
+    tracemalloc.start()
+    result = function()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    info(f'{name}: {peak / 1e6:.1f} MB peak, {blocks:,} live allocations')
+    return peak, blocks
+
+
+@cli.command(help="Token storage for minified JavaScript")
+def tokens(functions: Annotated[int, typer.Option(help="Number of functions")] = 3000):
+    lexer = Languages.lexer_index.get_lexer('foo.min.js')
+    code = generate_minified_javascript_code(functions)
+    baseline_tokens = lex_baseline(lexer, code)
+    assert baseline_tokens == list(lex(lexer, code, False))
+    info(f'Lexing {len(code):,} characters into {len(baseline_tokens):,} tokens')
+    del baseline_tokens
+    baseline_peak, baseline_blocks = measure_memory('Token list', lambda: lex_baseline(lexer, code))
+    peak, blocks = measure_memory('TokenBuffer', lambda: lex(lexer, code, False))
+    success(f'Memory: {baseline_peak / peak:.1f}x, allocations: {baseline_blocks / blocks:.1f}x')
+    baseline_peak, _ = measure_memory('Scan token list',
+                                      lambda: scan_file(lex_baseline(lexer, code), Languages.JavaScript))
+    peak, _ = measure_memory('Scan TokenBuffer', lambda: scan_file(lex(lexer, code, False), Languages.JavaScript))
+    success(f'Scan memory: {baseline_peak / peak:.1f}x')
+
+
+def location_to_index_baseline(code: str, position: Location) -> int:
+    result = 0
+    lines = code.split("\n")
+    for i in range(0, position.line - 1):
+        result += len(lines[i]) + 1
+    result += max(0, position.column - 1)
+    return result
+
+
+def get_location_range_baseline(code: str, start: Location, end: Location) -> str:
+    return code[location_to_index_baseline(code, start):location_to_index_baseline(code, end)]
+
+
+@cli.command(help="Source snippet extraction for every function in a file")
+def snippets(methods: Annotated[int, typer.Option(help="Number of Java methods")] = 2000):
+    lexer = Languages.lexer_index.get_lexer('Foo.java')
+    code = generate_java_code(methods)
+    measurements = scan_file(lex(lexer, code, False), Languages.Java)
+
+    def extract():
+        return [get_location_range(code, m.start, m.end) for m in measurements]
+
+    assert extract() == [get_location_range_baseline(code, m.start, m.end) for m in measurements]
+    info(f'Extracting {len(measurements)} snippets from {len(code):,} characters')
+    baseline = measure('Split per lookup',
+                       lambda: [get_location_range_baseline(code, m.start, m.end) for m in measurements], repeat=1)
+    optimized = measure('LineIndex', extract)
+    report_speedup(baseline, optimized)
+
+
+def generate_report(files: int, functions: int, offenders: int | None = None) -> Report:
+    codebase = Codebase("/")
+    for i in range(files):
+        longest = 50 if offenders is None or i < offenders else 23
+        measurements = [
+            Measurement(f"function_{j}", Location(j * 10 + 1, 1), Location(j * 10 + 9, 2), 8 + j % longest)
+            for j in range(functions)
+        ]
+        loc = sum(m.value for m in measurements)
+        codebase.add_file(SourceFileEntry(f"src/module{i % 100}/file{i}.py", f"{i:032x}", "Python", loc, measurements))
+    codebase.aggregate()
+    return Report(codebase)
+
+
+@cli.command(help="Writing a large JSON report to disk")
+def report_writer(files: Annotated[int, typer.Option(help="Number of files")] = 5000,
+                  functions: Annotated[int, typer.Option(help="Functions per file")] = 20):
+    report = generate_report(files, functions)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "codelimit.json")
+
+        def write_string():
+            path.write_text(ReportWriter(report).to_json())
+
+        def write_stream():
+            with path.open("w") as report_file:
+                ReportWriter(report).write(report_file)
+
+        write_stream()
+        info(f'Writing a {os.path.getsize(path) / 1e6:.1f} MB report')
+        baseline_peak, _ = measure_memory('to_json + write_text', write_string)
+        peak, _ = measure_memory('Streaming write', write_stream)
+        success(f'Memory: {baseline_peak / peak:.1f}x')
+        measure('to_json + write_text', write_string)
+        measure('Streaming write', write_stream)
+
+
+def read_report_baseline(json: str) -> Report:
+    d = loads(json)
+    codebase = Codebase(d["root"])
+    report = Report(codebase)
+    report.uuid = d["uuid"]
+    for k, v in d["codebase"]["files"].items():
+        measurements = [
+            Measurement(m["unit_name"], Location(m["start"]["line"], m["start"]["column"]),
+                        Location(m["end"]["line"], m["end"]["column"]), m["value"])
+            for m in v["measurements"]
+        ]
+        codebase.add_file(SourceFileEntry(k, v["checksum"], v["language"], v["loc"], measurements))
+    codebase.aggregate()
+    return report
+
+
+def findings_baseline(report: Report) -> tuple[list[int], list[ReportUnit]]:
+    units = []
+    for file, entry in report.codebase.files.items():
+        for m in entry.measurements():
+            if m.value > 30:
+                units.append(ReportUnit(file, m))
+    units = sorted(units, key=lambda unit: unit.measurement.value, reverse=True)
+    return make_profile(report.codebase.all_measurements()), units
+
+
+def findings(report: Report) -> tuple[list[int], list[ReportUnit]]:
+    return report.quality_profile(), report.all_report_units_sorted_by_length_asc(30)
+
+
+@cli.command(help="Loading a large JSON report for the findings command")
+def report_reader(files: Annotated[int, typer.Option(help="Number of files")] = 5000,
+                  functions: Annotated[int, typer.Option(help="Functions per file")] = 20,
+                  offenders: Annotated[int, typer.Option(help="Files containing long functions")] = 50):
+    report = generate_report(files, functions, offenders)
+    json = ReportWriter(report).to_json()
+    info(f'Reading a {len(json) / 1e6:.1f} MB report')
+    baseline = findings_baseline(read_report_baseline(json))
+    optimized = findings(ReportReader.from_json(json))
+    assert baseline[0] == optimized[0]
+    assert [(u.file, u.measurement) for u in baseline[1]] == [(u.file, u.measurement) for u in optimized[1]]
+    baseline_peak, _ = measure_memory('Eager read', lambda: read_report_baseline(json))
+    peak, _ = measure_memory('Lazy read', lambda: ReportReader.from_json(json))
+    success(f'Memory: {baseline_peak / peak:.1f}x')
+    baseline_time = measure('Eager read + findings', lambda: findings_baseline(read_report_baseline(json)))
+    optimized_time = measure('Lazy read + findings', lambda: findings(ReportReader.from_json(json)))
+    report_speedup(baseline_time, optimized_time)
+
+
+@cli.command(help="Loading a large report from JSON versus the binary format")
+def report_format(files: Annotated[int, typer.Option(help="Number of files")] = 5000,
+                  functions: Annotated[int, typer.Option(help="Functions per file")] = 20):
+    report = generate_report(files, functions)
+    json = ReportWriter(report).to_json()
+    data = BinaryReportWriter(report).to_bytes()
+    assert ReportWriter(BinaryReportReader.from_bytes(data)).to_json() == json
+    info(f'JSON: {len(json) / 1e6:.1f} MB, binary: {len(data) / 1e6:.1f} MB')
+    baseline = measure('Eager JSON read', lambda: read_report_baseline(json))
+    lazy = measure('Lazy JSON read', lambda: ReportReader.from_json(json))
+    optimized = measure('Binary read', lambda: BinaryReportReader.from_bytes(data))
+    report_speedup(baseline, optimized)
+    success(f'Speedup over lazy JSON: {lazy / optimized:.1f}x')
+    baseline = measure('Eager JSON read + findings', lambda: findings_baseline(read_report_baseline(json)))
+    optimized = measure('Binary read + findings', lambda: findings(BinaryReportReader.from_bytes(data)))
+    report_speedup(baseline, optimized)
+
+
+@cli.command(help="Top-N findings on a large report")
+def top_findings(files: Annotated[int, typer.Option(help="Number of files")] = 8000,
+                 functions: Annotated[int, typer.Option(help="Functions per file")] = 63,
+                 limit: Annotated[int, typer.Option(help="Number of findings")] = 10):
+    report = generate_report(files, functions)
+    data = BinaryReportWriter(report).to_bytes()
+    binary_report = BinaryReportReader.from_bytes(data)
+    info(f'{files * functions:,} functions, {binary_report.count_report_units():,} findings')
+    baseline_units = report.all_report_units_sorted_by_length_asc(30)[:limit]
+    assert report.top_report_units(limit) == baseline_units
+    assert binary_report.top_report_units(limit) == baseline_units
+    baseline = measure('Sort all units', lambda: report.all_report_units_sorted_by_length_asc(30)[:limit])
+    measure('Bounded heap', lambda: report.top_report_units(limit))
+    optimized = measure('Persisted index', lambda: binary_report.top_report_units(limit))
+    report_speedup(baseline, optimized)
+    measure('Binary read + top findings', lambda: BinaryReportReader.from_bytes(data).top_report_units(limit))
+
+
+def statistics_baseline(report: Report) -> tuple[int, int, list[int]]:
+    codebase = report.codebase
+    total_loc = sum(m.value for m in codebase.all_measurements())
+    count = len(codebase.all_measurements())
+    average = ceil(total_loc / count) if count else 0
+    sorted_measurements = codebase.all_measurements_sorted_by_length_asc()
+    percentile = 0
+    smallest_units_loc = 0
+    for m in sorted_measurements:
+        smallest_units_loc += m.value
+        if smallest_units_loc > floor(total_loc * 0.9):
+            percentile = m.value
+            break
+    return average, percentile, make_profile(codebase.all_measurements())
+
+
+def statistics(report: Report) -> tuple[int, int, list[int]]:
+    return report.get_average(), report.ninetieth_percentile(), report.quality_profile()
+
+
+@cli.command(help="Report statistics on a large codebase")
+def stats(files: Annotated[int, typer.Option(help="Number of files")] = 8000,
+          functions: Annotated[int, typer.Option(help="Functions per file")] = 63):
+    report = generate_report(files, functions)
+    assert statistics_baseline(report) == statistics(report)
+    info(f'{files * functions:,} functions')
+    baseline = measure('Recompute from all measurements', lambda: statistics_baseline(report))
+    optimized = measure('Running aggregates', lambda: statistics(report))
+    report_speedup(baseline, optimized)
+
+
+def aggregate_baseline(codebase: Codebase):
+    def aggregate_folder(path):
+        folder = codebase.tree[path]
+        for entry in folder.entries:
+            if entry.is_folder():
+                sub_folder = entry.name if path == "./" else f"{path}{entry.name}"
+                folder.profile = merge_profiles(folder.profile, aggregate_folder(sub_folder))
+            else:
+                folder.profile = merge_profiles(folder.profile, entry.profile())
+        return folder.profile
+
+    for folder in codebase.tree.values():
+        folder.profile = [0, 0, 0, 0]
+    aggregate_folder("./")
+
+
+@cli.command(help="Updating folder profiles after changing a few files in a large tree")
+def folders(files: Annotated[int, typer.Option(help="Number of files")] = 50000,
+            changed: Annotated[int, typer.Option(help="Number of changed files")] = 10):
+    codebase = Codebase("/")
+    for i in range(files):
+        path = f"a{i % 7}/b{i % 11}/c{i % 13}/d{i % 17}/file{i}.py"
+        codebase.add_file(SourceFileEntry(path, f"{i:032x}", "Python", i % 90,
+                                          [Measurement("f()", Location(1, 1), Location(2, 1), i % 90)]))
+    paths = list(codebase.files)[::files // changed][:changed]
+    info(f'{files:,} files in {len(codebase.tree):,} folders, {len(paths)} changed')
+
+    def change_files(value: int):
+        for path in paths:
+            entry = codebase.files[path]
+            measurements = [Measurement("f()", Location(1, 1), Location(2, 1), value)]
+            codebase.add_file(SourceFileEntry(path, entry.checksum(), "Python", value, measurements))
+
+    def full_aggregate():
+        change_files(45)
+        aggregate_baseline(codebase)
+
+    def incremental():
+        change_files(45)
+
+    baseline = measure('Change files + recursive aggregate', full_aggregate)
+    profiles = {k: v.profile for k, v in codebase.tree.items()}
+    optimized = measure('Change files incrementally', incremental)
+    assert profiles == {k: v.profile for k, v in codebase.tree.items()}
+    report_speedup(baseline, optimized)
+
+
+@cli.command(help="Rescanning an unchanged tree with and without folder digests")
+def digests(files: Annotated[int, typer.Option(help="Number of files")] = 3000):
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(files):
+            folder = Path(root, f"a{i % 7}", f"b{i % 11}", f"c{i % 13}")
+            folder.mkdir(parents=True, exist_ok=True)
+            folder.joinpath(f"file{i}.py").write_text(generate_python_code(5))
+        cached_report = Report(scan_path(Path(root)))
+        undigested_report = Report(scan_path(Path(root)))
+        for folder in undigested_report.codebase.tree.values():
+            folder.digest = None
+        info(f'{files:,} files in {len(cached_report.codebase.tree):,} folders')
+
+        baseline = measure('Rescan with per-file stat checks', lambda: scan_path(Path(root), undigested_report))
+        optimized = measure('Rescan with folder digests', lambda: scan_path(Path(root), cached_report))
+        assert list(scan_path(Path(root), cached_report).files) == list(cached_report.codebase.files)
+        report_speedup(baseline, optimized)
+
+
+if __name__ == '__main__':
+    cli()
@@ -1,16 +1,19 @@
+from itertools import product
 from textwrap import dedent
 
 import pytest
 
-from codelimit.common.gsm.Expression import expression_to_nfa, nfa_to_dfa
+from codelimit.common.gsm.Expression import expression_to_nfa, nfa_to_dfa, minimize_dfa, reachable_states
 from codelimit.common.gsm.automata.State import State
-from codelimit.common.gsm.matcher import match, nfa_match, find_all, starts_with
+from codelimit.common.gsm.matcher import match, nfa_match, find_all, starts_with, compile_expression
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.gsm.operator.Optional import Optional
 from codelimit.common.gsm.operator.Union import Union
 from codelimit.common.gsm.operator.ZeroOrMore import ZeroOrMore
 from codelimit.common.gsm.predicate.Predicate import Predicate
 from codelimit.common.gsm.utils import to_dot
+from codelimit.common.lexer_utils import lex
+from codelimit.languages import Languages
 
 
 def test_single_atom():
@@ -137,6 +140,63 @@ def test_nfa_to_dfa():
     assert dfa is not None
 
 
+def test_minimize_dfa():
+    expr = [Union(["a", OneOrMore("b")], ["c", OneOrMore("b")])]
+    dfa = nfa_to_dfa(expression_to_nfa(expr))
+    minimized = minimize_dfa(dfa)
+
+    assert len(reachable_states(minimized)) < len(reachable_states(dfa))
+    for length in range(5):
+        for text in product("abc", repeat=length):
+            assert bool(match(dfa, list(text))) == bool(match(minimized, list(text)))
+
+
+LANGUAGE_SAMPLES = {
+    "foo.c": "int foo(int a) {\n  return bar(a);\n}\nvoid (*baz)(int);\n",
+    "foo.cpp": "int Foo::bar(std::string s) const {\n  return baz(s);\n}\n",
+    "Foo.cs": "class Foo {\n  public void Bar(int a) {\n    Baz(a);\n  }\n}\n",
+    "Foo.java": "class Foo {\n  void bar() throws IOException {\n    baz();\n  }\n  Foo(int a) { }\n}\n",
+    "foo.js": "function foo(a) {\n  bar();\n}\nconst baz = async (b) => {\n  qux(b);\n}\n",
+    "foo.py": "def foo(a, b=(1, 2)):\n    bar(a)\n\ndef baz(): pass\n",
+    "foo.ts": "function foo(a: number): number {\n  return bar(a);\n}\nconst baz = (b) => {\n  qux();\n}\n",
+}
+
+
+def test_language_samples_cover_all_languages():
+    languages = {Languages.lexer_index.get_lexer(filename).name for filename in LANGUAGE_SAMPLES}
+
+    assert languages == set(Languages.by_name.keys())
+
+
+@pytest.mark.parametrize("filename", LANGUAGE_SAMPLES.keys())
+def test_minimized_language_expressions(filename):
+    lexer = Languages.lexer_index.get_lexer(filename)
+    language = Languages.by_name[lexer.name]
+    tokens = lex(lexer, LANGUAGE_SAMPLES[filename], False)
+    headers = [
+        getattr(language, attr)
+        for attr in ("header", "function_header", "arrow_function_header")
+        if hasattr(language, attr)
+    ]
+    assert headers
+    for header in headers:
+        for expression in (header.expression, header.followed_by):
+            if expression is None:
+                continue
+            dfa = nfa_to_dfa(expression_to_nfa(expression))
+            minimized = minimize_dfa(dfa)
+
+            assert len(reachable_states(minimized)) <= len(reachable_states(dfa))
+            expected = [(p.start, p.end) for p in find_all(dfa, tokens)]
+            assert [(p.start, p.end) for p in find_all(minimized, tokens)] == expected
+            for i in range(len(tokens)):
+                expected_match = starts_with(dfa, tokens, i)
+                actual_match = starts_with(minimized, tokens, i)
+                assert (expected_match is None) == (actual_match is None)
+                if expected_match:
+                    assert expected_match.end == actual_match.end
+
+
 def test_find_all():
     expr = [OneOrMore("a")]
     text = ["a", "a", "b", "b", "a", "b", "b"]
@@ -150,6 +210,21 @@ def test_find_all():
     assert matches[1].end == 5
 
 
+def test_compiled_expression():
+    dfa = compile_expression([OneOrMore("a")])
+    text = ["a", "a", "b", "b", "a", "b", "b"]
+
+    assert compile_expression(dfa) is dfa
+    assert match(dfa, ["a", "a"])
+    assert starts_with(dfa, text).end == 1
+
+    for _ in range(2):
+        matches = find_all(dfa, text)
+
+        assert len(matches) == 2
+        assert matches[1].start == 4
+
+
 def test_single_item():
     expr = ["a"]
     text = ["a", "a", "b", "a"]
@@ -194,6 +269,14 @@ def test_predicate():
     assert len(matches) == 2
 
 
+def test_item_classes():
+    dfa = compile_expression(["a", OneOrMore("b")])
+
+    assert dfa.classify("x") == dfa.classify("y")
+    assert len({dfa.classify("a"), dfa.classify("b"), dfa.classify("x")}) == 3
+    assert compile_expression([CharacterRange("a", "c")]).classify("a") is None
+
+
 def test_starts_with():
     expr = [ZeroOrMore("a"), "b"]
     text = ["a", "a", "b", "b", "a", "b", "b"]
@@ -204,6 +287,14 @@ def test_starts_with():
     assert pattern.start == 0
     assert pattern.end == 3
 
+    pattern = starts_with(expr, text, 4)
+
+    assert pattern is not None
+    assert pattern.start == 4
+    assert pattern.end == 6
+    assert pattern.tokens == ["a", "b"]
+    assert starts_with(expr, text, 7) is None
+
     text = ["a", "a", "b"]
 
     pattern = starts_with(expr, text)
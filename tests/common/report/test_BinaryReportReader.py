@@ -0,0 +1,119 @@
+import pytest
+
+from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
+from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.BinaryReportReader import BinaryReportReader
+from codelimit.common.report.BinaryReportWriter import BinaryReportWriter
+from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportReader import ReportReader
+from codelimit.common.report.ReportWriter import ReportWriter
+
+
+def _make_report() -> Report:
+    codebase = Codebase("/")
+    codebase.add_file(
+        SourceFileEntry(
+            "foo.py",
+            "abcd1234",
+            "Python",
+            20,
+            [
+                Measurement("spam()", Location(10, 1), Location(30, 1), 20),
+                Measurement("éggs()", Location(40, 5), Location(80, 1), 40),
+            ],
+            FileStat(120, 1700000000000000000, 42),
+        )
+    )
+    codebase.add_file(
+        SourceFileEntry(
+            "bar/baz.ts",
+            "efgh5678",
+            "TypeScript",
+            10,
+            [Measurement("spam()", Location(1, 1), Location(10, 1), 10)],
+        )
+    )
+    codebase.aggregate()
+    return Report(codebase, GithubRepository("getcodelimit", "codelimit", "main"))
+
+
+def test_round_trip():
+    report = _make_report()
+
+    result = BinaryReportReader.from_bytes(BinaryReportWriter(report).to_bytes())
+
+    assert result.version == report.version
+    assert result.uuid == report.uuid
+    assert result.timestamp == report.timestamp
+    assert result.repository == report.repository
+    assert result.codebase.root == "/"
+    assert list(result.codebase.files) == ["foo.py", "bar/baz.ts"]
+    foo = result.codebase.files["foo.py"]
+    assert foo.checksum() == "abcd1234"
+    assert foo.stat() == FileStat(120, 1700000000000000000, 42)
+    assert foo.profile() == [0, 20, 40, 0]
+    assert foo.measurements() == report.codebase.files["foo.py"].measurements()
+    assert result.codebase.files["bar/baz.ts"].stat() is None
+    assert result.codebase.totals["TypeScript"].loc == 10
+    assert result.codebase.totals["Python"].hard_to_maintain == 1
+    assert [e.name for e in result.codebase.tree["./"].entries] == ["foo.py", "bar/"]
+    assert result.codebase.tree["bar/"].entries[0] is result.codebase.files["bar/baz.ts"]
+    assert result.codebase.tree["./"].profile == [10, 20, 40, 0]
+
+
+def test_convert_both_ways():
+    report = _make_report()
+    json = ReportWriter(report).to_json()
+
+    binary = BinaryReportWriter(ReportReader.from_json(json)).to_bytes()
+
+    assert BinaryReportReader.is_binary_report(binary)
+    assert ReportWriter(BinaryReportReader.from_bytes(binary)).to_json() == json
+
+
+def test_findings_index():
+    report = _make_report()
+
+    result = BinaryReportReader.from_bytes(BinaryReportWriter(report).to_bytes())
+
+    assert result.findings_index is not None
+    assert len(result.findings_index) == 1
+    assert result.findings_index[0].file == "foo.py"
+    assert result.findings_index[-1].measurement.unit_name == "éggs()"
+    assert result.top_report_units(10) == report.top_report_units(10)
+    assert result.count_report_units() == report.count_report_units()
+
+
+def test_empty_report():
+    report = Report(Codebase("/"))
+
+    result = BinaryReportReader.from_bytes(BinaryReportWriter(report).to_bytes())
+
+    assert len(result.codebase.files) == 0
+    assert len(result.codebase.tree["./"].entries) == 0
+    assert result.repository is None
+
+
+def test_invalid_data():
+    data = BinaryReportWriter(_make_report()).to_bytes()
+
+    assert BinaryReportReader.get_report_version(data) == Report.VERSION
+    assert not BinaryReportReader.is_binary_report(b"{}")
+    with pytest.raises(ValueError):
+        BinaryReportReader.from_bytes(b"{}")
+    with pytest.raises(ValueError):
+        BinaryReportReader.from_bytes(data[:-1])
+
+
+def test_folder_digest():
+    report = _make_report()
+    report.codebase.tree["bar/"].digest = "0123abcd"
+
+    result = BinaryReportReader.from_bytes(BinaryReportWriter(report).to_bytes())
+
+    assert result.codebase.tree["bar/"].digest == "0123abcd"
+    assert result.codebase.tree["./"].digest is None
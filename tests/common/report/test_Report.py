@@ -3,6 +3,7 @@ from codelimit.common.Location import Location
 from codelimit.common.Measurement import Measurement
 from codelimit.common.SourceFileEntry import SourceFileEntry
 from codelimit.common.report.Report import Report
+from codelimit.common.utils import make_profile
 
 
 def test_empty_measurements_collection():
@@ -40,3 +41,91 @@ def test_all_units():
     report = Report(codebase)
 
     assert len(report.all_report_units_sorted_by_length_asc()) == 1
+
+
+def test_units_above_threshold():
+    codebase = Codebase("/")
+    codebase.add_file(
+        SourceFileEntry(
+            "foo.py",
+            "abcd1234",
+            "Python",
+            100,
+            [
+                Measurement("spam()", Location(10, 1), Location(30, 1), 20),
+                Measurement("eggs()", Location(40, 1), Location(80, 1), 40),
+            ],
+        )
+    )
+    codebase.add_file(
+        SourceFileEntry(
+            "bar.py",
+            "efgh5678",
+            "Python",
+            100,
+            [
+                Measurement("ham()", Location(10, 1), Location(30, 1), 25),
+                Measurement("baz()", Location(40, 1), Location(110, 1), 70),
+            ],
+        )
+    )
+    report = Report(codebase)
+
+    units = report.all_report_units_sorted_by_length_asc(30)
+
+    assert [(u.file, u.measurement.unit_name) for u in units] == [("bar.py", "baz()"), ("foo.py", "eggs()")]
+    assert [u.measurement.value for u in report.all_report_units_sorted_by_length_asc(16)] == [70, 40, 25, 20]
+    assert report.quality_profile() == [0, 45, 40, 70]
+
+
+def test_top_units():
+    codebase = Codebase("/")
+    for i in range(3):
+        codebase.add_file(
+            SourceFileEntry(
+                f"foo{i}.py",
+                "abcd1234",
+                "Python",
+                100,
+                [
+                    Measurement("spam()", Location(10, 1), Location(30, 1), 20),
+                    Measurement("eggs()", Location(40, 1), Location(80, 1), 40 + i % 2 * 30),
+                    Measurement("ham()", Location(90, 1), Location(130, 1), 40),
+                ],
+            )
+        )
+    report = Report(codebase)
+
+    units = report.top_report_units(3)
+
+    assert [(u.file, u.measurement.unit_name) for u in units] == [
+        ("foo1.py", "eggs()"), ("foo0.py", "eggs()"), ("foo0.py", "ham()")
+    ]
+    assert report.top_report_units() == report.all_report_units_sorted_by_length_asc(30)
+    assert report.count_report_units() == 6
+
+
+def test_statistics():
+    codebase = Codebase("/")
+    values = [(i * 37) % 90 + 1 for i in range(200)]
+    for i in range(0, len(values), 7):
+        codebase.add_file(
+            SourceFileEntry(
+                f"foo{i}.py",
+                "abcd1234",
+                "Python",
+                100,
+                [Measurement(f"f{v}()", Location(1, 1), Location(v, 1), v) for v in values[i:i + 7]],
+            )
+        )
+    report = Report(codebase)
+
+    sorted_values = sorted(values, reverse=True)
+    smallest_units_loc = 0
+    for expected in sorted_values:
+        smallest_units_loc += expected
+        if smallest_units_loc > sum(values) * 9 // 10:
+            break
+    assert report.ninetieth_percentile() == expected
+    assert report.get_average() == -(-sum(values) // len(values))
+    assert report.quality_profile() == make_profile(codebase.all_measurements())
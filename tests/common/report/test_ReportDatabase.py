@@ -0,0 +1,125 @@
+import os
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
+from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.Scanner import scan_path
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportDatabase import ReportDatabase
+from codelimit.common.report.ReportReader import ReportReader
+from codelimit.common.report.ReportWriter import ReportWriter
+
+
+def _make_report() -> Report:
+    codebase = Codebase("/")
+    codebase.add_file(
+        SourceFileEntry(
+            "foo.py",
+            "abcd1234",
+            "Python",
+            20,
+            [
+                Measurement("foo", Location(1, 1), Location(10, 1), 10),
+                Measurement("bar", Location(11, 1), Location(20, 1), 10),
+            ],
+            FileStat(120, 1700000000000000000, 42),
+        )
+    )
+    codebase.add_file(SourceFileEntry("sub/bar.py", "efgh5678", "Python", 0, []))
+    codebase.aggregate()
+    return Report(codebase, GithubRepository("getcodelimit", "codelimit", "main"))
+
+
+def test_update_and_get():
+    tmp_root = tempfile.TemporaryDirectory()
+    with closing(ReportDatabase(Path(tmp_root.name, "codelimit.db"))) as database:
+        assert database.update(_make_report()) == 2
+
+        entry = database.get("foo.py")
+
+        assert entry is not None
+        assert entry.checksum() == "abcd1234"
+        assert entry.stat() == FileStat(120, 1700000000000000000, 42)
+        assert [m.unit_name for m in entry.measurements()] == ["foo", "bar"]
+        assert database.get("sub/bar.py").stat() is None
+        assert database.get("spam.py") is None
+        assert sorted(database.files()) == ["foo.py", "sub/bar.py"]
+
+
+def test_update_only_changed_files():
+    tmp_root = tempfile.TemporaryDirectory()
+    with closing(ReportDatabase(Path(tmp_root.name, "codelimit.db"))) as database:
+        database.update(_make_report())
+
+        assert database.update(_make_report()) == 0
+
+        report = _make_report()
+        del report.codebase.files["sub/bar.py"]
+        report.codebase.add_file(SourceFileEntry("foo.py", "changed", "Python", 10, []))
+
+        assert database.update(report) == 2
+        assert database.get("foo.py").measurements() == []
+        assert len(database.files()) == 1
+
+
+def test_export_json():
+    tmp_root = tempfile.TemporaryDirectory()
+    report = _make_report()
+    with closing(ReportDatabase(Path(tmp_root.name, "codelimit.db"))) as database:
+        database.update(report)
+    with closing(ReportDatabase(Path(tmp_root.name, "codelimit.db"), read_only=True)) as database:
+        result = database.to_report()
+
+    assert result is not None
+    assert ReportWriter(result).to_json() == ReportWriter(report).to_json()
+    assert ReportReader.from_json(ReportWriter(result).to_json()).repository == report.repository
+
+
+def test_export_orders_files_by_path():
+    tmp_root = tempfile.TemporaryDirectory()
+    report = _make_report()
+    report.codebase.add_file(SourceFileEntry("bar.py", "ijkl9012", "Python", 0, []))
+    with closing(ReportDatabase(Path(tmp_root.name, "codelimit.db"))) as database:
+        database.update(report)
+        report.codebase.add_file(SourceFileEntry("foo.py", "changed", "Python", 0, []))
+        database.update(report)
+
+        result = database.to_report()
+
+    assert result is not None
+    assert result.codebase.all_files() == ["bar.py", "foo.py", "sub/bar.py"]
+
+
+def test_read_only_does_not_reset_outdated_database():
+    tmp_root = tempfile.TemporaryDirectory()
+    database_path = Path(tmp_root.name, "codelimit.db")
+    with closing(ReportDatabase(database_path)) as database:
+        database.update(_make_report())
+        with database.connection:
+            database.connection.execute("UPDATE meta SET value = 'outdated' WHERE key = 'version'")
+
+    with closing(ReportDatabase(database_path, read_only=True)) as database:
+        assert database.to_report() is None
+        assert len(database.files()) == 2
+
+    with closing(ReportDatabase(database_path)) as database:
+        assert len(database.files()) == 0
+
+
+def test_scan_with_cached_files():
+    tmp_root = tempfile.TemporaryDirectory()
+    with open(os.path.join(tmp_root.name, "foo.py"), "w") as pythonFile:
+        pythonFile.write('def foo():\n  return "Hello world"\n')
+    with closing(ReportDatabase(Path(tmp_root.name, "codelimit.db"))) as database:
+        database.update(Report(scan_path(Path(tmp_root.name))))
+        database.connection.execute("UPDATE measurements SET unit_name = 'cached'")
+
+        result = scan_path(Path(tmp_root.name), cached_files=database.files())
+
+    assert result.files["foo.py"].measurements()[0].unit_name == "cached"
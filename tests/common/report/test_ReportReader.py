@@ -1,10 +1,14 @@
+from json import JSONDecoder
+
 from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
 from codelimit.common.GithubRepository import GithubRepository
 from codelimit.common.Location import Location
 from codelimit.common.Measurement import Measurement
 from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.LazySourceFileEntry import LazySourceFileEntry
 from codelimit.common.report.Report import Report
-from codelimit.common.report.ReportReader import ReportReader
+from codelimit.common.report.ReportReader import ReportReader, _skip_value
 from codelimit.common.report.ReportWriter import ReportWriter
 
 
@@ -279,3 +283,120 @@ def test_multiple_files_and_folders():
 
     assert bar_measurements[1].start.line == 20
     assert bar_measurements[1].value == 30
+
+
+def test_file_stat():
+    codebase = Codebase("/")
+    codebase.add_file(SourceFileEntry("foo.py", "abcd1234", "Python", 20, []))
+    codebase.add_file(
+        SourceFileEntry("bar.py", "efgh5678", "Python", 20, [], FileStat(120, 1700000000000000000, 42))
+    )
+    report = Report(codebase)
+
+    json = ReportWriter(report).to_json()
+    result = ReportReader.from_json(json)
+
+    assert result.codebase.files["foo.py"].stat() is None
+    assert result.codebase.files["bar.py"].stat() == FileStat(120, 1700000000000000000, 42)
+
+
+class RecordingDecoder(JSONDecoder):
+    def __init__(self):
+        super().__init__()
+        self.values: list = []
+
+    def raw_decode(self, s, idx=0):
+        value, end = super().raw_decode(s, idx)
+        self.values.append(value)
+        return value, end
+
+    def measurements_decoded(self) -> int:
+        return sum(isinstance(v, list) and any(isinstance(m, dict) and "unit_name" in m for m in v) for v in self.values)
+
+
+def test_measurements_are_loaded_on_access(monkeypatch):
+    decoder = RecordingDecoder()
+    monkeypatch.setattr("codelimit.common.report.ReportReader._decoder", decoder)
+    codebase = Codebase("/")
+    codebase.add_file(
+        SourceFileEntry(
+            "foo.py",
+            "abcd1234",
+            "Python",
+            20,
+            [
+                Measurement("bar(x[0])", Location(10, 1), Location(30, 1), 20),
+                Measurement("baz()", Location(40, 1), Location(80, 1), 40),
+            ],
+        )
+    )
+    codebase.aggregate()
+    report = Report(codebase)
+
+    result = ReportReader.from_json(ReportWriter(report).to_json())
+
+    assert decoder.measurements_decoded() == 0
+    entry = result.codebase.files["foo.py"]
+    assert isinstance(entry, LazySourceFileEntry)
+    assert entry.profile() == [0, 20, 40, 0]
+    assert result.codebase.tree["./"].entries[0] is entry
+    assert result.codebase.totals["Python"].hard_to_maintain == 1
+    assert entry.measurements() == codebase.files["foo.py"].measurements()
+    assert entry.measurements() is entry.measurements()
+    assert decoder.measurements_decoded() == 1
+
+
+def test_skip_value():
+    text = '{"a": [{"b": "[\\"]"}, [1, {"c": "}"}]], "d": null}'
+
+    assert text[_skip_value(text, 6):] == ', "d": null}'
+    assert text[_skip_value(text, 0):] == ""
+    assert text[_skip_value(text, text.index("null")):] == "}"
+
+
+def test_from_json_without_totals():
+    json = ""
+    json += "{"
+    json += f'  "version": "{Report.VERSION}",'
+    json += '  "uuid": "abcdefgh",'
+    json += '  "root": "/tmp",'
+    json += '  "codebase": {'
+    json += '    "files": {'
+    json += '      "bar/foo.py": {'
+    json += '        "checksum": "abcd1234",'
+    json += '        "language": "Python",'
+    json += '        "loc": 20,'
+    json += '        "measurements": ['
+    json += '          {"unit_name": "spam()", "start": {"line": 1, "column": 1}, '
+    json += '"end": {"line": 20, "column": 1}, "value": 20}'
+    json += "        ]"
+    json += "      }"
+    json += "    }"
+    json += "  }"
+    json += "}"
+
+    result = ReportReader.from_json(json)
+
+    assert result.codebase.totals["Python"].functions == 1
+    assert result.codebase.tree["./"].profile == [0, 20, 0, 0]
+    assert result.codebase.tree["bar/"].entries[0].name == "foo.py"
+
+
+def test_version_not_first():
+    json = '{"uuid": "abcdefgh", "version": "1.2.3", "root": "/", "codebase": {}}'
+
+    assert ReportReader.get_report_version(json) == "1.2.3"
+
+
+def test_folder_digest():
+    codebase = Codebase("/")
+    codebase.add_file(SourceFileEntry("foo.py", "abcd1234", "Python", 20, []))
+    codebase.add_file(SourceFileEntry("bar/spam.py", "efgh5678", "Python", 20, []))
+    codebase.tree["./"].digest = "0123abcd"
+    report = Report(codebase)
+
+    json = ReportWriter(report).to_json()
+    result = ReportReader.from_json(json)
+
+    assert result.codebase.tree["./"].digest == "0123abcd"
+    assert result.codebase.tree["bar/"].digest is None
@@ -1,7 +1,17 @@
+import json
+from io import StringIO
+
+import requests  # type: ignore
+
 from codelimit.common.Codebase import Codebase
 from codelimit.common.GithubRepository import GithubRepository
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.SourceFileEntry import SourceFileEntry
 from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportReader import ReportReader
 from codelimit.common.report.ReportWriter import ReportWriter
+from codelimit.utils import api_post_report
 
 
 def test_to_json():
@@ -66,3 +76,36 @@ def test_to_json_with_repository():
     json += "}\n"
 
     assert writer.to_json() == json
+
+
+def test_write_streams_same_json():
+    codebase = Codebase("/")
+    codebase.add_file(SourceFileEntry("foo/bar.py", "abcd1234", "Python", 10, [
+        Measurement("bar", Location(1, 1), Location(10, 1), 10)
+    ]))
+    codebase.aggregate()
+    report = Report(codebase, GithubRepository("getcodelimit", "codelimit", "main"))
+
+    for pretty_print in [True, False]:
+        output = StringIO()
+        ReportWriter(report, pretty_print).write(output)
+
+        assert output.getvalue() == ReportWriter(report, pretty_print).to_json()
+        assert ReportReader.from_json(output.getvalue()).codebase.files["foo/bar.py"].loc == 10
+
+
+def test_upload_streams_report(monkeypatch):
+    report = Report(Codebase("/"))
+    posted = {}
+
+    def post(url, data, headers):
+        posted["body"] = data.read().decode()
+        return None
+
+    monkeypatch.setattr(requests, "post", post)
+    api_post_report(report, "main", "getcodelimit/codelimit", "https://example.com", "token")
+
+    body = json.loads(posted["body"])
+    assert body["repository"] == "getcodelimit/codelimit"
+    assert body["branch"] == "main"
+    assert body["report"]["uuid"] == report.uuid
@@ -0,0 +1,61 @@
+from pygments.lexers import PythonLexer
+
+from codelimit.common.TokenRange import TokenRange
+from codelimit.common.lexer_utils import lex
+from codelimit.common.scope.BlockIndex import BlockIndex
+from codelimit.languages.Python import Python
+
+
+def test_nearest_block():
+    blocks = [TokenRange(0, 20), TokenRange(5, 10), TokenRange(12, 18)]
+    block_index = BlockIndex(blocks)
+
+    assert block_index.nearest_block(TokenRange(2, 4)) == 1
+    assert block_index.nearest_block(TokenRange(10, 11)) == 2
+    assert block_index.nearest_block(TokenRange(13, 14)) == 2
+    assert block_index.nearest_block(TokenRange(19, 20)) is None
+    assert block_index.nearest_block(TokenRange(25, 26)) is None
+
+
+def test_nearest_block_contains_header():
+    blocks = [TokenRange(0, 20), TokenRange(2, 4)]
+    block_index = BlockIndex(blocks)
+
+    assert block_index.nearest_block(TokenRange(10, 11)) is None
+
+    block_index.remove([1])
+
+    assert block_index.nearest_block(TokenRange(10, 11)) == 0
+
+
+def test_scope_blocks():
+    blocks = [TokenRange(3, 20), TokenRange(5, 10), TokenRange(12, 18), TokenRange(25, 30)]
+    block_index = BlockIndex(blocks)
+
+    assert block_index.scope_blocks(TokenRange(11, 12)) == [2]
+
+    block_index.remove([2])
+
+    assert block_index.scope_blocks(TokenRange(0, 2)) == [0, 1]
+
+    block_index.remove([0, 1])
+
+    assert block_index.scope_blocks(TokenRange(0, 2)) == [3]
+    assert block_index.scope_blocks(TokenRange(31, 32)) == []
+
+
+def test_scope_blocks_of_python_functions():
+    code = ""
+    code += "def foo():\n"
+    code += "  pass\n"
+    code += "\n"
+    code += "def bar():\n"
+    code += "  foo()\n"
+
+    tokens = lex(PythonLexer(), code)
+    extractor = Python()
+    headers = extractor.extract_headers(tokens)
+    block_index = BlockIndex(extractor.extract_blocks(tokens, headers))
+
+    assert block_index.scope_blocks(headers[0].token_range) == [0]
+    assert block_index.scope_blocks(headers[1].token_range) == [1]
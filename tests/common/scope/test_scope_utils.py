@@ -1,31 +1,21 @@
+from typing import Sequence, overload
+
 from pygments.lexers import JavascriptLexer
 from pygments.lexers import PythonLexer
 
+from codelimit.common.Location import Location
+from codelimit.common.Token import Token
 from codelimit.common.TokenRange import TokenRange
 from codelimit.common.lexer_utils import lex
 from codelimit.common.scope.Header import Header
 from codelimit.common.scope.Scope import Scope
-from codelimit.common.scope.scope_utils import _find_scope_blocks_indices, fold_scopes, count_lines
+from codelimit.common.scope.scope_utils import fold_scopes, count_lines, get_headers, \
+    count_scopes_lines, unfold_scopes, build_scopes
+from codelimit.common.source_utils import filter_tokens
+from codelimit.languages import Languages
 from codelimit.languages.Python import Python
 
 
-def test_find_scope_blocks_indices():
-    code = ""
-    code += "def foo():\n"
-    code += "  pass\n"
-    code += "\n"
-    code += "def bar():\n"
-    code += "  foo()\n"
-
-    tokens = lex(PythonLexer(), code)
-    extractor = Python()
-    headers = extractor.extract_headers(tokens)
-    blocks = extractor.extract_blocks(tokens, headers)
-
-    assert _find_scope_blocks_indices(headers[0].token_range, blocks) == [0]
-    assert _find_scope_blocks_indices(headers[1].token_range, blocks) == [1]
-
-
 def test_fold_scopes():
     code = ""
     code += "function foo() {\n"
@@ -54,3 +44,64 @@ def test_fold_scopes():
     assert count_lines(result[0], tokens) == 3
     assert count_lines(result[0].children[0], tokens) == 2
     assert count_lines(result[1], tokens) == 2
+    assert count_scopes_lines(unfold_scopes(result), tokens) == [3, 2, 2]
+
+
+def test_count_scopes_lines_child_on_shared_lines():
+    code = ""
+    code += "function foo() {\n"
+    code += "  bar(function baz() { qux(); }, 1);\n"
+    code += "  return 1; }\n"
+    tokens = lex(JavascriptLexer(), code, False)
+    code_tokens = filter_tokens(tokens)
+
+    scopes = unfold_scopes(build_scopes(tokens, Languages.JavaScript))
+
+    assert [s.header.name() for s in scopes] == ["foo", "baz"]
+    assert count_scopes_lines(scopes, code_tokens) == [3, 1]
+
+
+def _c_function_tokens(functions: int) -> list[Token]:
+    template = lex(Languages.lexer_index.get_lexer("foo.c"), "int foo(int a) {\n  return bar(a);\n}\n", False)
+    lines = template[-1].location.line
+    return [
+        Token(Location(t.location.line + i * lines, t.location.column), t.token_type, t.value)
+        for i in range(functions)
+        for t in template
+    ]
+
+
+class _CountingSequence(Sequence[Token]):
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.reads = 0
+
+    @overload
+    def __getitem__(self, index: int) -> Token:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        result = self.tokens[index]
+        self.reads += len(result) if isinstance(result, list) else 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+def _count_token_reads(functions: int) -> int:
+    tokens = _CountingSequence(_c_function_tokens(functions))
+    headers = get_headers(tokens, Languages.C.header)
+    assert len(headers) == functions
+    return tokens.reads
+
+
+def test_get_headers_reads_tokens_linearly():
+    small = _count_token_reads(200)
+    large = _count_token_reads(2000)
+
+    assert large <= small * 10
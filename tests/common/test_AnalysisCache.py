@@ -0,0 +1,113 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from codelimit.common.AnalysisCache import AnalysisCache
+from codelimit.common.Configuration import Configuration
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.Scanner import scan_path
+from codelimit.common.utils import calculate_checksum
+
+
+def test_put_and_get():
+    tmp_root = tempfile.TemporaryDirectory()
+    cache = AnalysisCache(Path(tmp_root.name))
+    measurements = [Measurement("foo", Location(1, 1), Location(2, 20), 2)]
+
+    assert cache.get("abcd1234", "Python") is None
+
+    cache.put("abcd1234", "Python", measurements)
+
+    assert cache.get("abcd1234", "Python") == measurements
+    assert cache.get("abcd1234", "JavaScript") is None
+    assert cache.stats().entries == 1
+
+
+def test_prune_least_recently_used():
+    tmp_root = tempfile.TemporaryDirectory()
+    cache = AnalysisCache(Path(tmp_root.name))
+    measurements = [Measurement("foo", Location(1, 1), Location(2, 20), 2)]
+    for checksum in ["a", "b", "c"]:
+        cache.put(checksum, "Python", measurements)
+    for index, checksum in enumerate(["b", "a", "c"]):
+        path = cache._entry_path(checksum, "Python")
+        os.utime(path, ns=(index * 10**9, index * 10**9))
+    entry_size = cache.stats().size // 3
+
+    removed = cache.prune(entry_size * 2)
+
+    assert removed.entries == 1
+    assert cache.get("b", "Python") is None
+    assert cache.get("a", "Python") == measurements
+    assert cache.stats().entries == 2
+
+
+def test_update_size_without_walking_entries(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    cache = AnalysisCache(Path(tmp_root.name))
+    measurements = [Measurement("foo", Location(1, 1), Location(2, 20), 2)]
+    cache.put("a", "Python", measurements)
+    cache.misses.append(("a", "Python"))
+    cache.update_size()
+    monkeypatch.setattr(cache, "_entries", lambda: pytest.fail("walked the cache"))
+
+    cache.put("b", "Python", measurements)
+    cache.misses.append(("b", "Python"))
+
+    assert cache.update_size() is None
+    assert cache.misses == []
+    monkeypatch.undo()
+    assert cache._read_size() == cache.stats().size
+
+
+def test_update_size_prunes_over_limit():
+    tmp_root = tempfile.TemporaryDirectory()
+    cache = AnalysisCache(Path(tmp_root.name))
+    measurements = [Measurement("foo", Location(1, 1), Location(2, 20), 2)]
+    for checksum in ["a", "b", "c", "d", "e"]:
+        cache.put(checksum, "Python", measurements)
+    entry_size = cache.stats().size // 5
+    cache.max_size = entry_size * 4
+    cache.put("f", "Python", measurements)
+    cache.misses.append(("f", "Python"))
+
+    removed = cache.update_size()
+
+    assert removed is not None
+    assert removed.entries == 3
+    assert cache.stats().entries == 3
+
+
+def test_scan_reuses_global_cache(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    cache_root = tempfile.TemporaryDirectory()
+    file_path = os.path.join(tmp_root.name, "foo.py")
+    with open(file_path, "w") as pythonFile:
+        pythonFile.write('def foo():\n  return "Hello world"\n')
+    cache = AnalysisCache(Path(cache_root.name))
+    measurements = [Measurement("cached", Location(1, 1), Location(2, 23), 7)]
+    cache.put(calculate_checksum(file_path), "Python", measurements)
+    monkeypatch.setattr(Configuration, "cache_dir", Path(cache_root.name))
+
+    result = scan_path(Path(tmp_root.name))
+
+    assert result.files["foo.py"].measurements() == measurements
+    assert result.files["foo.py"].loc == 7
+
+
+def test_scan_populates_global_cache(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    cache_root = tempfile.TemporaryDirectory()
+    file_path = os.path.join(tmp_root.name, "foo.py")
+    with open(file_path, "w") as pythonFile:
+        pythonFile.write('def foo():\n  return "Hello world"\n')
+    monkeypatch.setattr(Configuration, "cache_dir", Path(cache_root.name))
+
+    result = scan_path(Path(tmp_root.name))
+
+    cached = AnalysisCache(Path(cache_root.name)).get(calculate_checksum(file_path), "Python")
+    assert cached == result.files["foo.py"].measurements()
+    assert len(cached) == 1
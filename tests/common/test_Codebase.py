@@ -1,4 +1,5 @@
 from codelimit.common.Codebase import Codebase
+from codelimit.common.FileStat import FileStat
 from codelimit.common.Location import Location
 from codelimit.common.Measurement import Measurement
 from codelimit.common.SourceFileEntry import SourceFileEntry
@@ -51,6 +52,24 @@ def test_codebase_entry_single_folder_single_file():
     )
 
 
+def test_codebase_entry_with_file_stat():
+    codebase = Codebase("/")
+    codebase.add_file(SourceFileEntry("foo.py", "abcd1234", "Python", 20, [], FileStat(120, 1000, 42)))
+    report = Report(codebase)
+    writer = ReportWriter(report, False)
+
+    assert (
+            writer.to_json()
+            == f'{{"version": "{report.version}", "uuid": "{report.uuid}", '
+               f'"timestamp": "{report.timestamp}", '
+               '"root": "/", "codebase": {"totals": {"Python": {"files": 1, "lines_of_code": '
+               '20, "functions": 0, "hard_to_maintain": 0, "unmaintainable": 0}}, "tree": '
+               '{"./": {"entries": ["foo.py"], "profile": [0, 0, 0, 0]}}, "files": '
+               '{"foo.py": {"checksum": "abcd1234", "stat": {"size": 120, "mtime_ns": 1000, "inode": 42}, '
+               '"language": "Python", "loc": 20, "profile": [0, 0, 0, 0], "measurements": []}}}}'
+    )
+
+
 def test_codebase_multiple_files():
     codebase = Codebase("/")
     codebase.add_file(SourceFileEntry("foo.py", "abcd1234", "Python", 20, []))
@@ -107,3 +126,71 @@ def test_codebase_aggregate():
     codebase.aggregate()
 
     assert codebase.tree["foo/spam/"].profile == [0, 20, 0, 0]
+
+
+def test_codebase_profiles_without_aggregate():
+    codebase = Codebase("/")
+    codebase.add_file(
+        SourceFileEntry(
+            "foo/bar.py", "abcd1234", "Python", 20, [Measurement("bar()", Location(1, 1), Location(10, 1), 10)]
+        )
+    )
+    codebase.add_file(
+        SourceFileEntry(
+            "foo/spam/bar.py", "efgh5678", "Python", 20, [Measurement("spam()", Location(1, 1), Location(10, 1), 40)]
+        )
+    )
+
+    assert codebase.tree["foo/spam/"].profile == [0, 0, 40, 0]
+    assert codebase.tree["foo/"].profile == [10, 0, 40, 0]
+    assert codebase.tree["./"].profile == [10, 0, 40, 0]
+
+    codebase.aggregate()
+    codebase.aggregate()
+
+    assert codebase.tree["foo/"].profile == [10, 0, 40, 0]
+
+
+def test_codebase_remove_file():
+    def make_entries() -> list[SourceFileEntry]:
+        return [
+            SourceFileEntry("foo.py", "abcd1234", "Python", 20,
+                            [Measurement("foo()", Location(1, 1), Location(10, 1), 20)]),
+            SourceFileEntry("bar/spam/eggs.ts", "efgh5678", "TypeScript", 40,
+                            [Measurement("eggs()", Location(1, 1), Location(10, 1), 40)]),
+            SourceFileEntry("bar/ham.py", "ijkl9012", "Python", 70,
+                            [Measurement("ham()", Location(1, 1), Location(10, 1), 70)]),
+        ]
+
+    codebase = Codebase("/")
+    for entry in make_entries():
+        codebase.add_file(entry)
+    expected = Codebase("/")
+    for entry in make_entries()[::2]:
+        expected.add_file(entry)
+
+    removed = codebase.remove_file("bar/spam/eggs.ts")
+
+    assert removed.language == "TypeScript"
+    report = Report(codebase)
+    expected_report = Report(expected)
+    expected_report.uuid = report.uuid
+    expected_report.timestamp = report.timestamp
+    assert ReportWriter(report).to_json() == ReportWriter(expected_report).to_json()
+    assert "bar/spam/" not in codebase.tree
+    assert report.quality_profile() == [0, 20, 0, 70]
+
+
+def test_codebase_replace_file():
+    codebase = Codebase("/")
+    codebase.add_file(SourceFileEntry("foo/bar.py", "abcd1234", "Python", 20, []))
+    codebase.add_file(
+        SourceFileEntry(
+            "foo/bar.py", "efgh5678", "Python", 40, [Measurement("bar()", Location(1, 1), Location(10, 1), 40)]
+        )
+    )
+
+    assert len(codebase.tree["foo/"].entries) == 1
+    assert codebase.tree["./"].profile == [0, 0, 40, 0]
+    assert codebase.totals["Python"].files == 1
+    assert codebase.totals["Python"].loc == 40
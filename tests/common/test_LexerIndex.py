@@ -0,0 +1,42 @@
+from pygments.lexers import get_lexer_for_filename
+from pygments.util import ClassNotFound
+
+from codelimit.common.LexerIndex import LexerIndex
+from codelimit.languages import Languages
+
+
+def test_get_lexer():
+    index = LexerIndex(Languages.by_name.keys())
+
+    assert index.get_lexer("foo.py").__class__.name == "Python"
+    assert index.get_lexer("src/foo.h").__class__.name == "C"
+    assert index.get_lexer("src/foo.H").__class__.name == "C++"
+    assert index.get_lexer("foo.xpm").__class__.name == "C"
+    assert index.get_lexer("BUILD").__class__.name == "Python"
+    assert index.get_lexer("foo.txt") is None
+    assert index.get_lexer("Makefile") is None
+
+
+def test_get_lexer_reuses_instances():
+    index = LexerIndex(Languages.by_name.keys())
+
+    assert index.get_lexer("foo.py") is index.get_lexer("bar.pyi")
+
+
+def test_get_lexer_matches_pygments():
+    index = LexerIndex(Languages.by_name.keys())
+    filenames = [
+        "foo.c", "foo.h", "foo.cpp", "foo.hh", "foo.C", "foo.cs", "foo.java", "foo.js", "foo.mjs", "foo.ts",
+        "foo.py", "foo.sc", "foo.tac", "SConstruct", "foo.xbm", "foo.xcm", "foo.tsx", "foo.json", "README.md",
+    ]
+
+    for filename in filenames:
+        try:
+            expected = get_lexer_for_filename(filename).__class__.name
+        except ClassNotFound:
+            expected = None
+        if expected not in Languages.by_name:
+            expected = None
+        lexer = index.get_lexer(filename)
+
+        assert (lexer.__class__.name if lexer else None) == expected
@@ -0,0 +1,26 @@
+from codelimit.common.LineIndex import LineIndex
+from codelimit.common.Location import Location
+
+
+def test_line_starts():
+    assert LineIndex("").line_starts.tolist() == [0]
+    assert LineIndex("foo\nbar\n").line_starts.tolist() == [0, 4, 8]
+    assert LineIndex(" \n \n\nabcdef\n").newline_indices() == [1, 3, 4, 11]
+
+
+def test_location():
+    line_index = LineIndex("foo = bar\nspam = eggs\n")
+
+    assert line_index.location(0) == Location(1, 1)
+    assert line_index.location(9) == Location(1, 10)
+    assert line_index.location(16) == Location(2, 7)
+
+
+def test_offset():
+    code = "foo = bar\nspam = eggs\n"
+    line_index = LineIndex(code)
+
+    assert line_index.offset(Location(2, 6)) == 15
+    assert line_index.offset(Location(2, 0)) == 10
+    for offset in range(len(code)):
+        assert line_index.offset(line_index.location(offset)) == offset
@@ -0,0 +1,63 @@
+from codelimit.common.Codebase import Codebase
+from codelimit.common.Location import Location
+from codelimit.common.Measurement import Measurement
+from codelimit.common.MeasurementStats import MeasurementStats
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.LazySourceFileEntry import LazySourceFileEntry
+from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportReader import ReportReader
+from codelimit.common.report.ReportWriter import ReportWriter
+
+
+def _make_entry(path: str, values: list[int]) -> SourceFileEntry:
+    measurements = [Measurement(f"f{i}()", Location(i, 1), Location(i + v, 1), v) for i, v in enumerate(values)]
+    return SourceFileEntry(path, "abcd1234", "Python", sum(values), measurements)
+
+
+def test_running_aggregates():
+    codebase = Codebase("/")
+    codebase.add_file(_make_entry("foo.py", [10, 20, 40]))
+    codebase.add_file(_make_entry("bar.py", [10, 70]))
+
+    assert codebase.stats.profile() == [20, 20, 40, 70]
+    assert codebase.stats.histogram() == {10: 2, 20: 1, 40: 1, 70: 1}
+    assert codebase.stats.count() == 5
+    assert codebase.total_loc() == 150
+
+
+def test_replace_file():
+    codebase = Codebase("/")
+    codebase.add_file(_make_entry("foo.py", [10, 20, 40]))
+    codebase.add_file(_make_entry("foo.py", [70]))
+
+    assert codebase.stats.profile() == [0, 0, 0, 70]
+    assert codebase.stats.histogram() == {70: 1}
+
+
+def test_computed_on_first_access():
+    files = {
+        "foo.py": _make_entry("foo.py", [10, 20, 40]),
+        "bar.py": _make_entry("bar.py", [10, 70]),
+    }
+    stats = MeasurementStats(files)
+
+    assert stats.profile() == [20, 20, 40, 70]
+    assert stats.count() == 5
+
+    stats.remove(files.pop("bar.py"))
+
+    assert stats.profile() == [10, 20, 40, 0]
+    assert stats.histogram() == {10: 1, 20: 1, 40: 1}
+
+
+def test_count_does_not_load_measurements():
+    codebase = Codebase("/")
+    codebase.add_file(_make_entry("foo.py", [10, 20, 40]))
+    codebase.add_file(_make_entry("bar.py", [10, 70]))
+    result = ReportReader.from_json(ReportWriter(Report(codebase)).to_json()).codebase
+
+    assert result.stats.count() == 5
+    assert result.stats.profile() == [20, 20, 40, 70]
+    for entry in result.files.values():
+        assert isinstance(entry, LazySourceFileEntry)
+        assert entry._load_measurements is not None
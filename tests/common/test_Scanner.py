@@ -1,11 +1,21 @@
+import hashlib
 import os.path
 import tempfile
+from concurrent.futures import Executor, Future
 from pathlib import Path
 
 from pathspec import PathSpec
 
-from codelimit.common.Scanner import scan_codebase, is_excluded, DEFAULT_EXCLUDES
+from codelimit.common.Codebase import Codebase
+from codelimit.common.Configuration import Configuration
+from codelimit.common.FileStat import FileStat
+from codelimit.common.Scanner import scan_codebase, scan_path, is_excluded, is_excluded_folder, DEFAULT_EXCLUDES, \
+    _scan_files, _walk_source_files, _get_excludes
+from codelimit.common.SourceFileEntry import SourceFileEntry
+from codelimit.common.report.Report import Report
+from codelimit.common.report.ReportWriter import ReportWriter
 from codelimit.common.source_utils import get_location_range
+from codelimit.languages import Languages
 
 
 def test_scan_single_file():
@@ -82,6 +92,175 @@ def test_skip_hidden_files():
     assert result.all_files()[0] == "foo.py"
 
 
+def test_scan_parallel():
+    tmp_root = tempfile.TemporaryDirectory()
+    for folder in ["src", "src/foo", "lib"]:
+        os.mkdir(os.path.join(tmp_root.name, folder))
+    for index, folder in enumerate([".", "src", "src/foo", "lib"]):
+        for name in ["spam", "eggs", "ham"]:
+            with open(os.path.join(tmp_root.name, folder, f"{name}.py"), "w") as pythonFile:
+                code = ""
+                code += f"def {name}():\n"
+                code += f"  return {index}\n" * (index * 10 + 1)
+                pythonFile.write(code)
+
+    serial_report = Report(scan_path(Path(tmp_root.name)))
+    parallel_report = Report(scan_path(Path(tmp_root.name), jobs=2))
+    parallel_report.uuid = serial_report.uuid
+    parallel_report.timestamp = serial_report.timestamp
+
+    assert len(parallel_report.codebase.files) == 12
+    assert ReportWriter(parallel_report).to_json() == ReportWriter(serial_report).to_json()
+
+
+class DeferredExecutor(Executor):
+    def __init__(self):
+        self.submitted: list[tuple] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted.append(args)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        executor = self
+
+        class DeferredFuture(Future):
+            def done(self):
+                return False
+
+            def result(self, timeout=None):
+                executor.in_flight -= 1
+                return fn(*args, **kwargs)
+
+        return DeferredFuture()
+
+
+def test_scan_files_bounds_pending_work():
+    tmp_root = tempfile.TemporaryDirectory()
+    for index in range(10):
+        with open(os.path.join(tmp_root.name, f"foo{index}.py"), "w") as pythonFile:
+            pythonFile.write(f"def foo{index}():\n  pass\n")
+    executor = DeferredExecutor()
+    codebase = Codebase(tmp_root.name)
+
+    _scan_files(codebase, Path(tmp_root.name), executor=executor, max_pending=4)
+
+    assert len(codebase.all_files()) == 10
+    assert len(executor.submitted) == 10
+    assert executor.max_in_flight == 4
+    assert all(isinstance(args[0], str) for args in executor.submitted)
+
+
+def test_scan_reuses_cached_entry_when_stat_unchanged(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    with open(os.path.join(tmp_root.name, "foo.py"), "w") as pythonFile:
+        code = ""
+        code += "def foo():\n"
+        code += '  return "Hello world"\n'
+        pythonFile.write(code)
+    stat = FileStat.from_path(os.path.join(tmp_root.name, "foo.py"))
+    cached_codebase = Codebase(tmp_root.name)
+    cached_codebase.add_file(SourceFileEntry("foo.py", "stale", "Python", 2, [], stat))
+    cached_report = Report(cached_codebase)
+
+    result = scan_path(Path(tmp_root.name), cached_report)
+
+    assert result.files["foo.py"].checksum() == "stale"
+    assert len(result.files["foo.py"].measurements()) == 0
+
+    monkeypatch.setattr(Configuration, "verify_checksums", True)
+    result = scan_path(Path(tmp_root.name), cached_report)
+
+    assert result.files["foo.py"].checksum() != "stale"
+    assert len(result.files["foo.py"].measurements()) == 1
+    assert result.files["foo.py"].stat() == stat
+
+
+def test_scan_stores_folder_digests():
+    tmp_root = tempfile.TemporaryDirectory()
+    os.mkdir(os.path.join(tmp_root.name, "src"))
+    with open(os.path.join(tmp_root.name, "src", "foo.py"), "w") as pythonFile:
+        pythonFile.write("def foo():\n  pass\n")
+
+    result = scan_path(Path(tmp_root.name))
+
+    assert result.tree["./"].digest
+    assert result.tree["src/"].digest
+    assert scan_path(Path(tmp_root.name)).tree["src/"].digest == result.tree["src/"].digest
+
+
+def test_scan_reuses_unchanged_folders(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    for folder in ["src", "lib"]:
+        os.mkdir(os.path.join(tmp_root.name, folder))
+        with open(os.path.join(tmp_root.name, folder, "foo.py"), "w") as pythonFile:
+            pythonFile.write("def foo():\n  pass\n")
+    cached_report = Report(scan_path(Path(tmp_root.name)))
+    src_digest = cached_report.codebase.tree["src/"].digest
+
+    def fail_get_lexer(name: str):
+        raise AssertionError(name)
+
+    with monkeypatch.context() as m:
+        m.setattr(Languages.lexer_index, "get_lexer", fail_get_lexer)
+        result = scan_path(Path(tmp_root.name), cached_report)
+
+    assert result.all_files() == cached_report.codebase.all_files()
+
+    with open(os.path.join(tmp_root.name, "lib", "foo.py"), "a") as pythonFile:
+        pythonFile.write("\ndef bar():\n  pass\n")
+    with open(os.path.join(tmp_root.name, "lib", "bar.py"), "w") as pythonFile:
+        pythonFile.write("def bar():\n  pass\n")
+    result = scan_path(Path(tmp_root.name), cached_report)
+
+    assert sorted(result.all_files()) == ["lib/bar.py", "lib/foo.py", "src/foo.py"]
+    assert len(result.files["lib/foo.py"].measurements()) == 2
+    assert result.tree["src/"].digest == src_digest
+    assert result.tree["lib/"].digest != cached_report.codebase.tree["lib/"].digest
+
+    monkeypatch.setattr(Configuration, "exclude", ["lib/"])
+    result = scan_path(Path(tmp_root.name), cached_report)
+
+    assert result.all_files() == ["src/foo.py"]
+    assert result.tree["src/"].digest != src_digest
+
+
+def test_walk_source_files_streams_and_reuses_unchanged_folders(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    for folder in ["src", "lib"]:
+        os.mkdir(os.path.join(tmp_root.name, folder))
+        for name in ["foo", "bar"]:
+            with open(os.path.join(tmp_root.name, folder, f"{name}.py"), "w") as pythonFile:
+                pythonFile.write(f"def {name}():\n  pass\n")
+    spec = PathSpec.from_lines("gitignore", [])
+    digests: dict[str, str] = {}
+
+    items = _walk_source_files(tmp_root.name, "./", spec, [], "", digests)
+    first = next(items)
+
+    assert isinstance(first, tuple)
+    assert "./" not in digests
+    assert len([first, *items]) == 4
+    assert set(digests) == {"./", "src/", "lib/"}
+
+    cached_codebase = scan_path(Path(tmp_root.name))
+    with open(os.path.join(tmp_root.name, "lib", "foo.py"), "a") as pythonFile:
+        pythonFile.write("\ndef spam():\n  pass\n")
+
+    def fail_from_path(path: str):
+        raise AssertionError(path)
+
+    monkeypatch.setattr(FileStat, "from_path", fail_from_path)
+    salt = hashlib.md5("\n".join(_get_excludes(Path(tmp_root.name))).encode()).hexdigest()
+    items = list(_walk_source_files(tmp_root.name, "./", spec, [], salt, {}, cached_codebase))
+
+    cached_items = [item for item in items if isinstance(item, SourceFileEntry)]
+    assert sorted(item.path for item in cached_items) == ["src/bar.py", "src/foo.py"]
+    assert all(item is cached_codebase.files[item.path] for item in cached_items)
+    assert sorted(os.path.basename(item[0]) for item in items if isinstance(item, tuple)) == ["bar.py", "foo.py"]
+
+
 def test_is_excluded():
     excludes_spec = PathSpec.from_lines("gitignore", DEFAULT_EXCLUDES)
 
@@ -108,3 +287,41 @@ def test_is_excluded():
     assert not is_excluded(
         Path("site/assets/javascripts/lunr/wordcut.js"), excludes_spec
     )
+
+
+def test_is_excluded_folder():
+    excludes_spec = PathSpec.from_lines("gitignore", DEFAULT_EXCLUDES)
+
+    assert is_excluded_folder(Path("venv"), excludes_spec)
+    assert is_excluded_folder(Path("foo/node_modules"), excludes_spec)
+    assert not is_excluded_folder(Path("foo"), excludes_spec)
+
+    excludes_spec = PathSpec.from_lines("gitignore", ["site/", "foo/bar/*"])
+
+    assert is_excluded_folder(Path("site"), excludes_spec)
+    assert is_excluded_folder(Path("foo/bar/spam"), excludes_spec)
+    assert not is_excluded_folder(Path("foo/bar"), excludes_spec)
+
+    excludes_spec = PathSpec.from_lines("gitignore", ["build", "dist", "!build/keep.py"])
+
+    assert not is_excluded_folder(Path("build"), excludes_spec)
+    assert is_excluded_folder(Path("dist"), excludes_spec)
+
+    excludes_spec = PathSpec.from_lines("gitignore", ["build", "dist", "!keep.py"])
+
+    assert not is_excluded_folder(Path("build"), excludes_spec)
+    assert not is_excluded_folder(Path("dist"), excludes_spec)
+
+
+def test_scan_excluded_folder_with_negation(monkeypatch):
+    tmp_root = tempfile.TemporaryDirectory()
+    for folder in ["output", "output/keep", "output/skip"]:
+        os.mkdir(os.path.join(tmp_root.name, folder))
+    for folder in ["output", "output/keep", "output/skip"]:
+        with open(os.path.join(tmp_root.name, folder, "foo.py"), "w") as pythonFile:
+            pythonFile.write("def foo():\n  pass\n")
+    monkeypatch.setattr(Configuration, "exclude", ["output/", "!output/keep/"])
+
+    result = scan_path(Path(tmp_root.name))
+
+    assert result.all_files() == ["output/keep/foo.py"]
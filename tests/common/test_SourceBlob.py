@@ -0,0 +1,36 @@
+import codecs
+import os
+import tempfile
+
+from codelimit.common.SourceBlob import SourceBlob
+from codelimit.common.utils import calculate_checksum
+
+
+def test_from_path():
+    tmp_root = tempfile.TemporaryDirectory()
+    file_path = os.path.join(tmp_root.name, "foo.py")
+    with open(file_path, "w") as pythonFile:
+        pythonFile.write('def foo():\n  return "Hello world"\n')
+
+    blob = SourceBlob.from_path(file_path)
+
+    assert blob.checksum == calculate_checksum(file_path)
+    assert blob.text() == 'def foo():\n  return "Hello world"\n'
+
+
+def test_universal_newlines():
+    assert SourceBlob.from_bytes(b"foo\r\nbar\rbaz\n").text() == "foo\nbar\nbaz\n"
+
+
+def test_decode_utf8():
+    assert SourceBlob.from_bytes("café = 1\n".encode("utf-8")).text() == "café = 1\n"
+
+
+def test_decode_latin1_fallback():
+    assert SourceBlob.from_bytes("café = 1\n".encode("latin-1")).text() == "café = 1\n"
+
+
+def test_decode_bom():
+    assert SourceBlob.from_bytes(codecs.BOM_UTF8 + b"foo = 1\n").text() == "foo = 1\n"
+    assert SourceBlob.from_bytes(codecs.BOM_UTF16_LE + "foo = 1\n".encode("utf-16-le")).text() == "foo = 1\n"
+    assert SourceBlob.from_bytes(codecs.BOM_UTF32_BE + "foo = 1\n".encode("utf-32-be")).text() == "foo = 1\n"
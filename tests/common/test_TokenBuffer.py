@@ -0,0 +1,67 @@
+from pygments.lexers import PythonLexer
+from pygments.token import Keyword, Name
+
+from codelimit.common.Location import Location
+from codelimit.common.Token import Token
+from codelimit.common.TokenBuffer import TokenBuffer, intern_token_type
+from codelimit.common.lexer_utils import lex_buffer, lex
+from codelimit.common.source_utils import filter_tokens
+
+
+def test_append():
+    buffer = TokenBuffer("def foo")
+    buffer.append(0, 1, 1, Keyword, "def")
+    buffer.append(4, 1, 5, Name, "foo")
+
+    assert len(buffer) == 2
+    assert buffer.offsets.tolist() == [0, 4]
+    assert buffer.token(1) == Token(Location(1, 5), Name, "foo")
+
+
+def test_intern_token_type():
+    assert intern_token_type(Keyword) == intern_token_type(Keyword)
+    assert intern_token_type(Keyword) != intern_token_type(Name)
+
+
+def test_views():
+    code = ""
+    code += "def foo(): # nocl\n"
+    code += "  pass\n"
+
+    buffer = lex_buffer(PythonLexer(), code)
+
+    assert [t.value for t in buffer.code_view()] == ["def", "foo", "(", ")", ":", "pass"]
+    assert [t.value for t in buffer.comment_view()] == ["# nocl"]
+    assert len(buffer.view()) == len(buffer)
+
+
+def test_view_indexing():
+    tokens = lex(PythonLexer(), "def foo():\n  pass\n")
+
+    assert tokens[-1].value == "pass"
+    assert tokens[-1].location == Location(2, 3)
+    assert [t.value for t in tokens[1:3]] == ["foo", "("]
+    assert tokens[1:3].lines().tolist() == [1, 1]
+    assert tokens[1:3].values() == ["foo", "("]
+    assert tokens == list(tokens)
+
+
+def test_filter_view():
+    tokens = lex(PythonLexer(), "def foo(): # nocl\n  pass\n", False)
+
+    code_tokens = filter_tokens(tokens)
+
+    assert [t.value for t in code_tokens] == ["def", "foo", "(", ")", ":", "pass"]
+    assert code_tokens.lines().tolist() == [1, 1, 1, 1, 1, 2]
+    assert filter_tokens(tokens, keep_others=False, keep_comments=True)[0].is_comment()
+
+
+def test_values_are_read_from_code():
+    buffer = TokenBuffer("def foo")
+    buffer.append(0, 1, 1, Keyword, "def")
+    buffer.append(4, 1, 5, Name, "bar")
+
+    assert buffer.value(0) == "def"
+    assert buffer.value(1) == "bar"
+    assert list(buffer.view().types_and_values()) == [(Keyword, "def"), (Name, "bar")]
+    assert list(buffer.view().types_and_values(1)) == [(Name, "bar")]
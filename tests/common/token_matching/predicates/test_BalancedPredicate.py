@@ -3,39 +3,47 @@ from codelimit.common.token_matching.predicate.Symbol import Symbol
 from tests.common.token_matching.predicates.utils import symbol_token
 
 
+def accepted(predicate: Balanced, values: list[str]) -> list[bool]:
+    result = []
+    depth = 0
+    for value in values:
+        next_depth = predicate.step(symbol_token(value), depth)
+        result.append(next_depth is not None)
+        if next_depth is not None:
+            depth = next_depth
+    return result
+
+
 def test_simple():
     predicate = Balanced(Symbol("("), Symbol(")"))
 
-    assert not predicate.accept(symbol_token("["))
-    assert predicate.accept(symbol_token("("))
-    assert predicate.accept(symbol_token("["))
-    assert predicate.accept(symbol_token("]"))
-    assert predicate.accept(symbol_token(")"))
-    assert not predicate.accept(symbol_token("]"))
+    assert accepted(predicate, ["[", "(", "[", "]", ")", "]"]) == [False, True, True, True, True, False]
 
 
 def test_construct_with_string():
     predicate = Balanced("(", ")")
 
-    assert predicate.accept(symbol_token("("))
-    assert predicate.accept(symbol_token(")"))
+    assert accepted(predicate, ["(", ")"]) == [True, True]
 
 
 def test_nested():
     predicate = Balanced(Symbol("("), Symbol(")"))
 
-    assert predicate.accept(symbol_token("("))
-    assert predicate.accept(symbol_token("("))
-    assert predicate.accept(symbol_token("["))
-    assert predicate.accept(symbol_token("]"))
-    assert predicate.accept(symbol_token(")"))
-    assert predicate.accept(symbol_token(")"))
-    assert not predicate.accept(symbol_token("["))
+    assert accepted(predicate, ["(", "(", "[", "]", ")", ")", "["]) == [True, True, True, True, True, True, False]
 
 
 def test_unbalanced():
     predicate = Balanced(Symbol("("), Symbol(")"))
 
+    assert accepted(predicate, ["(", ")", ")"]) == [True, True, False]
+
+
+def test_stateless():
+    predicate = Balanced(Symbol("("), Symbol(")"))
+
+    assert predicate.step(symbol_token("("), 0) == 1
+    assert predicate.step(symbol_token("("), 0) == 1
+    assert predicate.step(symbol_token(")"), 2) == 1
     assert predicate.accept(symbol_token("("))
-    assert predicate.accept(symbol_token(")"))
     assert not predicate.accept(symbol_token(")"))
+    assert predicate == Balanced(Symbol("("), Symbol(")"))
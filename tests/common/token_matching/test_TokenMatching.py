@@ -2,7 +2,8 @@ import pytest
 from pygments.lexers import PythonLexer
 from pygments.lexers import CSharpLexer
 
-from codelimit.common.gsm.matcher import find_all
+from codelimit.common.TokenBuffer import TokenBuffer
+from codelimit.common.gsm.matcher import find_all, compile_expression
 from codelimit.common.gsm.operator.OneOrMore import OneOrMore
 from codelimit.common.lexer_utils import lex
 from codelimit.common.token_matching.predicate.Balanced import Balanced
@@ -54,6 +55,15 @@ def test_reset_pattern():
     assert len(result) == 1
 
 
+def test_reset_pattern_on_leading_balanced():
+    code = "foo) (a) bar (b) baz"
+    tokens = lex(PythonLexer(), code)
+
+    result = find_all([Balanced("(", ")"), Name()], tokens)
+
+    assert [r.token_string() for r in result] == ["( a", "( b"]
+
+
 def test_string_pattern():
     code = "def bar()"
     tokens = lex(PythonLexer(), code)
@@ -75,6 +85,50 @@ def test_ignore_incomplete_match():
     assert len(result) == 1
 
 
+def test_token_classes():
+    tokens = lex(PythonLexer(), "def foo(): bar(baz)", False)
+    dfa = compile_expression([Keyword("def"), Name(), OneOrMore(Balanced("(", ")"))])
+
+    classes = [dfa.classify(t) for t in tokens]
+
+    assert [t.value for t in tokens] == ["def", "foo", "(", ")", ":", "bar", "(", "baz", ")"]
+    assert list(dfa.classify_from(tokens)) == classes
+    assert list(dfa.classify_from(tokens, 5)) == classes[5:]
+    assert classes[5] == classes[7]
+    assert classes[2] == classes[6]
+    assert classes[3] == classes[8]
+    assert len({classes[0], classes[1], classes[2], classes[3], classes[4], classes[5]}) == 6
+    balanced_state = dfa.start.transition[0][1].transition[0][1]
+    assert dfa.tables[dfa.start] is not None
+    assert dfa.tables[balanced_state] is None
+    assert dfa.stateful_tables[balanced_state] == {}
+
+
+def test_table_driven_matching():
+    code = "def foo(a, (b)):\n  pass\ndef bar():\n  pass\n"
+    tokens = lex(PythonLexer(), code, False)
+    dfa = compile_expression([Keyword("def"), Name(), OneOrMore(Balanced("(", ")"))])
+
+    for _ in range(2):
+        result = find_all(dfa, tokens)
+
+        assert [r.token_string() for r in result] == ["def foo ( a , ( b ) )", "def bar ( )"]
+
+
+def test_table_driven_matching_reads_token_arrays(monkeypatch):
+    code = "def foo(a, (b)):\n  pass\ndef bar():\n  pass\n"
+    tokens = lex(PythonLexer(), code, False)
+    dfa = compile_expression([Keyword("def"), Name(), OneOrMore(Balanced("(", ")"))])
+    find_all(dfa, tokens)
+    built = []
+    monkeypatch.setattr(TokenBuffer, "token", lambda self, index: built.append(index))
+
+    result = find_all(dfa, tokens)
+
+    assert [(r.start, r.end) for r in result] == [(0, 9), (11, 15)]
+    assert built == []
+
+
 @pytest.mark.skip
 def test_predicate_follows_operator():
     code = "Split(new[] {' '})"
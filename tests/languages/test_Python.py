@@ -2,7 +2,7 @@ from pygments.lexers import PythonLexer
 
 from codelimit.common.lexer_utils import lex
 from codelimit.languages import Languages
-from codelimit.languages.Python import _get_indentation, _get_token_lines
+from codelimit.languages.Python import Python, _get_indentation
 from tests.conftest import assert_functions
 
 
@@ -198,14 +198,37 @@ def test_if_statement():
     assert_functions(code, Languages.Python, {"foo": 6})
 
 
-def test_get_token_lines():
+def test_extract_blocks():
     code = ""
     code += "def foo():\n"
-    code += "  pass\n"
+    code += "  x = 1 + \\\n"
+    code += "2\n"
+    code += "  def bar():\n"
+    code += "    pass\n"
+    code += "  return bar\n"
+    code += "y = 1\n"
     tokens = lex(PythonLexer(), code)
+    extractor = Python()
 
-    result = _get_token_lines(tokens)
+    result = extractor.extract_blocks(tokens, extractor.extract_headers(tokens))
 
-    assert len(result) == 2
-    assert str(result[0]) == "[def, foo, (, ), :]"
-    assert str(result[1]) == "[pass]"
+    assert [" ".join(t.value for t in tokens[r.start:r.end]) for r in result] == [
+        "x = 1 + \\\n 2 def bar ( ) : pass return bar",
+        "pass",
+    ]
+
+
+def test_nested_functions():
+    code = """
+    def foo():
+        x = 1
+        def bar():
+            y = 2
+            return y
+        return bar
+    
+    def spam():
+        pass
+    """
+
+    assert_functions(code, Languages.Python, {"foo": 3, "bar": 3, "spam": 2})